@@ -1,6 +1,8 @@
 import argparse
-from tge.engine import GraphicsEngine
+import numpy as np
+from tge.engine import GraphicsEngine, RenderMode
 from tge.model import load_model
+from tge.texture import load_texture
 from tge.camera import Camera, Projection
 from tge.lights import DirectionalLight
 from tge.util import build_scale, build_rotation_deg, Axis, Vec3
@@ -35,6 +37,15 @@ def a_dir():
         required=False,
     )
 
+    parser.add_argument(
+        "-lod",
+        "--lodLevels",
+        type=int,
+        default=0,
+        help="Number of simplified levels of detail to build (default: 0)",
+        required=False,
+    )
+
     # Display args
     parser.add_argument(
         "-dw",
@@ -91,14 +102,103 @@ def a_dir():
         required=False,
     )
 
+    parser.add_argument(
+        "-bf",
+        "--batchFrames",
+        type=int,
+        default=0,
+        help="Project this many frames of the rotation at once with render_frames (default: 0, off)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-rm",
+        "--renderMode",
+        choices=[mode.name.lower() for mode in RenderMode],
+        default="solid",
+        help="Render mode (default: solid)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-pa",
+        "--painter",
+        action="store_true",
+        help="Depth sort faces instead of using the depth buffer",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-tx",
+        "--texture",
+        type=str,
+        help="Texture applied to the model (.pgm, .txt character pattern, or other images with Pillow)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-sh",
+        "--shadows",
+        action="store_true",
+        help="Cast shadows from the light",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-cm",
+        "--colorMode",
+        choices=["256", "truecolor"],
+        help="Color output mode (default: monochrome)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-mc",
+        "--modelColor",
+        type=float,
+        nargs=3,
+        default=[1.0, 1.0, 1.0],
+        help="Model color as RGB in [0, 1] (default: 1.0 1.0 1.0)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-ad",
+        "--adaptive",
+        action="store_true",
+        help="Scale the render resolution to hold the frame rate",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-ft",
+        "--fitTerminal",
+        action="store_true",
+        help="Resize the display to fill the terminal, also when it is resized",
+        required=False,
+    )
+
     args = parser.parse_args()
 
-    engine = GraphicsEngine((args.width, args.height))
+    engine = GraphicsEngine((args.width, args.height), ups=args.framesPerSecond)
+    if args.fitTerminal:
+        engine.fit_terminal = True
+        engine.resize(engine.display.fit_terminal())
+    if args.adaptive:
+        engine.enable_adaptive_resolution()
 
     # Models
-    model = load_model(args.model_path)
+    model = load_model(args.model_path, args.lodLevels)
     model.apply_transform(build_scale(args.scaleXYZ, args.scaleXYZ, args.scaleXYZ))
+    model.color = np.array(args.modelColor)
+    if args.texture is not None:
+        model.texture = load_texture(args.texture)
     engine.add_model(model)
+    engine.set_color_mode(args.colorMode)
+    engine.render_mode = RenderMode[args.renderMode.upper()]
+    engine.painter = args.painter
+    if args.shadows:
+        engine.enable_shadows()
 
     # Camera
     FOV = args.fov
@@ -116,6 +216,17 @@ def a_dir():
         rot_Y = build_rotation_deg(args.rotationDeg, Axis.Y)
         rot_Z = build_rotation_deg(args.rotationDeg, Axis.Z)
         t = 1.0 / args.framesPerSecond
+        if args.batchFrames > 0:
+            step = rot_Z @ rot_Y @ rot_X
+            frames = [step]
+            for _ in range(args.batchFrames - 1):
+                frames.append(step @ frames[-1])
+            frames = np.stack(frames)
+            while True:
+                for _ in engine.render_frames(0, frames, Projection.PERSPECTIVE):
+                    engine.display.render_buffer()
+                    time.sleep(t)
+                model.apply_transform(frames[-1])
         while True:
             model.apply_transform(rot_X)
             model.apply_transform(rot_Y)
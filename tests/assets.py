@@ -0,0 +1,72 @@
+import argparse
+import glob
+import os
+import time
+from tge.assets import load_models
+from tge.model import load_model
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "models")
+
+
+def assets():
+    parser = argparse.ArgumentParser(
+        description="Compare serial and concurrent loading of the test models"
+    )
+
+    parser.add_argument(
+        "-l",
+        "--lodLevels",
+        type=int,
+        default=0,
+        help="Levels of detail built per model (default: 0)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-d",
+        "--duplicates",
+        type=int,
+        default=1,
+        help="Times every path is listed, to check deduplication (default: 1)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        help="Number of workers (default: one per file)",
+        required=False,
+    )
+
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(MODEL_DIR, "*.obj"))) * args.duplicates
+
+    # Warm up imports and the file cache so the serial time is not inflated
+    for path in paths:
+        load_model(path, args.lodLevels)
+
+    start = time.perf_counter()
+    for path in paths:
+        load_model(path, args.lodLevels)
+    print(f"{'serial':>10}: {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+    for processes in (False, True):
+        start = time.perf_counter()
+        models, timings = load_models(
+            paths, args.workers, processes, lod_levels=args.lodLevels
+        )
+        total = time.perf_counter() - start
+        name = "processes" if processes else "threads"
+        print(
+            f"{name:>10}: {total * 1000:8.2f} ms, slowest asset {max(timings.values()) * 1000:.2f} ms,"
+            f" {len(models)} models from {len(timings)} files"
+        )
+
+    for path, seconds in sorted(timings.items(), key=lambda item: -item[1]):
+        print(f"{os.path.basename(path):>16}: {seconds * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    assets()
@@ -0,0 +1,214 @@
+import argparse
+import json
+import os
+import platform
+import time
+import numpy as np
+from tge.engine import GraphicsEngine
+from tge.model import Model, load_model
+from tge.camera import Camera, Projection
+from tge.lights import DirectionalLight
+from tge.util import build_scale, build_rotation_deg, Axis, Vec3
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "models")
+BASELINE = os.path.join(os.path.dirname(__file__), "bench_baseline.json")
+RESOLUTIONS = [(50, 25), (100, 50), (200, 100)]
+
+
+def best_of(fn, repeats: int) -> float:
+    """Minimum wall time of fn over a number of runs"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def fit_model(model: Model, radius: float = 10.0):
+    """Center a model at the origin and scale it to the given bounding radius (in-place)"""
+    center = model.v[:, :3].mean(axis=0)
+    model.apply_translate(np.append(-center, 0))
+    r = np.linalg.norm(model.v[:, :3], axis=1).max()
+    if r > 0:
+        s = radius / r
+        model.apply_transform(build_scale(s, s, s))
+
+
+def bench_model(path: str, resolution: tuple[int, int], repeats: int) -> dict:
+    """Time each pipeline stage for one model at one resolution"""
+    engine = GraphicsEngine(resolution)
+    camera = Camera(Vec3(0, 0, 30), Vec3(0, 0, 0), Vec3(0, 1, 0), 1.0472, 0.1, 100.0)
+    engine.add_camera(camera)
+    engine.add_light(DirectionalLight(Vec3(0, 0, -1)))
+
+    results = {"load_model": best_of(lambda: load_model(path), repeats)}
+
+    model = load_model(path)
+    fit_model(model)
+    rot = build_rotation_deg(25.0, Axis.X) @ build_rotation_deg(45.0, Axis.Y)
+    results["apply_transform"] = best_of(
+        lambda: model.apply_transform(np.eye(4), preserve_norms=True), repeats
+    )
+    results["compute_normals"] = best_of(model.compute_normals, repeats)
+    model.apply_transform(rot)
+
+    t = camera.get_proj_matrix(engine.aspect_ratio, Projection.PERSPECTIVE)
+    t = t @ camera.get_view_matrix()
+    results["project"] = best_of(lambda: engine._project(model.v, t), repeats)
+    v, z = engine._project(model.v, t)
+
+    results["cull"] = best_of(lambda: engine._cull(model.n, camera), repeats)
+    visible = engine._cull(model.n, camera)
+    results["shade"] = best_of(lambda: engine._shade(model.n[visible]), repeats)
+    intensities = engine._shade(model.n[visible])
+
+    def raster():
+        engine._clear()
+        engine._rasterize(v, z, model.f[visible], intensities)
+
+    results["rasterize"] = best_of(raster, repeats)
+    # The reference backend reports edge walking (_bresenhams_line) as "setup" and span filling (_fill_span) as
+    # "raster"; keep the fastest of each
+    profiler = engine.enable_profiling(repeats)
+    for _ in range(repeats):
+        profiler.begin_frame()
+        raster()
+        profiler.end_frame()
+    engine.disable_profiling()
+    results["bresenhams_line"] = min(s.times["setup"] for s in profiler.frames)
+    results["fill_span"] = min(s.times["raster"] for s in profiler.frames)
+    results["update_buffer"] = best_of(
+        lambda: engine.display.update_buffer(engine.buf), repeats
+    )
+    results["encode"] = best_of(engine.display._buf_to_fb, repeats)
+
+    engine.add_model(model)
+    results["frame"] = best_of(lambda: engine.render(0), repeats)
+    results["faces"] = len(model.f)
+    results["visible_faces"] = len(visible)
+    return results
+
+
+def compare(
+    results: dict, baseline: dict, threshold: float, min_delta: float
+) -> list[str]:
+    """List the timings that got slower than the baseline by more than the threshold and by at least min_delta
+    seconds, so timer noise on stages of a few microseconds is not flagged"""
+    regressions = []
+    for case, stages in results.items():
+        for stage, value in stages.items():
+            base = baseline.get(case, {}).get(stage)
+            if stage.endswith("faces") or not base:
+                continue
+            if value > base * (1 + threshold) and value - base >= min_delta:
+                regressions.append(
+                    f"{case} {stage}: {base * 1000:.3f} ms -> {value * 1000:.3f} ms"
+                )
+    return regressions
+
+
+def bench():
+    parser = argparse.ArgumentParser(
+        description="Time each pipeline stage over the bundled models"
+    )
+
+    parser.add_argument(
+        "-m",
+        "--models",
+        nargs="*",
+        help="Model names in tests/models (default: all)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-r",
+        "--repeats",
+        type=int,
+        default=5,
+        help="Runs per stage; the fastest is kept (default: 5)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="Write JSON results to this path (default: stdout)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-b",
+        "--baseline",
+        default=BASELINE,
+        help="Baseline JSON to compare against (default: tests/bench_baseline.json)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Relative slowdown flagged as a regression (default: 0.25)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=0.5,
+        help="Smallest slowdown in ms flagged as a regression (default: 0.5)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store these results as the new baseline",
+    )
+
+    args = parser.parse_args()
+
+    names = args.models or sorted(
+        f[:-4] for f in os.listdir(MODEL_DIR) if f.endswith(".obj")
+    )
+    results = {}
+    for name in names:
+        path = os.path.join(MODEL_DIR, name + ".obj")
+        for w, h in RESOLUTIONS:
+            results[f"{name}@{w}x{h}"] = bench_model(path, (w, h), args.repeats)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "repeats": args.repeats,
+        },
+        "results": results,
+    }
+    out = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(out)
+    else:
+        print(out)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            f.write(out)
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold, args.min_delta / 1000)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    bench()
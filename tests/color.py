@@ -0,0 +1,86 @@
+import argparse
+import os
+import time
+import numpy as np
+from tge.engine import GraphicsEngine
+from tge.model import load_model
+from tge.camera import Camera, Projection
+from tge.lights import DirectionalLight
+from tge.util import build_scale, build_rotation_deg, Axis, Vec3
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "models")
+
+
+def color():
+    parser = argparse.ArgumentParser(
+        description="Compare bytes per frame and encode time of the monochrome and color output modes"
+    )
+
+    parser.add_argument(
+        "-m",
+        "--model",
+        default="monkey",
+        help="Model name in tests/models (default: monkey)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-s",
+        "--scale",
+        type=float,
+        default=10.0,
+        help="Model scale (default: 10.0)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-c",
+        "--color",
+        type=float,
+        nargs=3,
+        default=[1.0, 0.6, 0.3],
+        help="Model color as RGB in [0, 1] (default: 1.0 0.6 0.3)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-r",
+        "--repeats",
+        type=int,
+        default=20,
+        help="Encodes timed per mode; the fastest is kept (default: 20)",
+        required=False,
+    )
+
+    args = parser.parse_args()
+
+    print(f"{'mode':>10} {'bytes':>8} {'escapes':>8} {'encode ms':>10}")
+    for mode in (None, "256", "truecolor"):
+        engine = GraphicsEngine((100, 50), handle_resize=False)
+        engine.add_camera(
+            Camera(Vec3(0, 0, 30), Vec3(0, 0, 0), Vec3(0, 1, 0), 1.0472, 0.1, 100.0)
+        )
+        engine.add_light(DirectionalLight(Vec3(0, 0, -1)))
+        engine.add_light(DirectionalLight(Vec3(1, -1, -1), color=(0.3, 0.5, 1.0)))
+        model = load_model(os.path.join(MODEL_DIR, args.model + ".obj"))
+        model.apply_transform(build_scale(args.scale, args.scale, args.scale))
+        model.apply_transform(build_rotation_deg(25.0, Axis.X))
+        model.apply_transform(build_rotation_deg(45.0, Axis.Y))
+        model.color = np.array(args.color)
+        engine.add_model(model)
+        engine.set_color_mode(mode)
+        engine.render(0, Projection.PERSPECTIVE)
+
+        times = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            fb = engine.display._buf_to_fb()
+            times.append(time.perf_counter() - start)
+        escapes = fb.count("\033[38;")
+        print(
+            f"{str(mode):>10} {len(fb.encode()):>8} {escapes:>8} {min(times) * 1000:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    color()
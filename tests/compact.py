@@ -0,0 +1,99 @@
+import argparse
+import time
+import numpy as np
+from tge.engine import GraphicsEngine
+from tge.model import load_model
+from tge.camera import Camera, Projection
+from tge.lights import DirectionalLight
+from tge.util import build_scale, build_rotation_deg, Axis, Vec3
+
+
+def render(model, width, height, dtype):
+    engine = GraphicsEngine((width, height), dtype=dtype)
+    engine.add_model(model)
+    engine.add_camera(
+        Camera(Vec3(0, 0, 30), Vec3(0, 0, 0), Vec3(0, 1, 0), 1.0472, 0.1, 100.0)
+    )
+    engine.add_light(DirectionalLight(Vec3(0, 0, -1)))
+
+    start = time.perf_counter()
+    engine.render(0, Projection.PERSPECTIVE)
+    return engine, time.perf_counter() - start
+
+
+def compact():
+    parser = argparse.ArgumentParser(
+        description="Compare the compact float32 path against the float64 path"
+    )
+
+    parser.add_argument("model_path", help="Path to model .obj")
+
+    parser.add_argument(
+        "-sXYZ",
+        "--scaleXYZ",
+        type=float,
+        default=10.0,
+        help="Scale factor for X, Y, and Z axes (default: 10.0)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-dw",
+        "--width",
+        type=int,
+        default=100,
+        help="Display width (default: 100)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-dh",
+        "--height",
+        type=int,
+        default=50,
+        help="Display height (default: 50)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-tol",
+        "--tolerance",
+        type=float,
+        default=0.01,
+        help="Maximum fraction of mismatched cells (default: 0.01)",
+        required=False,
+    )
+
+    args = parser.parse_args()
+
+    model = load_model(args.model_path)
+    model.apply_transform(build_scale(args.scaleXYZ, args.scaleXYZ, args.scaleXYZ))
+    model.apply_transform(build_rotation_deg(25.0, Axis.X))
+    model.apply_transform(build_rotation_deg(45.0, Axis.Y))
+    small = model.to_compact()
+
+    full, t_full = render(model, args.width, args.height, np.float64)
+    comp, t_comp = render(small, args.width, args.height, np.float32)
+
+    drawn = np.isfinite(full.zbuf) | np.isfinite(comp.zbuf)
+    mismatch = (np.abs(full.buf - comp.buf) > 1e-3).sum() / max(drawn.sum(), 1)
+    both = np.isfinite(full.zbuf) & np.isfinite(comp.zbuf)
+    z_err = np.abs(full.zbuf[both] - comp.zbuf[both]).max() if both.any() else 0.0
+
+    print(
+        f"Mesh bytes:      {model.v.nbytes + model.f.nbytes} -> {small.v.nbytes + small.f.nbytes}"
+    )
+    print(
+        f"Buffer bytes:    {full.buf.nbytes + full.zbuf.nbytes} -> {comp.buf.nbytes + comp.zbuf.nbytes}"
+    )
+    print(f"Render time:     {t_full * 1000:.2f} ms -> {t_comp * 1000:.2f} ms")
+    print(f"Mismatched cells: {mismatch:.2%}")
+    print(f"Max depth error: {z_err:.2e}")
+
+    if mismatch > args.tolerance:
+        raise SystemExit("Compact path exceeds mismatch tolerance")
+    print("Compact path within tolerance.")
+
+
+if __name__ == "__main__":
+    compact()
@@ -0,0 +1,188 @@
+import argparse
+import os
+import numpy as np
+from tge.engine import GraphicsEngine
+from tge.model import load_model
+from tge.generate import torus
+from tge.camera import Camera, Projection
+from tge.lights import DirectionalLight
+from tge.util import build_scale, build_rotation_deg, build_translation, Axis, Vec3
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "models")
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), "golden")
+
+
+def setup(
+    backend: str, resolution: tuple[int, int], dtype: type = np.float64
+) -> GraphicsEngine:
+    engine = GraphicsEngine(resolution, dtype=dtype, rasterizer=backend)
+    engine.add_camera(
+        Camera(Vec3(0, 0, 30), Vec3(0, 0, 0), Vec3(0, 1, 0), 1.0472, 0.1, 100.0)
+    )
+    engine.add_light(DirectionalLight(Vec3(0, 0, -1)))
+    return engine
+
+
+def posed(name: str, scale: float, rx: float, ry: float, rz: float = 0.0, **kwargs):
+    model = load_model(os.path.join(MODEL_DIR, name + ".obj"), **kwargs)
+    model.apply_transform(build_scale(scale, scale, scale))
+    model.apply_transform(build_rotation_deg(rx, Axis.X))
+    model.apply_transform(build_rotation_deg(ry, Axis.Y))
+    model.apply_transform(build_rotation_deg(rz, Axis.Z))
+    return model
+
+
+def cube(backend: str) -> GraphicsEngine:
+    engine = setup(backend, (100, 50))
+    engine.add_model(posed("cube", 5.0, 25.0, 45.0, 45.0))
+    return engine
+
+
+def monkey(backend: str) -> GraphicsEngine:
+    engine = setup(backend, (100, 50))
+    engine.add_model(posed("monkey", 10.0, 25.0, 45.0))
+    return engine
+
+
+def taurus(backend: str) -> GraphicsEngine:
+    engine = setup(backend, (80, 40))
+    engine.add_model(posed("taurus", 10.0, 60.0, 0.0))
+    return engine
+
+
+def head_two_lights(backend: str) -> GraphicsEngine:
+    engine = setup(backend, (100, 50))
+    engine.add_light(DirectionalLight(Vec3(1, -1, -1)))
+    engine.add_model(posed("head", 12.0, 0.0, 30.0))
+    return engine
+
+
+def overlapping_tori(backend: str) -> GraphicsEngine:
+    engine = setup(backend, (100, 50))
+    transforms = np.stack(
+        [
+            build_translation(x, 0, z)
+            @ build_rotation_deg(70, Axis.X)
+            @ build_scale(6, 6, 6)
+            for x, z in [(-5, 0), (0, -4), (5, 2)]
+        ]
+    )
+    engine.add_instances(torus(24, 12), transforms)
+    return engine
+
+
+def compact_sphere(backend: str) -> GraphicsEngine:
+    engine = setup(backend, (60, 30), dtype=np.float32)
+    engine.add_model(posed("sphere", 10.0, 20.0, 10.0, compact=True))
+    return engine
+
+
+SCENES = {
+    f.__name__: f
+    for f in [cube, monkey, taurus, head_two_lights, overlapping_tori, compact_sphere]
+}
+
+
+def compare(engine: GraphicsEngine, golden: dict) -> tuple[float, float]:
+    """Fraction of mismatched cells and maximum depth error on cells covered in both"""
+    covered = np.isfinite(engine.zbuf) | np.isfinite(golden["zbuf"])
+    mismatch = (np.abs(engine.buf - golden["buf"]) > 1e-6).sum() / max(covered.sum(), 1)
+    both = np.isfinite(engine.zbuf) & np.isfinite(golden["zbuf"])
+    z_err = (
+        np.abs(engine.zbuf[both] - golden["zbuf"][both]).max() if both.any() else 0.0
+    )
+    return mismatch, z_err
+
+
+def conformance():
+    parser = argparse.ArgumentParser(
+        description="Render fixed scenes headlessly and compare against golden buffers"
+    )
+
+    parser.add_argument(
+        "-b",
+        "--backend",
+        default="reference",
+        help="Rasterizer backend to check (default: reference)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-s",
+        "--scenes",
+        nargs="*",
+        choices=list(SCENES),
+        help="Scenes to render (default: all)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-tol",
+        "--tolerance",
+        type=float,
+        default=0.05,
+        help="Maximum fraction of mismatched cells (default: 0.05)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-ztol",
+        "--zTolerance",
+        type=float,
+        default=1e-3,
+        help="Maximum depth error on cells covered in both buffers (default: 1e-3)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-pm",
+        "--pixelMap",
+        help="Directory to save pixel maps of the golden, rendered and difference buffers",
+        required=False,
+    )
+
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="Regenerate the golden buffers with the reference backend",
+    )
+
+    args = parser.parse_args()
+
+    failed = []
+    for name in args.scenes or SCENES:
+        path = os.path.join(GOLDEN_DIR, name + ".npz")
+        if args.update:
+            engine = SCENES[name]("reference")
+            engine.render(0, Projection.PERSPECTIVE)
+            os.makedirs(GOLDEN_DIR, exist_ok=True)
+            np.savez_compressed(path, buf=engine.buf, zbuf=engine.zbuf)
+            print(f"{name}: golden updated")
+            continue
+
+        engine = SCENES[name](args.backend)
+        engine.render(0, Projection.PERSPECTIVE)
+        golden = np.load(path)
+        mismatch, z_err = compare(engine, golden)
+        ok = mismatch <= args.tolerance and z_err <= args.zTolerance
+        print(
+            f"{name}: mismatch {mismatch:.2%}, max depth error {z_err:.2e} {'ok' if ok else 'FAIL'}"
+        )
+        if not ok:
+            failed.append(name)
+
+        if args.pixelMap:
+            from tge.debug import pixel_map
+
+            os.makedirs(args.pixelMap, exist_ok=True)
+            prefix = os.path.join(args.pixelMap, name)
+            pixel_map(golden["buf"], f"{prefix}_golden.png")
+            pixel_map(engine.buf, f"{prefix}_{args.backend}.png")
+            pixel_map(np.abs(engine.buf - golden["buf"]), f"{prefix}_diff.png")
+
+    if failed:
+        raise SystemExit(f"Backend {args.backend} failed: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    conformance()
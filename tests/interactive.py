@@ -0,0 +1,132 @@
+import argparse
+import os
+import sys
+import threading
+import time
+import numpy as np
+from tge.camera import Camera
+from tge.controller import CameraController, run_interactive
+from tge.display import clear
+from tge.engine import GraphicsEngine
+from tge.input import TerminalInput
+from tge.lights import DirectionalLight
+from tge.model import load_model
+from tge.util import Vec3, build_scale
+
+
+def type_keys(fd: int, keys: str, gap: float, split: float):
+    """Write keys to a pipe one at a time, then quit. With split > 0, the bytes of a key are written separately."""
+    for key in keys:
+        time.sleep(gap)
+        if split > 0:
+            for byte in key.encode():
+                os.write(fd, bytes([byte]))
+                time.sleep(split)
+        else:
+            os.write(fd, key.encode())
+    os.write(fd, b"x")
+    os.close(fd)
+
+
+def interactive():
+    parser = argparse.ArgumentParser(
+        description="Move the camera around a model with the keyboard and mouse and report input latency"
+    )
+
+    parser.add_argument("model_path", help="Path to model .obj")
+
+    parser.add_argument(
+        "-sc",
+        "--scaleXYZ",
+        type=float,
+        default=10.0,
+        help="How much to scale the model (default: 10.0)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-r",
+        "--resolution",
+        type=int,
+        nargs=2,
+        default=[100, 50],
+        help="Width and height in characters (default: 100 50)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-b",
+        "--backend",
+        default="numpy",
+        help="Rasterizer backend (default: numpy)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-s",
+        "--scripted",
+        type=int,
+        default=0,
+        help="Instead of reading the terminal, feed this many generated key presses through a pipe (default: 0)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-g",
+        "--gap",
+        type=float,
+        default=0.02,
+        help="Seconds between scripted key presses (default: 0.02)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-sp",
+        "--split",
+        type=float,
+        default=0.0,
+        help="Seconds between the bytes of a scripted key, to split escape sequences across reads (default: 0)",
+        required=False,
+    )
+
+    args = parser.parse_args()
+
+    engine = GraphicsEngine(tuple(args.resolution), rasterizer=args.backend)
+    model = load_model(args.model_path)
+    model.apply_transform(build_scale(args.scaleXYZ, args.scaleXYZ, args.scaleXYZ))
+    engine.add_model(model)
+    engine.add_camera(
+        Camera(Vec3(0, 0, 30), Vec3(0, 0, 0), Vec3(0, 1, 0), 1.0472, 0.1, 100.0)
+    )
+    engine.add_light(DirectionalLight(Vec3(0, 0, -1)))
+    controller = CameraController(engine.camera[0])
+
+    clear()
+    if args.scripted > 0:
+        read, write = os.pipe()
+        keys = np.random.default_rng(0).choice(
+            list("wsad") + ["\x1b[C", "\x1b[D"], args.scripted
+        )
+        threading.Thread(
+            target=type_keys, args=(write, keys, args.gap, args.split)
+        ).start()
+        with TerminalInput(read, mouse=False) as terminal:
+            latencies = run_interactive(engine, controller, terminal=terminal)
+        os.close(read)
+    else:
+        latencies = run_interactive(engine, controller)
+    clear()
+
+    if not latencies:
+        print("No frames rendered for input", file=sys.stderr)
+        return
+    ms = np.array(latencies) * 1000
+    print(
+        f"{len(ms)} frames, input to present: mean {ms.mean():.2f} ms, p50 {np.percentile(ms, 50):.2f} ms,"
+        f" p95 {np.percentile(ms, 95):.2f} ms, max {ms.max():.2f} ms",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    interactive()
@@ -0,0 +1,110 @@
+import argparse
+import numpy as np
+from tge.engine import GraphicsEngine
+from tge.model import load_model
+from tge.camera import Camera, Projection
+from tge.lights import DirectionalLight
+from tge.util import build_scale, Vec3
+
+
+def build(model, width, height, incremental=False, repack=False):
+    engine = GraphicsEngine((width, height), handle_resize=False)
+    engine.incremental = incremental
+    engine.repack = repack
+    engine.add_model(model)
+    engine.add_camera(
+        Camera(Vec3(0, 0, 30), Vec3(0, 0, 0), Vec3(0, 1, 0), 1.0472, 0.1, 100.0)
+    )
+    engine.add_light(DirectionalLight(Vec3(0, 0, -1)))
+    return engine
+
+
+def check(name, engine, model, width, height):
+    """Render after an edit and compare against a fresh engine drawing the edited model"""
+    before = engine.buf.copy()
+    engine.render(0, Projection.PERSPECTIVE)
+    reference = build(model, width, height)
+    reference.render(0, Projection.PERSPECTIVE)
+    changed = not np.array_equal(before, engine.buf)
+    same = np.array_equal(engine.buf, reference.buf)
+    print(f"{name}: frame changed {changed}, matches fresh render {same}")
+    return changed and same
+
+
+def packed():
+    parser = argparse.ArgumentParser(
+        description="Edit packed model vertices directly and check that the next frame shows the edit"
+    )
+
+    parser.add_argument("model_path", help="Path to model .obj")
+
+    parser.add_argument(
+        "-sXYZ",
+        "--scaleXYZ",
+        type=float,
+        default=10.0,
+        help="Scale factor for X, Y, and Z axes (default: 10.0)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-dw",
+        "--width",
+        type=int,
+        default=100,
+        help="Display width (default: 100)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-dh",
+        "--height",
+        type=int,
+        default=50,
+        help="Display height (default: 50)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-o",
+        "--offset",
+        type=float,
+        default=3.0,
+        help="Distance each edit moves the vertices along x (default: 3.0)",
+        required=False,
+    )
+
+    args = parser.parse_args()
+    size = (args.width, args.height)
+
+    ok = True
+    modes = {
+        "default": (False, False),
+        "repack": (False, True),
+        "incremental": (True, False),
+    }
+    for mode, (incremental, repack) in modes.items():
+        model = load_model(args.model_path)
+        model.apply_transform(build_scale(args.scaleXYZ, args.scaleXYZ, args.scaleXYZ))
+        engine = build(model, *size, incremental, repack)
+        engine.render(0, Projection.PERSPECTIVE)
+
+        # A new vertex array is noticed in every mode
+        v = model.v.copy()
+        v[:, 0] += args.offset
+        model.v = v
+        ok &= check(f"{mode}, reassigned model.v", engine, model, *size)
+
+        # Edits in place are only noticed after mark_changed, unless every frame repacks
+        model.v[:, 0] += args.offset
+        if not repack:
+            model.mark_changed()
+        ok &= check(f"{mode}, edited model.v in place", engine, model, *size)
+
+    if not ok:
+        raise SystemExit("Packed geometry missed a vertex edit")
+    print("Packed geometry follows vertex edits.")
+
+
+if __name__ == "__main__":
+    packed()
@@ -49,6 +49,15 @@ def r_dir():
         required=False,
     )
 
+    parser.add_argument(
+        "-lod",
+        "--lodLevels",
+        type=int,
+        default=0,
+        help="Number of simplified levels of detail to build (default: 0)",
+        required=False,
+    )
+
     # Display args
     parser.add_argument(
         "-dw",
@@ -101,7 +110,7 @@ def r_dir():
     engine = GraphicsEngine((args.width, args.height))
 
     # Models
-    model = load_model(args.model_path)
+    model = load_model(args.model_path, args.lodLevels)
     model.apply_transform(build_scale(args.scaleXYZ, args.scaleXYZ, args.scaleXYZ))
     if args.rotationX:
         model.apply_transform(build_rotation_deg(args.rotationX, Axis.X))
@@ -0,0 +1,150 @@
+import argparse
+import json
+import time
+from tge.engine import GraphicsEngine
+from tge.generate import random_scene
+from tge.camera import Camera, Projection
+from tge.lights import DirectionalLight
+from tge.util import Vec3
+
+# Closed shapes so every model shows roughly half its faces from any angle
+SHAPES = ("sphere", "torus")
+
+
+def parse_resolution(s: str) -> tuple[int, int]:
+    w, h = s.lower().split("x")
+    return int(w), int(h)
+
+
+def measure(
+    faces: int, models: int, resolution: tuple[int, int], frames: int, seed: int
+) -> dict:
+    """Render a random scene and report throughput"""
+    engine = GraphicsEngine(resolution)
+    engine.add_camera(
+        Camera(Vec3(0, 0, 30), Vec3(0, 0, 0), Vec3(0, 1, 0), 1.0472, 0.1, 100.0)
+    )
+    engine.add_light(DirectionalLight(Vec3(0, 0, -1)))
+    for model in random_scene(
+        models, max(faces // models, 1), shapes=SHAPES, seed=seed
+    ):
+        engine.add_model(model)
+    profiler = engine.enable_profiling()
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        engine.render(0, Projection.PERSPECTIVE)
+    frame_time = (time.perf_counter() - start) / frames
+
+    stats = profiler.last
+    submitted = stats.triangles["submitted"]
+    return {
+        "faces": submitted,
+        "models": models,
+        "resolution": f"{resolution[0]}x{resolution[1]}",
+        "frame_time": frame_time,
+        "fps": 1 / frame_time,
+        "triangles_per_second": submitted / frame_time,
+        "rasterized": stats.triangles["rasterized"],
+        "pixels_written": stats.pixels_written,
+        "overdraw": stats.overdraw,
+        "times": stats.times,
+    }
+
+
+def scaling():
+    parser = argparse.ArgumentParser(
+        description="Sweep face count, model count and resolution over generated scenes"
+    )
+
+    parser.add_argument(
+        "-f",
+        "--faces",
+        type=int,
+        nargs="*",
+        default=[1000, 10000, 100000],
+        help="Total scene face counts to sweep (default: 1000 10000 100000)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-m",
+        "--models",
+        type=int,
+        nargs="*",
+        default=[1, 10, 100],
+        help="Model counts to sweep (default: 1 10 100)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-res",
+        "--resolutions",
+        type=parse_resolution,
+        nargs="*",
+        default=[(50, 25), (100, 50), (200, 100)],
+        help="Resolutions to sweep as WxH (default: 50x25 100x50 200x100)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-n",
+        "--frames",
+        type=int,
+        default=3,
+        help="Frames rendered per point (default: 3)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-s",
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed for scene generation (default: 0)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="Write JSON results to this path",
+        required=False,
+    )
+
+    args = parser.parse_args()
+
+    # Each curve varies one parameter and holds the others at their first value
+    base_faces, base_models, base_res = (
+        args.faces[0],
+        args.models[0],
+        args.resolutions[0],
+    )
+    curves = {
+        "faces": [(f, base_models, base_res) for f in args.faces],
+        "models": [(base_faces, m, base_res) for m in args.models],
+        "resolution": [(base_faces, base_models, r) for r in args.resolutions],
+    }
+
+    results = {}
+    for name, points in curves.items():
+        print(f"== {name} ({', '.join(SHAPES)})")
+        print(
+            f"{'faces':>10} {'models':>7} {'res':>9} {'ms/frame':>10} {'tris/s':>12} {'overdraw':>9}"
+        )
+        results[name] = []
+        for faces, models, res in points:
+            r = measure(faces, models, res, args.frames, args.seed)
+            results[name].append(r)
+            print(
+                f"{r['faces']:>10} {r['models']:>7} {r['resolution']:>9} "
+                f"{r['frame_time'] * 1000:>10.1f} {r['triangles_per_second']:>12.0f} {r['overdraw']:>9.2f}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    scaling()
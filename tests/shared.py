@@ -0,0 +1,109 @@
+import argparse
+import multiprocessing
+import pickle
+import time
+import numpy as np
+from tge.camera import Projection
+from tge.generate import random_scene
+from tge.shared import SharedArrays
+from tests.conformance import setup
+
+
+def checksum(v: np.ndarray, f: np.ndarray, counts: np.ndarray, zbuf: np.ndarray):
+    """Work done by a worker: touch all geometry and the depth buffer"""
+    n_vertices, n_faces = counts[0], counts[1]
+    return float(v[:n_vertices].sum() + f[:n_faces].sum() + np.isfinite(zbuf).sum())
+
+
+def pickled_worker(payload: bytes) -> tuple[float, float]:
+    start = time.perf_counter()
+    arrays = pickle.loads(payload)
+    result = checksum(*arrays)
+    return result, time.perf_counter() - start
+
+
+def shared_worker(handle: dict) -> tuple[float, float]:
+    start = time.perf_counter()
+    shared = SharedArrays.attach(handle)
+    result = checksum(
+        shared["packed.v"], shared["packed.f"], shared["packed.counts"], shared["zbuf"]
+    )
+    shared.close()
+    return result, time.perf_counter() - start
+
+
+def shared():
+    parser = argparse.ArgumentParser(
+        description="Compare sending scene geometry to worker processes by pickling and by shared memory handles"
+    )
+
+    parser.add_argument(
+        "-n",
+        "--models",
+        type=int,
+        default=200,
+        help="Number of generated models (default: 200)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-f",
+        "--faces",
+        type=int,
+        default=2000,
+        help="Approximate faces per model (default: 2000)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of worker processes (default: 4)",
+        required=False,
+    )
+
+    args = parser.parse_args()
+
+    engine = setup("numpy", (160, 80))
+    for model in random_scene(args.models, args.faces, seed=0):
+        engine.add_model(model)
+    engine.render(0, Projection.PERSPECTIVE)
+    engine.enable_shared_memory()
+    packed = engine.packed
+
+    with multiprocessing.Pool(args.workers) as pool:
+        start = time.perf_counter()
+        payload = pickle.dumps(
+            (
+                packed.v,
+                packed.f,
+                np.array([packed.n_vertices, packed.n_faces]),
+                engine.zbuf,
+            )
+        )
+        results = pool.map(pickled_worker, [payload] * args.workers)
+        pickled = time.perf_counter() - start
+        print(
+            f"{'pickled':>8}: {pickled * 1000:8.2f} ms total, {len(payload) / 1e6:8.2f} MB per worker,"
+            f" worker {max(r[1] for r in results) * 1000:.2f} ms"
+        )
+        expected = results[0][0]
+
+        start = time.perf_counter()
+        handle = engine.shared.handle()
+        results = pool.map(shared_worker, [handle] * args.workers)
+        total = time.perf_counter() - start
+        print(
+            f"{'shared':>8}: {total * 1000:8.2f} ms total, {len(pickle.dumps(handle)) / 1e6:8.4f} MB per worker,"
+            f" worker {max(r[1] for r in results) * 1000:.2f} ms"
+        )
+        if any(r[0] != expected for r in results):
+            raise SystemExit("FAIL workers saw different data")
+
+    engine.disable_shared_memory()
+
+
+if __name__ == "__main__":
+    shared()
@@ -0,0 +1,89 @@
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+from tge.animation import Animation
+from tge.camera import Camera, Projection
+from tge.engine import GraphicsEngine
+from tge.lights import DirectionalLight
+from tge.model import load_model
+from tge.snapshot import load_snapshot, save_snapshot
+from tge.util import Axis, Vec3, build_rotation_deg, build_scale
+
+# Render options that differ from their defaults in the saved engine
+OPTIONS = {"conservative_occlusion": True, "repack": True, "lod_density": 0.25}
+
+
+def build(model_path: str, lod_levels: int) -> tuple[GraphicsEngine, Animation]:
+    """Cold start: parse the model and set up the scene as a_dir does"""
+    engine = GraphicsEngine((160, 80), handle_resize=False)
+    model = load_model(model_path, lod_levels)
+    model.apply_transform(build_scale(10, 10, 10))
+    engine.add_model(model)
+    engine.add_camera(
+        Camera(Vec3(0, 0, 30), Vec3(0, 0, 0), Vec3(0, 1, 0), 1.0472, 0.1, 100.0)
+    )
+    engine.add_light(DirectionalLight(Vec3(0, 0, -1)))
+    for option, value in OPTIONS.items():
+        setattr(engine, option, value)
+    animation = Animation(0, 0, 60, build_rotation_deg(3, Axis.Y))
+    return engine, animation
+
+
+def snapshot():
+    parser = argparse.ArgumentParser(
+        description="Compare building a scene from an .obj file with restoring it from a snapshot"
+    )
+
+    parser.add_argument(
+        "model_path",
+        type=str,
+        help="Path to the model file",
+    )
+
+    parser.add_argument(
+        "-l",
+        "--lodLevels",
+        type=int,
+        default=2,
+        help="Levels of detail built per model (default: 2)",
+        required=False,
+    )
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    engine, animation = build(args.model_path, args.lodLevels)
+    print(f"{'build':>8}: {(time.perf_counter() - start) * 1000:8.2f} ms")
+    engine.render(0, Projection.PERSPECTIVE)
+    expected = engine.buf.copy()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "scene.tgesnap")
+        start = time.perf_counter()
+        save_snapshot(path, engine, [animation], frame=12)
+        print(
+            f"{'save':>8}: {(time.perf_counter() - start) * 1000:8.2f} ms,"
+            f" {os.path.getsize(path) / 1e6:.2f} MB"
+        )
+
+        start = time.perf_counter()
+        restored, animations, frame = load_snapshot(path, handle_resize=False)
+        print(f"{'restore':>8}: {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+        if not np.array_equal(restored.buf, expected):
+            raise SystemExit("FAIL restored frame differs")
+        restored.render(0, Projection.PERSPECTIVE)
+        if not np.array_equal(restored.buf, expected):
+            raise SystemExit("FAIL restored scene renders differently")
+        for option, value in OPTIONS.items():
+            if getattr(restored, option) != value:
+                raise SystemExit(f"FAIL render option {option} was not restored")
+        if frame != 12 or not np.array_equal(animations[0].r, animation.r):
+            raise SystemExit("FAIL animation state differs")
+        print("ok")
+
+
+if __name__ == "__main__":
+    snapshot()
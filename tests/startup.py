@@ -0,0 +1,154 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "models")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be imported on first use
+HEAVY = ("matplotlib", "mpl_toolkits", "numba", "subprocess", "shutil", "signal")
+# Package modules only needed once their feature is enabled
+LAZY = ("tge.profiler", "tge.adaptive", "tge.shadows", "tge.shared", "tge.texture")
+
+# Runs in a fresh interpreter so nothing is cached between measurements
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import numpy as np
+numpy_done = time.perf_counter()
+before = set(sys.modules)
+from tge.engine import GraphicsEngine
+from tge.model import load_model
+from tge.camera import Camera, Projection
+from tge.lights import DirectionalLight
+from tge.util import build_scale, Vec3
+imported = time.perf_counter()
+new = set(sys.modules) - before
+loaded = sorted({m.split(".")[0] for m in new} | {m for m in new if m.startswith("tge.")})
+
+engine = GraphicsEngine(RESOLUTION, handle_resize=False)
+engine.add_camera(Camera(Vec3(0, 0, 30), Vec3(0, 0, 0), Vec3(0, 1, 0), 1.0472, 0.1, 100.0))
+engine.add_light(DirectionalLight(Vec3(0, 0, -1)))
+constructed = time.perf_counter()
+model = load_model(MODEL)
+model.apply_transform(build_scale(SCALE, SCALE, SCALE))
+engine.add_model(model)
+model_loaded = time.perf_counter()
+engine.render(0, Projection.PERSPECTIVE)
+engine.display.update_buffer(engine.buf)
+rendered = time.perf_counter()
+engine.display._buf_to_fb()
+encoded = time.perf_counter()
+
+print(json.dumps({
+    "import_numpy": numpy_done - start,
+    "import_tge": imported - numpy_done,
+    "construct": constructed - imported,
+    "load_model": model_loaded - constructed,
+    "first_render": rendered - model_loaded,
+    "first_encode": encoded - rendered,
+    "first_frame": encoded - start,
+    "modules": loaded,
+}))
+"""
+
+
+def probe(model: str, scale: float, resolution: tuple[int, int]) -> dict:
+    """Measure import and first-frame latency in a new interpreter"""
+    code = (
+        PROBE.replace("RESOLUTION", repr(resolution))
+        .replace("MODEL", repr(model))
+        .replace("SCALE", repr(scale))
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout)
+
+
+def startup():
+    parser = argparse.ArgumentParser(
+        description="Measure package import time and first-frame latency in fresh interpreters"
+    )
+
+    parser.add_argument(
+        "-m",
+        "--model",
+        default="cube",
+        help="Model name in tests/models (default: cube)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-s",
+        "--scale",
+        type=float,
+        default=5.0,
+        help="Model scale (default: 5.0)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-n",
+        "--runs",
+        type=int,
+        default=5,
+        help="Interpreters started; the median is reported (default: 5)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-ib",
+        "--importBudget",
+        type=float,
+        default=50.0,
+        help="Maximum time to import tge on top of numpy in ms (default: 50)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-fb",
+        "--frameBudget",
+        type=float,
+        default=500.0,
+        help="Maximum time from interpreter start to the first encoded frame in ms (default: 500)",
+        required=False,
+    )
+
+    args = parser.parse_args()
+
+    path = os.path.join(MODEL_DIR, args.model + ".obj")
+    runs = [probe(path, args.scale, (100, 50)) for _ in range(args.runs)]
+
+    failures = []
+    for key in runs[0]:
+        if key == "modules":
+            continue
+        ms = statistics.median(r[key] for r in runs) * 1000
+        print(f"{key:>14}: {ms:8.2f} ms")
+        if key == "import_tge" and ms > args.importBudget:
+            failures.append(f"import took {ms:.2f} ms (budget {args.importBudget} ms)")
+        if key == "first_frame" and ms > args.frameBudget:
+            failures.append(
+                f"first frame took {ms:.2f} ms (budget {args.frameBudget} ms)"
+            )
+
+    eager = sorted(set(runs[0]["modules"]) & set(HEAVY + LAZY))
+    if eager:
+        failures.append(f"imported eagerly: {', '.join(eager)}")
+
+    for line in failures:
+        print(f"FAIL {line}")
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    startup()
@@ -0,0 +1,126 @@
+import argparse
+import os
+import time
+import numpy as np
+from tge.camera import Projection
+from tge.texture import load_texture
+from tests.conformance import posed, setup
+
+TEXTURE_DIR = os.path.join(os.path.dirname(__file__), "textures")
+
+
+def time_render(engine, repeats: int) -> float:
+    """Fastest full render of the scene in seconds"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        engine.render(0, Projection.PERSPECTIVE)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def textured_cells(engine, model, texture) -> float:
+    """Fraction of covered cells whose shading the texture changes"""
+    model.texture = None
+    engine.render(0, Projection.PERSPECTIVE)
+    flat = engine.buf.copy()
+    model.texture = texture
+    engine.render(0, Projection.PERSPECTIVE)
+    covered = np.isfinite(engine.zbuf)
+    return (np.abs(engine.buf - flat)[covered] > 1e-6).sum() / max(covered.sum(), 1)
+
+
+def texture():
+    parser = argparse.ArgumentParser(
+        description="Render a model with and without a texture and compare frame times"
+    )
+
+    parser.add_argument(
+        "-m",
+        "--model",
+        default="cube",
+        help="Test model with texture coordinates (default: cube)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-t",
+        "--texture",
+        default=os.path.join(TEXTURE_DIR, "bricks.txt"),
+        help="Texture image or character pattern (default: tests/textures/bricks.txt)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-f",
+        "--filter",
+        choices=["nearest", "bilinear"],
+        default="nearest",
+        help="Texture filter (default: nearest)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-b",
+        "--backend",
+        default="numpy",
+        help="Rasterizer backend (default: numpy)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-r",
+        "--repeats",
+        type=int,
+        default=10,
+        help="Renders timed per path; the fastest is kept (default: 10)",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-l",
+        "--lodLevels",
+        type=int,
+        default=2,
+        help="Levels of detail built for the check that the coarsest level stays textured (default: 2)",
+        required=False,
+    )
+
+    args = parser.parse_args()
+
+    engine = setup(args.backend, (100, 50))
+    model = posed(args.model, 8.0, 25.0, 45.0)
+    if model.uv is None:
+        raise SystemExit(f"{args.model} has no texture coordinates")
+    engine.add_model(model)
+
+    flat = time_render(engine, args.repeats)
+    model.texture = load_texture(args.texture, args.filter)
+    textured = time_render(engine, args.repeats)
+    cells = int(np.isfinite(engine.zbuf).sum())
+
+    print("\n".join("".join(row) for row in engine.display.buf))
+    print(
+        f"{len(model.f)} faces, {cells} cells: flat {flat * 1000:.2f} ms,"
+        f" textured {textured * 1000:.2f} ms"
+    )
+
+    lod_model = posed(args.model, 8.0, 25.0, 45.0, lod_levels=args.lodLevels)
+    if not lod_model.lods:
+        print(f"{args.model} is too small for levels of detail")
+        return
+    lod_engine = setup(args.backend, (100, 50))
+    # Any density picks the coarsest level
+    lod_engine.lod_density = 1e-9
+    lod_engine.add_model(lod_model)
+    coarsest = lod_model.lods[-1]
+    share = textured_cells(lod_engine, lod_model, model.texture)
+    print(
+        f"Coarsest level of detail: {len(coarsest.f)} faces, {share:.2%} of cells textured"
+    )
+    if coarsest.uv is None or share == 0:
+        raise SystemExit("Levels of detail lost the texture")
+
+
+if __name__ == "__main__":
+    texture()
@@ -0,0 +1,71 @@
+"""
+Frame-time driven render resolution scaling.
+"""
+
+
+class ResolutionController:
+    """Chooses a render scale from measured frame times so frames fit in a time budget.
+
+    Rasterization cost grows with the number of cells, so the scale moves by the square root of the
+    ratio between the budget and the smoothed frame time. Steps are limited and the scale only grows
+    again once frames are well under budget, which keeps it from oscillating.
+    """
+
+    def __init__(
+        self,
+        budget: float,
+        min_scale: float = 0.25,
+        max_scale: float = 1.0,
+        smoothing: float = 0.3,
+        headroom: float = 0.7,
+    ):
+        """Initialize a resolution controller
+
+        Args:
+            budget (float): Target frame time (seconds)
+            min_scale (float, optional): Smallest render scale. Defaults to 0.25.
+            max_scale (float, optional): Largest render scale, at most 1. Defaults to 1.0.
+            smoothing (float, optional): Weight of the newest frame time in the moving average. Defaults to 0.3.
+            headroom (float, optional): Fraction of the budget frames must stay under before the scale grows. Defaults to 0.7.
+
+        Raises:
+            ValueError: If the budget is not positive or the scale range is invalid
+        """
+        if budget <= 0:
+            raise ValueError("Frame budget must be positive")
+        if not 0 < min_scale <= max_scale <= 1:
+            raise ValueError("Scales must satisfy 0 < min_scale <= max_scale <= 1")
+        self.budget = budget
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.smoothing = smoothing
+        self.headroom = headroom
+        self.scale = max_scale
+        self.frame_time: float | None = None
+
+    def update(self, frame_time: float) -> float:
+        """Add a measured frame time and compute the scale for the next frame
+
+        Args:
+            frame_time (float): Time taken by the last frame (seconds)
+
+        Returns:
+            (float): Render scale for the next frame
+        """
+        if self.frame_time is None:
+            self.frame_time = frame_time
+        else:
+            self.frame_time += self.smoothing * (frame_time - self.frame_time)
+
+        ratio = self.budget / max(self.frame_time, 1e-9)
+        if ratio < 1:
+            self.scale *= max(ratio**0.5, 0.75)
+        elif ratio > 1 / self.headroom:
+            self.scale *= min(ratio**0.5, 1.1)
+        self.scale = min(max(self.scale, self.min_scale), self.max_scale)
+        return self.scale
+
+    def reset(self):
+        """Forget measured frame times and return to the largest scale"""
+        self.scale = self.max_scale
+        self.frame_time = None
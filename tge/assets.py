@@ -0,0 +1,88 @@
+"""
+Concurrent loading of many model files.
+"""
+
+import os
+import time
+from typing import List
+from .model import Model, load_model
+
+
+def load_models(
+    paths: List[str],
+    workers: int | None = None,
+    processes: bool = True,
+    **kwargs,
+) -> tuple[List[Model], dict[str, float]]:
+    """Load several .obj files concurrently. Each distinct file is loaded once; paths naming the same file (after
+    resolving relative paths and symlinks) share the same Model.
+
+    Parsing is pure Python and holds the GIL, so only a process pool loads files in parallel. A thread pool is
+    slower than loading serially unless reading the files dominates, e.g. on a network file system. With a single
+    worker the files are loaded serially in the calling process.
+
+    Args:
+        paths (List[str]): Paths to .obj files
+        workers (int | None, optional): Number of workers. Defaults to one per distinct file, at most os.cpu_count() for processes and os.cpu_count() + 4 for threads.
+        processes (bool, optional): Whether to load in a process pool instead of a thread pool. Defaults to True.
+        **kwargs: Passed on to load_model (lod_levels, clean, compact)
+
+    Raises:
+        OSError: If a file cannot be read
+
+    Returns:
+        (tuple[List[Model], dict[str, float]]): Models in the order of paths, and the load time in seconds of every
+        distinct file, keyed by the first path naming it
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    unique: dict[str, str] = {}
+    for path in paths:
+        unique.setdefault(os.path.realpath(path), path)
+    if not unique:
+        return [], {}
+
+    if workers is None:
+        # Like ThreadPoolExecutor, allow a few more threads than CPUs to overlap file I/O
+        cap = (os.cpu_count() or 1) + (0 if processes else 4)
+        workers = min(len(unique), cap)
+    if workers == 1:
+        # A pool would only add start-up and transfer costs
+        loaded = {real: _timed_load(real, kwargs) for real in unique}
+    else:
+        executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        with executor(max_workers=workers) as pool:
+            futures = {real: pool.submit(_timed_load, real, kwargs) for real in unique}
+            loaded = {real: future.result() for real, future in futures.items()}
+
+    models = [loaded[os.path.realpath(path)][0] for path in paths]
+    timings = {unique[real]: seconds for real, (_, seconds) in loaded.items()}
+    return models, timings
+
+
+async def load_models_async(
+    paths: List[str],
+    workers: int | None = None,
+    processes: bool = True,
+    **kwargs,
+) -> tuple[List[Model], dict[str, float]]:
+    """Awaitable load_models: runs the concurrent load without blocking the event loop
+
+    Args:
+        paths (List[str]): Paths to .obj files
+        workers (int | None, optional): Number of workers. Defaults to one per distinct file, capped as in load_models.
+        processes (bool, optional): Whether to load in a process pool instead of a thread pool. Defaults to True.
+        **kwargs: Passed on to load_model (lod_levels, clean, compact)
+
+    Returns:
+        (tuple[List[Model], dict[str, float]]): Models in the order of paths and per-file load times, see load_models
+    """
+    import asyncio
+
+    return await asyncio.to_thread(load_models, paths, workers, processes, **kwargs)
+
+
+def _timed_load(path: str, kwargs: dict) -> tuple[Model, float]:
+    start = time.perf_counter()
+    model = load_model(path, **kwargs)
+    return model, time.perf_counter() - start
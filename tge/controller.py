@@ -0,0 +1,203 @@
+"""
+Interactive camera control: input events move a camera, and frames are rendered as soon as input arrives.
+"""
+
+import time
+from typing import Callable, List
+import numpy as np
+from .camera import Camera, Projection
+from .engine import GraphicsEngine
+from .input import InputEvent, TerminalInput
+from .util import Vec3, normalize
+
+QUIT_KEYS = ("escape", "ctrl-c", "x")
+
+
+class CameraController:
+    """First-person camera control.
+
+    Keys: w/s move forward and back, a/d strafe, r/f move up and down, arrow keys turn, +/- zoom. Dragging with a mouse
+    button turns the camera and the wheel moves it forward and back.
+    """
+
+    def __init__(
+        self,
+        camera: Camera,
+        move_step: float = 1.0,
+        turn_step: float = np.radians(5),
+        drag_scale: float = np.radians(2),
+    ):
+        """Initialize a camera controller
+
+        Args:
+            camera (Camera): Camera to control
+            move_step (float, optional): Distance moved per key press. Defaults to 1.0.
+            turn_step (float, optional): Angle turned per key press (radians). Defaults to 5 degrees.
+            drag_scale (float, optional): Angle turned per terminal cell dragged (radians). Defaults to 2 degrees.
+        """
+        self.camera = camera
+        self.move_step = move_step
+        self.turn_step = turn_step
+        self.drag_scale = drag_scale
+        self._drag: tuple[int, int] | None = None
+
+    def handle(self, event: InputEvent) -> bool:
+        """Update the camera from an input event
+
+        Args:
+            event (InputEvent): Key or mouse event
+
+        Returns:
+            (bool): Whether the camera changed
+        """
+        if event.kind == "mouse":
+            return self._handle_mouse(event)
+        key = event.key
+        step = self.move_step
+        if key == "w":
+            self.move(step, 0, 0)
+        elif key == "s":
+            self.move(-step, 0, 0)
+        elif key == "d":
+            self.move(0, step, 0)
+        elif key == "a":
+            self.move(0, -step, 0)
+        elif key == "r":
+            self.move(0, 0, step)
+        elif key == "f":
+            self.move(0, 0, -step)
+        elif key == "left":
+            self.turn(self.turn_step, 0)
+        elif key == "right":
+            self.turn(-self.turn_step, 0)
+        elif key == "up":
+            self.turn(0, self.turn_step)
+        elif key == "down":
+            self.turn(0, -self.turn_step)
+        elif key in ("+", "="):
+            self.zoom(0.9)
+        elif key in ("-", "_"):
+            self.zoom(1 / 0.9)
+        else:
+            return False
+        return True
+
+    def move(self, forward: float, right: float, up: float):
+        """Move the camera relative to where it is looking
+
+        Args:
+            forward (float): Distance along the view direction
+            right (float): Distance to the right
+            up (float): Distance along the camera's up vector
+        """
+        d = self.camera.dir.v
+        r = normalize(np.cross(d, self.camera.up.v))
+        self.camera.pos = self.camera.pos + (
+            forward * d + right * r + up * self.camera.up.v
+        )
+
+    def turn(self, yaw: float, pitch: float):
+        """Rotate the view direction. Pitch stops short of the up vector.
+
+        Args:
+            yaw (float): Rotation around the up vector (radians), positive turns left
+            pitch (float): Rotation towards the up vector (radians)
+        """
+        up = self.camera.up.v
+        d = _rotate(self.camera.dir.v, up, yaw)
+        r = normalize(np.cross(d, up))
+        pitched = _rotate(d, r, pitch)
+        if abs(np.dot(pitched, up)) < 0.99:
+            d = pitched
+        self.camera.dir = Vec3(*normalize(d))
+
+    def zoom(self, factor: float):
+        """Scale the field of view
+
+        Args:
+            factor (float): Field of view multiplier; below 1 zooms in
+        """
+        self.camera.fov = float(np.clip(self.camera.fov * factor, 0.1, 3.0))
+
+    def _handle_mouse(self, event: InputEvent) -> bool:
+        if event.button in (64, 65):
+            self.move(self.move_step if event.button == 64 else -self.move_step, 0, 0)
+            return True
+        if not event.pressed:
+            self._drag = None
+            return False
+        if event.button & 32 and self._drag is not None:
+            dx, dy = event.x - self._drag[0], event.y - self._drag[1]
+            self._drag = (event.x, event.y)
+            if dx == 0 and dy == 0:
+                return False
+            self.turn(-dx * self.drag_scale, -dy * self.drag_scale)
+            return True
+        self._drag = (event.x, event.y)
+        return False
+
+
+def run_interactive(
+    engine: GraphicsEngine,
+    controller: CameraController,
+    camera_id: int = 0,
+    proj_type: Projection = Projection.PERSPECTIVE,
+    terminal: TerminalInput | None = None,
+    tick: Callable[[], bool] | None = None,
+    interval: float | None = None,
+) -> List[float]:
+    """Render a scene interactively until a quit key (escape, ctrl-c or x) is pressed or the input closes.
+
+    The loop sleeps on the input instead of a fixed frame tick. When input arrives, everything pending is applied to
+    the camera and a frame is rendered and presented right away. Latency is measured per presented frame, from
+    reading its oldest input event to the end of writing the frame to the terminal.
+
+    Args:
+        engine (GraphicsEngine): Engine to render
+        controller (CameraController): Controller of the camera
+        camera_id (int, optional): ID of the rendering camera. Defaults to 0.
+        proj_type (Projection, optional): Type of projection to use. Defaults to Projection.PERSPECTIVE.
+        terminal (TerminalInput | None, optional): Input to read, already entered. Defaults to standard input.
+        tick (Callable[[], bool] | None, optional): Called every `interval` seconds without input, e.g. to advance an animation. Returns whether to render. Defaults to None.
+        interval (float | None, optional): Seconds between ticks. Defaults to 1 / engine.ups.
+
+    Returns:
+        (List[float]): Input-to-present latency of every frame rendered for input (seconds)
+    """
+    if terminal is None:
+        with TerminalInput() as terminal:
+            return run_interactive(
+                engine, controller, camera_id, proj_type, terminal, tick, interval
+            )
+
+    if interval is None:
+        interval = 1 / engine.ups
+    latencies: List[float] = []
+    engine.render(camera_id, proj_type)
+    engine.display.render_buffer()
+    next_tick = time.perf_counter() + interval
+    while True:
+        timeout = None if tick is None else max(next_tick - time.perf_counter(), 0)
+        try:
+            events = terminal.poll(timeout)
+        except EOFError:
+            break
+        if any(e.kind == "key" and e.key in QUIT_KEYS for e in events):
+            break
+        # Every event is applied, even after one has moved the camera
+        changed = [controller.handle(e) for e in events]
+        if tick is not None and time.perf_counter() >= next_tick:
+            next_tick = time.perf_counter() + interval
+            changed.append(tick())
+        if any(changed) or engine.display.resized:
+            engine.render(camera_id, proj_type)
+            engine.display.render_buffer()
+            if events:
+                latencies.append(time.perf_counter() - events[0].time)
+    return latencies
+
+
+def _rotate(v: np.ndarray, axis: np.ndarray, angle: float) -> np.ndarray:
+    """Rotate a vector around a unit axis (Rodrigues' formula)"""
+    c, s = np.cos(angle), np.sin(angle)
+    return v * c + np.cross(axis, v) * s + axis * np.dot(axis, v) * (1 - c)
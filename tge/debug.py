@@ -3,9 +3,6 @@ This file contains various methods used for visualization and debugging.
 """
 import numpy as np
 from enum import Enum
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-from mpl_toolkits.mplot3d.art3d import Poly3DCollection
 
 from tge.camera import Camera
 from .model import Model
@@ -27,7 +24,10 @@ def plot_scene(model: Model, camera: Camera, title: str = "Scene"):
         camera (Camera): Camera to plot
         title (str, optional): Graph title. Defaults to "Scene".
     """
-    vertices = model.v[:, :-1]
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D
+
+    vertices = model.v[:, :3]
 
     edges = set()
     for face in model.f:
@@ -89,5 +89,7 @@ def plot_scene(model: Model, camera: Camera, title: str = "Scene"):
 
 
 def pixel_map(buf: np.ndarray, path: str = "pixel_map.png"):
+    import matplotlib.pyplot as plt
+
     plt.imshow(buf, cmap="gray", vmin=0, vmax=1)
     plt.savefig(path)
@@ -1,11 +1,13 @@
 import os
 import sys
+import time
 import numpy as np
-import signal
 
 CLEAR = "\033[2J"
 HOME = "\033[H"
+RESET = "\033[0m"
 CHAR_SET = [" ", ".", ",", "-", "~", ":", ";", "=", "!", "*", "#", "$", "@"]
+COLOR_MODES = ("256", "truecolor")
 
 
 def get_terminal_size():
@@ -14,8 +16,12 @@ def get_terminal_size():
     Returns:
         (int, int): width and height of the terminal
     """
-    height, width = os.popen("stty size", "r").read().split()
-    return int(width), int(height)
+    try:
+        size = os.get_terminal_size(sys.__stdout__.fileno())
+    except (AttributeError, ValueError, OSError):
+        # Not attached to a terminal
+        return 80, 24
+    return size.columns, size.lines
 
 
 def clear():
@@ -35,13 +41,20 @@ def _write(m: str):
 class Display:
     """Display class for rendering a character-based buffer to the terminal"""
 
-    def __init__(self, width: int = 25, height: int = 25, hspace: int = 2):
+    def __init__(
+        self,
+        width: int = 25,
+        height: int = 25,
+        hspace: int = 2,
+        handle_resize: bool = True,
+    ):
         """Initialize the display
 
         Args:
             width (int, optional): Width of display. Defaults to 25.
             height (int, optional): Height of display. Defaults to 25.
             hspace (int, optional): Space between dispaly rows. Defaults to 2.
+            handle_resize (bool, optional): Whether to install a SIGWINCH handler that recenters the display when the terminal is resized. Defaults to True.
         """
         self.width = width
         self.height = height
@@ -49,7 +62,30 @@ class Display:
         self.buf = np.full((height, width), "@", dtype="<U1")
         self.start_row, self.start_col = self._calculate_start_pos()
         self.debug_buf = None
-        signal.signal(signal.SIGWINCH, self._handle_resize)
+        self.profiler = None
+        self.resized = False
+        self.present_time = 0.0
+        self.color_mode: str | None = None
+        # Color code per cell (palette index or packed 24-bit RGB); -1 for blank cells
+        self.colors: np.ndarray | None = None
+        if handle_resize:
+            self.install_resize_handler()
+
+    def install_resize_handler(self) -> bool:
+        """Recenter the display whenever the terminal is resized
+
+        Returns:
+            (bool): Whether the handler was installed. Fails on platforms without SIGWINCH and outside the main thread.
+        """
+        import signal
+
+        if not hasattr(signal, "SIGWINCH"):
+            return False
+        try:
+            signal.signal(signal.SIGWINCH, self._handle_resize)
+        except ValueError:
+            return False
+        return True
 
     def _calculate_start_pos(self):
         w, h = get_terminal_size()
@@ -57,23 +93,93 @@ class Display:
         start_column = max((w - self.width * self.hspace) // 2, 0)
         return start_row, start_column
 
+    def set_color_mode(self, mode: str | None):
+        """Choose how colors are sent to the terminal
+
+        Args:
+            mode (str | None): "256" for the xterm 256-color palette, "truecolor" for 24-bit color or None for monochrome
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode is not None and mode not in COLOR_MODES:
+            raise ValueError(f"Invalid color mode: {mode}")
+        self.color_mode = mode
+        self.colors = None
+
     def _buf_to_fb(self):
         spaces = ["".join(char * self.hspace for char in line) for line in self.buf]
+        if self.colors is not None:
+            spaces = self._colorize(spaces)
         fbuf = [
             f"\033[{self.start_row + i};{self.start_col}H{line}"
             for i, line in enumerate(spaces)
         ]
-        return CLEAR + "\n".join(fbuf)
+        fb = CLEAR + "\n".join(fbuf)
+        return fb + RESET if self.colors is not None else fb
+
+    def _colorize(self, lines: list[str]) -> list[str]:
+        """Insert color escapes into encoded rows. Runs of one color share a single escape, blank cells never
+        change the color, and the color carries over between rows, so an escape is only sent when it changes.
+        """
+        current = -1
+        out = []
+        for line, codes in zip(lines, self.colors):
+            cells = np.flatnonzero(codes >= 0)
+            if len(cells) == 0:
+                out.append(line)
+                continue
+            c = codes[cells]
+            starts = cells[np.r_[c[0] != current, c[1:] != c[:-1]]]
+            parts = [line[: starts[0] * self.hspace] if len(starts) else line]
+            bounds = np.r_[starts, len(codes)] * self.hspace
+            for k, start in enumerate(starts):
+                parts.append(self._sgr(codes[start]))
+                parts.append(line[bounds[k] : bounds[k + 1]])
+            out.append("".join(parts))
+            current = c[-1]
+        return out
+
+    def _sgr(self, code: int) -> str:
+        if self.color_mode == "256":
+            return f"\033[38;5;{code}m"
+        return f"\033[38;2;{code >> 16};{(code >> 8) & 255};{code & 255}m"
 
     def _handle_resize(self, signum, frame):
         self.start_row, self.start_col = self._calculate_start_pos()
+        # Buffers are reallocated by the owner between frames, never inside the handler
+        self.resized = True
+
+    def resize(self, width: int, height: int):
+        """Change the size of the display
+
+        Args:
+            width (int): New width
+            height (int): New height
+        """
+        self.width = width
+        self.height = height
+        self.buf = np.full((height, width), "@", dtype="<U1")
+        self.start_row, self.start_col = self._calculate_start_pos()
+
+    def fit_terminal(self) -> tuple[int, int]:
+        """Largest display size that fits in the terminal
+
+        Returns:
+            (tuple[int, int]): Width and height
+        """
+        w, h = get_terminal_size()
+        return max(w // self.hspace, 1), max(h, 1)
 
-    def update_buffer(self, r: np.ndarray, debug=False):
+    def update_buffer(
+        self, r: np.ndarray, debug=False, colors: np.ndarray | None = None
+    ):
         """Converts render output to a character-based buffer and updates frame buffer
 
         Args:
             new_buf (np.ndarray): Render output
             debug (bool): Whether to save the render output to the debug buffer
+            colors (np.ndarray | None): RGB [0, 1] per cell (h, w, 3). Only used in a color mode.
 
         Raises:
             ValueError: If the shape of new_buf does not match the shape of the current buffer
@@ -86,9 +192,34 @@ class Display:
             self.debug_buf = r
         r_i = np.round(r * (len(CHAR_SET) - 1)).astype(int)
         self.buf = np.array(CHAR_SET)[r_i]
+        if self.color_mode is not None and colors is not None:
+            codes = _color_codes(colors, self.color_mode)
+            codes[r_i == 0] = -1
+            self.colors = codes
 
     def render_buffer(self):
         """Render the buffer to the terminal"""
+        start = time.perf_counter()
         fbuf = self._buf_to_fb()
+        encoded = time.perf_counter()
         _write(fbuf)
         _flush()
+        end = time.perf_counter()
+        self.present_time = end - start
+        if self.profiler is not None:
+            self.profiler.record("encode", start, encoded)
+            self.profiler.record("write", encoded, end)
+
+
+def _color_codes(colors: np.ndarray, mode: str) -> np.ndarray:
+    """Quantize RGB [0, 1] (..., 3) to xterm 256-color palette indices or packed 24-bit integers"""
+    c = np.clip(colors, 0, 1)
+    if mode == "truecolor":
+        q = np.rint(c * 255).astype(np.int64)
+        return (q[..., 0] << 16) | (q[..., 1] << 8) | q[..., 2]
+    # 6x6x6 color cube, with the 24-step gray ramp for (nearly) gray colors
+    q = np.rint(c * 5).astype(np.int64)
+    cube = 16 + 36 * q[..., 0] + 6 * q[..., 1] + q[..., 2]
+    gray = 232 + np.rint(c.mean(axis=-1) * 23).astype(np.int64)
+    is_gray = c.max(axis=-1) - c.min(axis=-1) < 0.04
+    return np.where(is_gray, gray, cube)
@@ -1,9 +1,14 @@
-from typing import List
+from enum import Enum
+from functools import partial
+from typing import Iterator, List
 import numpy as np
 from .display import Display
-from .model import Model, apply_transform
+from .model import Model, InstancedMesh, transform_normals
 from .camera import Camera, Projection
 from .lights import DirectionalLight, PointLight, SpotLight
+from .scene import SceneGraph
+from .packed import PackedGeometry
+from .raster import Rasterizer, get_rasterizer, draw_lines, draw_points, paint
 from .util import Vec3
 
 import time
@@ -11,17 +16,38 @@ import time
 ORIGIN = Vec3(0, 0, 0)
 
 
+class RenderMode(Enum):
+    """Enum for render modes"""
+
+    SOLID = 0
+    WIREFRAME = 1
+    SILHOUETTE = 2
+    POINTS = 3
+
+
 class GraphicsEngine:
     """Graphics engine for rendering 3D models to the terminal. Handles rendering pipeline and rasterization."""
 
-    def __init__(self, resolution: tuple[int, int], ups: int = 60):
+    def __init__(
+        self,
+        resolution: tuple[int, int],
+        ups: int = 60,
+        dtype: type = np.float64,
+        rasterizer: str | Rasterizer = "reference",
+        handle_resize: bool = True,
+    ):
         """Initialize a graphics engine
 
         Args:
             resolution (tuple[int, int]): Resolution of the display (width, height) in characters
             ups (int, optional): Display updates per second. Defaults to 60.
+            dtype (type, optional): Float type of the frame and depth buffers. Use np.float32 together with compact models. Defaults to np.float64.
+            rasterizer (str | Rasterizer, optional): Rasterizer backend or its name ("reference", "numpy" or "numba"). Defaults to "reference".
+            handle_resize (bool, optional): Whether the display installs a SIGWINCH handler. Disable when embedding the engine or rendering off the main thread. Defaults to True.
         """
-        self.display = Display(resolution[0], resolution[1])
+        self.display = Display(
+            resolution[0], resolution[1], handle_resize=handle_resize
+        )
         self.aspect_ratio = resolution[0] / resolution[1]
         self.ups = ups
         self.models: List[Model] = []
@@ -29,13 +55,39 @@ class GraphicsEngine:
         self.point_lights: List[PointLight] = []
         self.spot_lights: List[SpotLight] = []
         self.camera = []
-        self._mlen = int(
-            (resolution[0] ** 2 + resolution[1] ** 2) ** 0.5
-            + resolution[0]
-            + resolution[1]
+        self.scene = SceneGraph()
+        self.instances: List[InstancedMesh] = []
+        self.lod_density: float | None = 0.5
+        self.profiler: "Profiler | None" = None
+        self.rasterizer = (
+            get_rasterizer(rasterizer) if isinstance(rasterizer, str) else rasterizer
         )
-        self.buf = np.zeros((self.display.height, self.display.width))
-        self.zbuf = np.full((self.display.height, self.display.width), -np.inf)
+        self.fit_terminal = False
+        self.render_scale = 1.0
+        self.resolution_controller: "ResolutionController | None" = None
+        self.incremental = False
+        self.render_mode = RenderMode.SOLID
+        # Painter's algorithm instead of the depth buffer for solid rendering
+        self.painter = False
+        self._painted = 0
+        # Only skip faces hidden in their whole screen bounds, so occlusion tests never change the depth buffer
+        self.conservative_occlusion = False
+        self.shadows = False
+        self.shadow_resolution = 256
+        self.shadow_bias = 0.005
+        self._shadow_maps: "dict[int, ShadowMap]" = {}
+        self.cbuf: np.ndarray | None = None
+        self.shared: "SharedArrays | None" = None
+        # Copy packed models into the buffer every frame, so vertices edited in place show up without
+        # Model.mark_changed
+        self.repack = False
+        self.packed = PackedGeometry()
+        self._packed_models: List[int | None] = []
+        self._packed_nodes: dict[int, tuple[int, Model]] = {}
+        self._packed_frame: tuple | None = None
+        self._state: tuple | None = None
+        self._drawn: dict = {}
+        self._allocate_buffers(dtype)
 
     def add_model(self, model: Model) -> int:
         """Add a model to the scene
@@ -47,6 +99,7 @@ class GraphicsEngine:
             (int): Model ID
         """
         self.models.append(model)
+        self._packed_models.append(self.packed.add(model) if _packable(model) else None)
         return len(self.models) - 1
 
     def remove_model(self, id: int):
@@ -56,6 +109,9 @@ class GraphicsEngine:
             id (int): Model ID
         """
         self.models.pop(id)
+        handle = self._packed_models.pop(id)
+        if handle is not None:
+            self.packed.remove(handle)
 
     def transform_model(self, m_id: int, t: np.ndarray):
         """Apply a transformation to a model in the scene
@@ -74,6 +130,47 @@ class GraphicsEngine:
             raise IndexError("Model ID out of range")
         self.models[m_id].apply_transform(t)
 
+    def add_instances(self, model: Model, transforms: np.ndarray) -> int:
+        """Add a model drawn once per transformation. The geometry is shared between all instances.
+
+        Args:
+            model (Model): Model to instance
+            transforms (np.ndarray): Per-instance transformations (n, 4, 4)
+
+        Returns:
+            (int): Instanced mesh ID
+        """
+        self.instances.append(InstancedMesh(model, transforms))
+        return len(self.instances) - 1
+
+    def remove_instances(self, id: int):
+        """Removes an instanced mesh and all of its instances from the scene
+
+        Args:
+            id (int): Instanced mesh ID
+
+        Raises:
+            IndexError: If instanced mesh ID is invalid
+        """
+        if id >= len(self.instances):
+            raise IndexError("Instanced mesh ID out of range")
+        self.instances.pop(id)
+
+    def transform_instance(self, i_id: int, idx: int, t: np.ndarray):
+        """Apply a transformation to a single instance of an instanced mesh
+
+        Args:
+            i_id (int): Instanced mesh ID
+            idx (int): Instance index
+            t (np.ndarray): transformation matrix to apply (4x4)
+
+        Raises:
+            IndexError: If instanced mesh ID is invalid
+        """
+        if i_id >= len(self.instances):
+            raise IndexError("Instanced mesh ID out of range")
+        self.instances[i_id].transform_instance(idx, t)
+
     def add_camera(self, camera: Camera) -> int:
         """Add a camera to the scene
 
@@ -147,176 +244,1270 @@ class GraphicsEngine:
         else:
             raise ValueError("Invalid light type")
 
-    def render(self, camera_id: int, proj_type: Projection = Projection.PERSPECTIVE):
+    def render(
+        self, camera_id: int, proj_type: Projection = Projection.PERSPECTIVE
+    ) -> bool:
         """Render a frame of the scene to the buffer
 
+        With `incremental` set, frames in which no model, camera or light changed are skipped, and when only some
+        drawables changed just the union of their old and new screen-space bounds is cleared and redrawn.
+        Models edited without apply_transform/apply_translate must call Model.mark_changed to be picked up.
+
         Args:
             camera_id (int): ID of the camera to use for rendering
             proj_type (Projection, optional): Type of projection to use. Defaults to Projection.PERSPECTIVE.
+
+        Returns:
+            (bool): Whether the buffer changed
         """
-        self._clear()
-        h, w = self.buf.shape
+        if self.profiler is not None:
+            self.profiler.begin_frame()
+        if self.display.resized:
+            self.display.resized = False
+            if self.fit_terminal:
+                self.resize(self.display.fit_terminal())
+        self._match_channels()
+        start = frame_start = time.perf_counter()
         camera = self.camera[camera_id]
         view_matrix = camera.get_view_matrix()
         proj_matrix = camera.get_proj_matrix(self.aspect_ratio, proj_type)
         t = proj_matrix @ view_matrix
+        self.scene.update()
+        drawables = self._drawables(t)
+        state = self._frame_state(t)
+        self._record("transform", start)
+        if self.shadows:
+            self._update_shadow_maps(drawables)
 
-        for model in self.models:
-            m = apply_transform(model, t)
-            # Skipping clipping for now; add later if needed
-            # Perspective Division
-            m.v = m.v / m.v[:, 3].reshape(-1, 1)
+        if self.incremental and state == self._state:
+            changed = self._render_dirty(drawables, camera)
+        else:
+            self._render_full(drawables, camera)
+            changed = True
+        self._state = state if self.incremental else None
 
-            # Convert NDC to screen (in-place)
-            self._ndc_to_screen(m, inv_y=True)
-            v = m.round_xy()
-            z = m.get_z()
+        if changed and self.shadows:
+            self._apply_shadows(t)
 
-            ew_time = 0
+        if changed:
+            self._update_display()
+        if self.profiler is not None:
+            self.profiler.last.pixels_covered = self._covered()
+            self.profiler.end_frame()
 
-            # Rasterization
-            norms = model.n
-            # Ideally, this should never happen
-            if model.n is None:
-                norms = m.compute_normals()
-            for i, face in enumerate(m.f):
-                view = camera.dir.v
-                # Back-face culling
-                if np.dot(norms[i], view) >= 0:
-                    continue
-                v0, v1, v2 = v[face]
-                z0, z1, z2 = z[face]
-
-                # Skip this face if all vertices are obscured
-                if (
-                    z0 < self.zbuf[v0[1], v0[0]]
-                    and z1 < self.zbuf[v1[1], v1[0]]
-                    and z2 < self.zbuf[v2[1], v2[0]]
-                ):
-                    continue
-
-                # Edge walking & scan conversion
-                edge_set = set()
-                edge_pts = np.zeros((self._mlen, 2), dtype=int)
-                edge_zs = np.zeros(self._mlen)
-
-                j = _bresenhams_line(
-                    v0, v1, z0, z1, w, h, edge_set, edge_pts, edge_zs, 0
+        if self.resolution_controller is not None:
+            # The previous present is the best estimate of this frame's present
+            frame_time = time.perf_counter() - frame_start + self.display.present_time
+            self.set_render_scale(self.resolution_controller.update(frame_time))
+        return changed
+
+    def set_color_mode(self, mode: str | None):
+        """Shade faces in color and send colors to the terminal. Faces take the color of their model (Model.color),
+        lit by the colors of the directional lights.
+
+        Args:
+            mode (str | None): "256" for the xterm 256-color palette, "truecolor" for 24-bit color or None for monochrome
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        self.display.set_color_mode(mode)
+        self._allocate_buffers(self.buf.dtype)
+        self._state = None
+
+    def enable_shadows(self, resolution: int = 256, bias: float = 0.005):
+        """Cast shadows from every directional light using shadow maps.
+
+        A light's shadow map is rendered with the engine's rasterizer and reused until the light, the resolution or
+        any model, node or instance changes. Faces facing away from a light are drawn into its map, so shadow casters
+        should be closed meshes. Shadows need the depth buffer: they are not drawn with the painter's algorithm or by
+        render_frames.
+
+        Args:
+            resolution (int, optional): Width and height of each shadow map in texels. Defaults to 256.
+            bias (float, optional): Depth tolerance of the shadow test, as a fraction of the scene's depth range. Defaults to 0.005.
+        """
+        self.shadows = True
+        self.shadow_resolution = resolution
+        self.shadow_bias = bias
+        self._allocate_buffers(self.buf.dtype)
+        self._state = None
+
+    def disable_shadows(self):
+        """Stop casting shadows and release the shadow maps"""
+        self.shadows = False
+        self._shadow_maps = {}
+        self._allocate_buffers(self.buf.dtype)
+        self._state = None
+
+    def enable_shared_memory(self) -> "SharedArrays":
+        """Move the packed scene geometry and the frame and depth buffers into shared memory blocks.
+
+        Other processes map them with SharedArrays.attach(engine.shared.handle()) instead of receiving pickled
+        copies. The frame is "frame" (intensity, then the other channels in color or shadow mode), the depth buffer
+        "zbuf" and the packed geometry "packed.*" (see PackedGeometry). Buffers are reallocated, and the handle
+        changes, when the resolution, render scale, color mode or shadows change or the geometry outgrows its
+        capacity; compare handles to notice.
+
+        Returns:
+            (SharedArrays): Shared arrays of the engine
+        """
+        from .shared import SharedArrays
+
+        if self.shared is None:
+            self.shared = SharedArrays()
+            self.packed.share(self.shared)
+            frame, zbuf = self._frame, self.zbuf
+            self._allocate_buffers(self.buf.dtype)
+            self._frame[...] = frame
+            self.zbuf[...] = zbuf
+        return self.shared
+
+    def disable_shared_memory(self):
+        """Move the geometry and buffers back into private memory and free the shared blocks"""
+        if self.shared is None:
+            return
+        shared, self.shared = self.shared, None
+        self.packed.share(None)
+        frame, zbuf = self._frame, self.zbuf
+        self._allocate_buffers(self.buf.dtype)
+        self._frame[...] = frame
+        self.zbuf[...] = zbuf
+        shared.close()
+
+    def resize(self, resolution: tuple[int, int]):
+        """Change the display resolution and reallocate the frame and depth buffers
+
+        Args:
+            resolution (tuple[int, int]): New resolution (width, height) in characters
+        """
+        self.display.resize(resolution[0], resolution[1])
+        self.aspect_ratio = resolution[0] / resolution[1]
+        self._allocate_buffers(self.buf.dtype)
+
+    def set_render_scale(self, scale: float):
+        """Render at a fraction of the display resolution. The frame is upscaled to the display grid.
+
+        Args:
+            scale (float): Render scale (0, 1]
+
+        Raises:
+            ValueError: If the scale is out of range
+        """
+        if not 0 < scale <= 1:
+            raise ValueError("Render scale must be in (0, 1]")
+        old = self.render_scale
+        self.render_scale = scale
+        if self._render_size(scale) != self._render_size(old):
+            self._allocate_buffers(self.buf.dtype)
+
+    def enable_adaptive_resolution(
+        self,
+        budget: float | None = None,
+        min_scale: float = 0.25,
+        max_scale: float = 1.0,
+    ) -> "ResolutionController":
+        """Scale the render resolution after every frame so frames fit in a time budget.
+
+        The measured frame time covers render and the previous display.render_buffer call.
+
+        Args:
+            budget (float | None, optional): Target frame time in seconds. Defaults to 1 / ups.
+            min_scale (float, optional): Smallest render scale. Defaults to 0.25.
+            max_scale (float, optional): Largest render scale. Defaults to 1.0.
+
+        Returns:
+            (ResolutionController): Controller choosing the scale
+        """
+        from .adaptive import ResolutionController
+
+        self.resolution_controller = ResolutionController(
+            budget if budget is not None else 1 / self.ups, min_scale, max_scale
+        )
+        self.set_render_scale(self.resolution_controller.scale)
+        return self.resolution_controller
+
+    def disable_adaptive_resolution(self):
+        """Stop adapting the render resolution and render at full resolution"""
+        self.resolution_controller = None
+        self.set_render_scale(1.0)
+
+    def render_frames(
+        self,
+        camera_id: int,
+        transforms: np.ndarray,
+        proj_type: Projection = Projection.PERSPECTIVE,
+        chunk: int = 64,
+    ) -> Iterator[int]:
+        """Render one frame per transformation, projecting the geometry of many frames at once.
+
+        transforms[f] is applied to the whole scene in frame f, on top of model, node and instance transformations.
+        Vertices of up to `chunk` frames are transformed and divided in one batched matmul per model, then
+        rasterized frame by frame. Each frame is written to the display buffer before its index is yielded, so
+        the caller can present it with display.render_buffer.
+
+        Args:
+            camera_id (int): ID of the camera to use for rendering
+            transforms (np.ndarray): Scene transformation per frame (F, 4, 4)
+            proj_type (Projection, optional): Type of projection to use. Defaults to Projection.PERSPECTIVE.
+            chunk (int, optional): Number of frames projected together. Bounds memory use. Defaults to 64.
+
+        Raises:
+            ValueError: If transformations are not of shape (F, 4, 4)
+
+        Yields:
+            (int): Index of the frame that was just rendered
+        """
+        if transforms.ndim != 3 or transforms.shape[1:] != (4, 4):
+            raise ValueError("Transformation matrices must be of shape (F, 4, 4)")
+        if self._frame_channels() != self._channels():
+            self._allocate_buffers(self.buf.dtype)
+        camera = self.camera[camera_id]
+        view_matrix = camera.get_view_matrix()
+        proj_matrix = camera.get_proj_matrix(self.aspect_ratio, proj_type)
+        t = proj_matrix @ view_matrix
+        self.scene.update()
+        # The buffers no longer hold the last incremental frame
+        self._state = None
+
+        for first in range(0, len(transforms), chunk):
+            block = transforms[first : first + chunk]
+            if self.profiler is not None:
+                self.profiler.begin_frame()
+            start = time.perf_counter()
+            frames = [[] for _ in block]
+            for model in self.models:
+                for f, batch in enumerate(self._project_stack(model, t, block)):
+                    frames[f].append(batch)
+            for node_id, model in self.scene.drawables():
+                stack = block @ self.scene.world[node_id]
+                for f, batch in enumerate(self._project_stack(model, t, stack)):
+                    frames[f].append(batch)
+            for instances in self.instances:
+                n = len(instances)
+                stack = (block[:, None] @ instances.transforms[None]).reshape(-1, 4, 4)
+                batches = self._project_stack(instances.model, t, stack)
+                for f in range(len(block)):
+                    frames[f].extend(batches[f * n : (f + 1) * n])
+            # Projection of the whole chunk is accounted to its first frame
+            self._record("transform", start)
+
+            for f, batches in enumerate(frames):
+                if f > 0 and self.profiler is not None:
+                    self.profiler.begin_frame()
+                self._clear()
+                self._draw_batches(batches, camera)
+                self._update_display()
+                if self.profiler is not None:
+                    self.profiler.last.pixels_covered = self._covered()
+                    self.profiler.end_frame()
+                yield first + f
+
+    def enable_profiling(
+        self, max_frames: int = 600, trace: bool = False
+    ) -> "Profiler":
+        """Start collecting per-frame statistics (stage times, triangle and pixel counts, net allocated blocks).
+
+        Allocation peaks in bytes are only recorded while tracemalloc is tracing.
+
+        Args:
+            max_frames (int, optional): Number of frames kept in history. Defaults to 600.
+            trace (bool, optional): Whether to keep stage events for Chrome trace export. Defaults to False.
+
+        Returns:
+            (Profiler): Profiler holding the collected statistics
+        """
+        from .profiler import Profiler
+
+        self.profiler = Profiler(max_frames, trace)
+        self.display.profiler = self.profiler
+        return self.profiler
+
+    def disable_profiling(self):
+        """Stop collecting per-frame statistics"""
+        self.profiler = None
+        self.display.profiler = None
+
+    def get_stats(self) -> dict | None:
+        """Get statistics of the most recently rendered frame
+
+        Returns:
+            (dict | None): Frame statistics, or None if profiling is disabled or nothing was rendered
+        """
+        if self.profiler is None or self.profiler.last is None:
+            return None
+        return self.profiler.last.to_dict()
+
+    def get_frame(self) -> tuple[np.ndarray, np.ndarray]:
+        """Get the last rendered frame with all its channels, and the depth buffer
+
+        Returns:
+            (tuple[np.ndarray, np.ndarray]): Frame (h, w), or (h, w, c) with color, shadow or owner channels after the
+            intensity, and depth buffer (h, w). Both are the engine's buffers, not copies.
+        """
+        return self._frame, self.zbuf
+
+    def restore_frame(self, frame: np.ndarray, zbuf: np.ndarray) -> bool:
+        """Copy a frame and depth buffer from get_frame into the buffers and present them until the next render
+
+        Args:
+            frame (np.ndarray): Frame with all its channels
+            zbuf (np.ndarray): Depth buffer
+
+        Returns:
+            (bool): Whether they fit the current buffers; nothing is copied otherwise
+        """
+        self._match_channels()
+        if frame.shape != self._frame.shape or zbuf.shape != self.zbuf.shape:
+            return False
+        self._frame[...] = frame
+        self.zbuf[...] = zbuf
+        self._update_display()
+        return True
+
+    def _record(self, stage: str, start: float) -> float:
+        """Record the time spent in a stage since start, if profiling is enabled
+
+        Args:
+            stage (str): Stage name
+            start (float): Start time (time.perf_counter)
+
+        Returns:
+            (float): Current time
+        """
+        now = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.record(stage, start, now)
+        return now
+
+    def _drawables(self, t: np.ndarray) -> List[tuple]:
+        """List everything to draw this frame, in draw order
+
+        Args:
+            t (np.ndarray): View-projection transformation (4x4)
+
+        Returns:
+            (List[tuple]): (key, signature, object, prepare) per drawable. The signature changes whenever the
+            drawable does and prepare() returns its projected batches; prepare(t=...) projects them with another
+            view-projection transformation instead, as for shadow maps.
+        """
+        self._sync_packed()
+        items = []
+        for i, model in enumerate(self.models):
+            sig = (id(model), model.version, id(model.v), _surface_key(model))
+            handle = self._packed_models[i]
+            if handle is None:
+                prepare = partial(self._prepare_model, model, t=t)
+            else:
+                prepare = partial(self._prepare_packed, handle, t=t)
+            items.append((("model", i), sig, model, prepare))
+        for node_id, model in self.scene.drawables():
+            world = self.scene.world[node_id]
+            sig = (id(model), model.version, id(model.v), _surface_key(model))
+            sig += (world.tobytes(),)
+            if node_id in self._packed_nodes:
+                prepare = partial(
+                    self._prepare_packed, self._packed_nodes[node_id][0], t=t
                 )
-                j = _bresenhams_line(
-                    v1, v2, z1, z2, w, h, edge_set, edge_pts, edge_zs, j
+            else:
+                prepare = partial(self._prepare_model, model, t=t, world=world.copy())
+            items.append((("node", node_id), sig, model, prepare))
+        for i, instances in enumerate(self.instances):
+            model = instances.model
+            sig = (id(instances), model.version, id(model.v), _surface_key(model))
+            sig += (instances.transforms.tobytes(),)
+            prepare = partial(self._prepare_instances, instances, t=t)
+            items.append((("instances", i), sig, instances, prepare))
+        return items
+
+    def _sync_packed(self):
+        """Bring the packed geometry up to date with the models and scene graph nodes. Models are only copied again
+        when they changed (see PackedGeometry.refresh), or every frame with `repack` set.
+        """
+        for i, model in enumerate(self.models):
+            handle = self._packed_models[i]
+            if handle is None:
+                continue
+            if _packable(model):
+                self._refresh_packed(handle)
+            else:
+                # Gained levels of detail after it was added
+                self.packed.remove(handle)
+                self._packed_models[i] = None
+
+        nodes = {}
+        for node_id, model in self.scene.drawables():
+            handle, packed_model = self._packed_nodes.pop(node_id, (None, None))
+            if handle is not None and (
+                packed_model is not model or not _packable(model)
+            ):
+                self.packed.remove(handle)
+                handle = None
+            if handle is None and _packable(model):
+                handle = self.packed.add(model)
+            if handle is not None:
+                self._refresh_packed(handle)
+                self.packed.set_matrix(handle, self.scene.world[node_id])
+                nodes[node_id] = (handle, model)
+        # Whatever is left belongs to removed nodes
+        for handle, _ in self._packed_nodes.values():
+            self.packed.remove(handle)
+        self._packed_nodes = nodes
+
+    def _refresh_packed(self, handle: int):
+        """Copy a packed model into the buffers again: only when it changed, or every frame with `repack` set"""
+        if self.repack:
+            self.packed.rewrite(handle)
+        else:
+            self.packed.refresh(handle)
+
+    def _prepare_packed(self, handle: int, t: np.ndarray) -> List[tuple]:
+        """Slice a packed model out of the projection of the whole packed scene
+
+        Args:
+            handle (int): Handle of the model in the packed geometry
+            t (np.ndarray): View-projection transformation (4x4)
+
+        Returns:
+            (List[tuple]): One (v, z, faces, norms, color, mesh) batch
+        """
+        v, z, norms = self._project_packed(t)
+        v_off, v_count, f_off, f_count = self.packed.get_range(handle)
+        return [
+            (
+                v[v_off : v_off + v_count],
+                z[v_off : v_off + v_count],
+                self.packed.f[f_off : f_off + f_count],
+                norms[f_off : f_off + f_count],
+                self.packed.get_model(handle).color,
+                self.packed.get_model(handle),
+            )
+        ]
+
+    def _project_packed(
+        self, t: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Project every packed vertex with a single gather and batched matmul. Cached until t or the geometry changes.
+
+        Args:
+            t (np.ndarray): View-projection transformation (4x4)
+
+        Returns:
+            (tuple[np.ndarray, np.ndarray, np.ndarray]): Rounded screen xy (V, 2), depth (V,) and world-space normals (F, 3)
+        """
+        key = (t.tobytes(), self.packed.version, self.buf.shape)
+        if self._packed_frame is None or self._packed_frame[0] != key:
+            start = time.perf_counter()
+            v, z = self._clip_to_screen(self.packed.transform(t))
+            self._packed_frame = (key, (v, z, self.packed.world_normals()))
+            self._record("transform", start)
+        return self._packed_frame[1]
+
+    def _update_shadow_maps(self, drawables: List[tuple]):
+        """Render the shadow map of every directional light whose light or shadow casters changed
+
+        Args:
+            drawables (List[tuple]): Drawables from _drawables
+        """
+        from .shadows import ShadowMap
+
+        casters = tuple((key, sig) for key, sig, *_ in drawables)
+        maps = {}
+        bounds = None
+        for light in self.directional_lights:
+            shadow_map = self._shadow_maps.get(id(light))
+            if shadow_map is None or shadow_map.resolution != self.shadow_resolution:
+                shadow_map = ShadowMap(self.shadow_resolution)
+            shadow_map.bias = self.shadow_bias
+            key = (light.dir.v.tobytes(), casters)
+            if shadow_map.key != key:
+                if bounds is None:
+                    bounds = self._scene_bounds()
+                shadow_map.fit(light, *bounds)
+                self._render_shadow_map(shadow_map, light, drawables)
+                shadow_map.key = key
+            maps[id(light)] = shadow_map
+        self._shadow_maps = maps
+
+    def _render_shadow_map(
+        self, shadow_map: "ShadowMap", light: DirectionalLight, drawables: List[tuple]
+    ):
+        """Rasterize the depth of every face facing away from a light into its shadow map
+
+        Args:
+            shadow_map (ShadowMap): Fitted shadow map
+            light (DirectionalLight): Light the map belongs to
+            drawables (List[tuple]): Drawables of the frame from _drawables, projected again for the light
+        """
+        from .shadows import viewport
+
+        h, w = self.buf.shape[:2]
+        # Drawables project to the frame's screen space; undo its viewport to land on map texels instead
+        t = np.linalg.inv(viewport(w, h)) @ shadow_map.matrix
+        texels = np.zeros_like(shadow_map.depth)
+        for *_, prepare in drawables:
+            for v, z, faces, norms, *_ in prepare(t=t):
+                away = np.flatnonzero(norms @ light.dir.v > 0)
+                self.rasterizer.rasterize(
+                    v, z, faces[away], np.ones(len(away)), texels, shadow_map.depth
                 )
-                j = _bresenhams_line(
-                    v2, v0, z2, z0, w, h, edge_set, edge_pts, edge_zs, j
+
+    def _scene_bounds(self) -> tuple[np.ndarray, float]:
+        """Bounding sphere of all models, scene graph nodes and instances in world space
+
+        Returns:
+            (tuple[np.ndarray, float]): Center (3,) and radius
+        """
+        corners = [model.get_bounds() for model in self.models]
+        for node_id, model in self.scene.drawables():
+            corners.append(model.get_bounds() @ self.scene.world[node_id].T)
+        for instances in self.instances:
+            box = instances.model.get_bounds()
+            corners.extend(box @ np.swapaxes(instances.transforms, -1, -2))
+        if not corners:
+            return np.zeros(3), 1.0
+        points = np.concatenate(corners)[:, :3]
+        center = (points.min(axis=0) + points.max(axis=0)) / 2
+        return center, float(np.linalg.norm(points - center, axis=1).max())
+
+    def _apply_shadows(self, t: np.ndarray):
+        """Remove the share of every light from the covered cells it does not reach, in one pass over the cells
+
+        Args:
+            t (np.ndarray): View-projection transformation of the frame (4x4)
+        """
+        from .shadows import viewport
+
+        start = time.perf_counter()
+        h, w = self.zbuf.shape
+        depth = self.zbuf.reshape(-1)
+        cells = np.flatnonzero(np.isfinite(depth))
+        if len(cells) == 0 or not self.directional_lights:
+            return
+        # Back from screen space to world space
+        y, x = np.divmod(cells, w)
+        screen = np.column_stack([x, y, depth[cells], np.ones(len(cells))])
+        world = screen @ np.linalg.inv(viewport(w, h) @ t).T
+        world = world[:, :3] / world[:, 3:4]
+
+        frame = self._frame.reshape(h * w, -1)
+        first = frame.shape[1] - len(self.directional_lights) - int(self._texturing())
+        for k, light in enumerate(self.directional_lights):
+            shadowed = cells[~self._shadow_maps[id(light)].lit(world)]
+            share = frame[shadowed, first + k]
+            frame[shadowed, 0] -= share
+            if self.cbuf is not None:
+                frame[shadowed, 1:4] -= (
+                    share[:, None] * light.color * frame[shadowed, 4:7]
                 )
+        frame[cells, :first] = np.maximum(frame[cells, :first], 0)
+        self._record("shade", start)
+
+    def _frame_state(self, t: np.ndarray) -> tuple:
+        """Everything besides the drawables that affects the frame: camera, lights and buffer setup"""
+        lights = tuple(
+            light.dir.v.tobytes() + light.color.tobytes()
+            for light in self.directional_lights
+        )
+        return (
+            t.tobytes(),
+            lights,
+            self.buf.shape,
+            self.lod_density,
+            self.rasterizer,
+            self.display.color_mode,
+            self.render_mode,
+            self.painter,
+            self.conservative_occlusion,
+            self.shadows,
+            self.shadow_resolution,
+            self.shadow_bias,
+        )
+
+    def _render_full(self, drawables: List[tuple], camera: Camera):
+        """Clear the buffers and draw every drawable
+
+        Args:
+            drawables (List[tuple]): Drawables from _drawables
+            camera (Camera): Camera used for back-face culling
+        """
+        self._clear()
+        drawn = {}
+        batches = []
+        for key, sig, obj, prepare in drawables:
+            prepared = prepare()
+            batches.extend(prepared)
+            if self.incremental:
+                drawn[key] = (sig, obj, self._bounds(prepared))
+        self._draw_batches(batches, camera)
+        self._drawn = drawn
+
+    def _render_dirty(self, drawables: List[tuple], camera: Camera) -> bool:
+        """Redraw only the region covered by drawables that changed, were added or were removed since the last frame
+
+        Args:
+            drawables (List[tuple]): Drawables from _drawables
+            camera (Camera): Camera used for back-face culling
+
+        Returns:
+            (bool): Whether any cell of the buffer may have changed
+        """
+        if self._painting() or self.shadows or self._texturing():
+            # Without a depth buffer a region cannot be redrawn on top of the rest of the frame, shadows of
+            # changed drawables may fall anywhere, and textures need the owner of every cell
+            sigs = [(key, sig) for key, sig, *_ in drawables]
+            if sigs == [(key, entry[0]) for key, entry in self._drawn.items()]:
+                return False
+            self._render_full(drawables, camera)
+            return True
+
+        keys = {key for key, *_ in drawables}
+        rect = None
+        for key, (_, _, bounds) in self._drawn.items():
+            if key not in keys:
+                rect = _union(rect, bounds)
+
+        prepared = {}
+        for key, sig, obj, prepare in drawables:
+            entry = self._drawn.get(key)
+            if entry is None or entry[0] != sig:
+                batches = prepare()
+                bounds = self._bounds(batches)
+                prepared[key] = (batches, bounds)
+                rect = _union(rect, bounds)
+                if entry is not None:
+                    rect = _union(rect, entry[2])
+
+        if rect is not None:
+            x0, y0, x1, y1 = rect
+            self._frame[y0:y1, x0:x1] = 0
+            self.zbuf[y0:y1, x0:x1] = -np.inf
+
+        # Unchanged drawables overlapping the region are redrawn in full. Outside of it their fragments
+        # fail the depth test against what is already in the buffer.
+        drawn = {}
+        for key, sig, obj, prepare in drawables:
+            if key in prepared:
+                batches, bounds = prepared[key]
+            else:
+                bounds = self._drawn[key][2]
+                batches = prepare() if _intersects(bounds, rect) else []
+            for batch in batches:
+                self._draw(*batch, camera)
+            drawn[key] = (sig, obj, bounds)
+        self._drawn = drawn
+        return rect is not None
+
+    def _bounds(self, batches: List[tuple]) -> tuple[int, int, int, int] | None:
+        """Screen-space bounding rectangle of projected batches, clipped to the buffer
+
+        Args:
+            batches (List[tuple]): Batches from a prepare function
+
+        Returns:
+            (tuple[int, int, int, int] | None): (x0, y0, x1, y1) with exclusive upper bounds, or None if off-screen
+        """
+        rect = None
+        for v, *_ in batches:
+            if len(v):
+                lo, hi = v.min(axis=0), v.max(axis=0)
+                rect = _union(rect, (lo[0], lo[1], hi[0] + 1, hi[1] + 1))
+        if rect is None:
+            return None
+        h, w = self.buf.shape
+        x0, y0 = max(rect[0], 0), max(rect[1], 0)
+        x1, y1 = min(rect[2], w), min(rect[3], h)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        return int(x0), int(y0), int(x1), int(y1)
+
+    def _prepare_model(
+        self, model: Model, t: np.ndarray, world: np.ndarray | None = None
+    ) -> List[tuple]:
+        """Select a level of detail and project a single model
+
+        Args:
+            model (Model): Model to project
+            t (np.ndarray): View-projection transformation (4x4)
+            world (np.ndarray | None, optional): Model-to-world transformation of a scene graph node. Defaults to None.
+
+        Returns:
+            (List[tuple]): One (v, z, faces, norms, color, mesh) batch
+        """
+        start = time.perf_counter()
+        color = model.color
+        if world is None:
+            model = self._select_lods(model, t)[0]
+            norms = model.n
+        else:
+            t = t @ world
+            model = self._select_lods(model, t)[0]
+            norms = None if model.n is None else transform_normals(model.n, world)
+        v, z = self._project(model.v, t)
+        # Ideally, this should never happen
+        if norms is None:
+            norms = model.compute_normals()
+        self._record("transform", start)
+        return [(v, z, model.f, norms, color, model)]
+
+    def _prepare_instances(
+        self, instances: InstancedMesh, t: np.ndarray
+    ) -> List[tuple]:
+        """Transform all instances of a mesh in one batch
+
+        Args:
+            instances (InstancedMesh): Instanced mesh to project
+            t (np.ndarray): View-projection transformation (4x4)
+
+        Returns:
+            (List[tuple]): One (v, z, faces, norms, color, mesh) batch per instance
+        """
+        if len(instances) == 0:
+            return []
+        start = time.perf_counter()
+        batches = self._project_stack(instances.model, t, instances.transforms)
+        self._record("transform", start)
+        return batches
+
+    def _project_stack(
+        self, model: Model, t: np.ndarray, transforms: np.ndarray
+    ) -> List[tuple]:
+        """Project a model under a stack of model-to-world transformations in batched matmuls
+
+        Args:
+            model (Model): Model to project
+            t (np.ndarray): View-projection transformation (4x4)
+            transforms (np.ndarray): Model-to-world transformations (N, 4, 4)
+
+        Returns:
+            (List[tuple]): One (v, z, faces, norms, color, mesh) batch per transformation
+        """
+        ts = t @ transforms
+        selected = self._select_lods(model, ts)
+        batches = [None] * len(transforms)
+        # Transformations sharing a level of detail are projected together
+        for lod in set(selected):
+            idx = [i for i, m in enumerate(selected) if m is lod]
+            # (N, V, 2) screen coordinates and (N, V) depths in one batched matmul
+            v, z = self._project(lod.v, ts[idx])
+            n = lod.n if lod.n is not None else lod.compute_normals()
+            norms = transform_normals(n, transforms[idx])
+            for k, i in enumerate(idx):
+                batches[i] = (v[k], z[k], lod.f, norms[k], model.color, lod)
+        return batches
+
+    def _select_lods(self, model: Model, t: np.ndarray) -> List[Model]:
+        """Pick a level of detail from the screen-space size of a model's bounding box.
+
+        The coarsest level with at least `lod_density` faces per covered cell is chosen.
+
+        Args:
+            model (Model): Model to choose a level of detail for
+            t (np.ndarray): Model-to-clip transformation (4x4), or a stack of them (n, 4, 4)
+
+        Returns:
+            (List[Model]): Selected level per transformation (the model itself if it has no levels of detail)
+        """
+        n = 1 if t.ndim == 2 else len(t)
+        if not model.lods or self.lod_density is None:
+            return [model] * n
+
+        clip = model.get_bounds() @ np.swapaxes(t, -1, -2)
+        ndc = np.clip(clip[..., :2] / clip[..., 3:4], -1, 1)
+        extent = (ndc.max(axis=-2) - ndc.min(axis=-2)) / 2
+        height, width = self.buf.shape
+        cells = extent[..., 0] * width * extent[..., 1] * height
+        target = np.reshape(cells * self.lod_density, (-1, 1))
 
-                edge_pts = edge_pts[0:j]
-                edge_zs = edge_zs[0:j]
+        levels = [model] + model.lods
+        counts = np.array([len(m.f) for m in levels])
+        idx = np.clip((counts >= target).sum(axis=1) - 1, 0, len(levels) - 1)
+        return [levels[i] for i in idx]
 
-                intensity = 1.0
-                if len(self.directional_lights) > 0:
-                    intensity = 0.0
-                    for light in self.directional_lights:
-                        intensity += light.compute_intensity(norms[i])
-                    intensity /= len(self.directional_lights)
+    def _project(self, v: np.ndarray, t: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Project vertices to screen space
 
-                _fill_span(edge_pts, edge_zs, self.buf, self.zbuf, intensity)
-        self.display.update_buffer(self.buf, debug=True)
+        Args:
+            v (np.ndarray): Homogeneous vertices (V, 4), or compact xyz vertices (V, 3)
+            t (np.ndarray): Model-to-clip transformation (4x4), or a stack of them (N, 4, 4)
+
+        Returns:
+            (tuple[np.ndarray, np.ndarray]): Rounded screen xy (..., V, 2) and depth (..., V)
+        """
+        if v.shape[1] == 3:
+            # Compact vertices stay in their own precision with an implicit w = 1
+            t = t.astype(v.dtype)
+            clip = v @ np.swapaxes(t[..., :3], -1, -2) + t[..., None, :, 3]
+        else:
+            clip = v @ np.swapaxes(t, -1, -2)
+        return self._clip_to_screen(clip)
 
-    def _ndc_to_screen(self, m: Model, inv_y: bool = False):
-        """Converts a model with points in NDC to screen coordinates (in-place)
+    def _clip_to_screen(self, clip: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Perspective division and conversion to screen space
 
         Args:
-            m (Model): Model to convert
+            clip (np.ndarray): Vertices in clip space (..., 4)
+
+        Returns:
+            (tuple[np.ndarray, np.ndarray]): Rounded screen xy (..., 2) and depth (...)
         """
-        screen_v = (m.v + 1) / 2
-        screen_v[:, 0] *= self.display.width
-        screen_v[:, 1] *= self.display.height
+        # Skipping clipping for now; add later if needed
+        # Perspective Division
+        ndc = clip / clip[..., 3:4]
+
+        screen = self._ndc_to_screen(ndc, inv_y=True)
+        return np.rint(screen[..., :2]).astype(int), screen[..., 2]
+
+    def _cull(self, norms: np.ndarray, camera: Camera) -> np.ndarray:
+        """Back-face culling
+
+        Args:
+            norms (np.ndarray): World-space face normals (F, 3)
+            camera (Camera): Camera to cull against
+
+        Returns:
+            (np.ndarray): Indices of faces facing the camera
+        """
+        return np.flatnonzero(norms @ camera.dir.v < 0)
+
+    def _shade(self, norms: np.ndarray, color: np.ndarray | None = None) -> np.ndarray:
+        """Compute flat shading intensities, averaged over all directional lights
+
+        Args:
+            norms (np.ndarray): World-space face normals (F, 3)
+            color (np.ndarray | None, optional): RGB color of the faces, used in color mode. Defaults to white.
+
+        Returns:
+            (np.ndarray): Intensity per face [0, 1], or one row of frame channels per face (see _channels)
+        """
+        n = len(self.directional_lights)
+        shares = []
+        if n == 0:
+            intensity, rgb = np.ones(len(norms)), np.ones((len(norms), 3))
+        else:
+            intensity = np.zeros(len(norms))
+            rgb = np.zeros((len(norms), 3)) if self.cbuf is not None else None
+            for light in self.directional_lights:
+                i = light.compute_intensities(norms)
+                intensity += i
+                if rgb is not None:
+                    rgb += i[:, None] * light.color
+                if self.shadows:
+                    shares.append(i / n)
+            intensity /= n
+        if self.cbuf is None and not self.shadows:
+            return intensity
+
+        columns = [intensity]
+        if self.cbuf is not None:
+            if n > 0:
+                rgb /= n
+            if color is not None:
+                rgb *= color
+            columns.append(rgb)
+            if self.shadows:
+                # The model color lets the shadow pass remove a light's share of the RGB
+                base = np.ones(3) if color is None else color
+                columns.append(np.broadcast_to(base, (len(norms), 3)))
+        return np.column_stack(columns + shares)
+
+    def _rasterize(
+        self,
+        v: np.ndarray,
+        z: np.ndarray,
+        faces: np.ndarray,
+        intensities: np.ndarray,
+    ):
+        """Rasterize screen-space triangles into the buffer with the selected backend
+
+        Args:
+            v (np.ndarray): Rounded screen xy per vertex (V, 2)
+            z (np.ndarray): Depth per vertex (V,)
+            faces (np.ndarray): Face vertex indices (F, 3)
+            intensities (np.ndarray): Shading intensity per face (F,), with RGB (F, 4) in color mode
+        """
+        occluded, written = self.rasterizer.rasterize(
+            v,
+            z,
+            faces,
+            intensities,
+            self._frame,
+            self.zbuf,
+            self.profiler,
+            self.conservative_occlusion,
+        )
+        if self.profiler is not None:
+            stats = self.profiler.last
+            stats.triangles["occluded"] += occluded
+            stats.triangles["rasterized"] += len(faces) - occluded
+            stats.pixels_written += written
+
+    def _painting(self) -> bool:
+        """Whether solid faces are drawn with the painter's algorithm this frame"""
+        return self.painter and self.render_mode is RenderMode.SOLID
+
+    def _texturing(self) -> bool:
+        """Whether any textured model is drawn solid with the depth buffer this frame"""
+        if self.render_mode is not RenderMode.SOLID or self._painting():
+            return False
+        models = self.models + [model for _, model in self.scene.drawables()]
+        models += [instances.model for instances in self.instances]
+        return any(m.texture is not None and m.uv is not None for m in models)
+
+    def _covered(self) -> int:
+        """Number of cells covered by geometry in the last frame"""
+        if self._painting():
+            return self._painted
+        return int(np.isfinite(self.zbuf).sum())
+
+    def _draw_batches(self, batches: List[tuple], camera: Camera):
+        """Draw projected batches in order, or all at once with the painter's algorithm
+
+        Args:
+            batches (List[tuple]): (v, z, faces, norms, color, mesh) batches
+            camera (Camera): Camera used for back-face culling
+        """
+        if self._painting():
+            self._paint(batches, camera)
+            return
+        if self._texturing():
+            self._draw_owned(batches, camera)
+            return
+        for batch in batches:
+            self._draw(*batch, camera)
+
+    def _paint(self, batches: List[tuple], camera: Camera):
+        """Cull and shade all batches, then depth sort and fill their faces together without the depth buffer
+
+        Args:
+            batches (List[tuple]): (v, z, faces, norms, color, mesh) batches
+            camera (Camera): Camera used for back-face culling
+        """
+        vs, zs, fs, shades = [], [], [], []
+        offset = 0
+        for v, z, faces, norms, color, _ in batches:
+            start = time.perf_counter()
+            visible = self._cull(norms, camera)
+            start = self._record("cull", start)
+            shades.append(self._shade(norms[visible], color))
+            self._record("shade", start)
+            # Vertex indices of all batches share one array
+            fs.append(faces[visible].astype(np.int64) + offset)
+            vs.append(v)
+            zs.append(z)
+            offset += len(v)
+            if self.profiler is not None:
+                self.profiler.last.triangles["submitted"] += len(faces)
+                self.profiler.last.triangles["culled"] += len(faces) - len(visible)
+
+        self._painted = 0
+        if not batches:
+            return
+        faces = np.concatenate(fs)
+        self._painted = paint(
+            np.concatenate(vs),
+            np.concatenate(zs),
+            faces,
+            np.concatenate(shades),
+            self._frame,
+            self.profiler,
+        )
+        if self.profiler is not None:
+            self.profiler.last.triangles["rasterized"] += len(faces)
+            self.profiler.last.pixels_written += self._painted
+
+    def _draw_owned(self, batches: List[tuple], camera: Camera):
+        """Cull, shade and rasterize all batches, writing the ID of each face into the last frame channel. The owner
+        of every cell is then known, which textures build on.
+
+        Args:
+            batches (List[tuple]): (v, z, faces, norms, color, mesh) batches
+            camera (Camera): Camera used for back-face culling
+        """
+        offset = 0
+        for v, z, faces, norms, color, _ in batches:
+            start = time.perf_counter()
+            visible = self._cull(norms, camera)
+            start = self._record("cull", start)
+            intensities = self._shade(norms[visible], color).reshape(len(visible), -1)
+            # IDs start at 1, cleared cells hold 0
+            intensities = np.column_stack([intensities, visible + offset + 1])
+            self._record("shade", start)
+            self._rasterize(v, z, faces[visible], intensities)
+            offset += len(faces)
+            if self.profiler is not None:
+                self.profiler.last.triangles["submitted"] += len(faces)
+                self.profiler.last.triangles["culled"] += len(faces) - len(visible)
+
+        starts = np.cumsum([0] + [len(faces) for _, _, faces, *_ in batches])
+        self._apply_textures(batches, starts, camera)
+
+    def _apply_textures(self, batches: List[tuple], starts: np.ndarray, camera: Camera):
+        """Modulate the shading of every cell owned by a textured face by its texture, in one pass per batch.
+
+        Texture coordinates are interpolated perspective-correctly: weights are the screen-space barycentrics divided
+        by the clip w of each corner. 1/w is affine in depth, so it comes from the depth without reprojecting.
+
+        Args:
+            batches (List[tuple]): (v, z, faces, norms, color, mesh) batches, as drawn
+            starts (np.ndarray): ID of the first face of every batch, and the total face count
+            camera (Camera): Camera the frame was rendered with
+        """
+        start = time.perf_counter()
+        h, w = self.zbuf.shape
+        frame = self._frame.reshape(h * w, -1)
+        cells = np.flatnonzero(frame[:, -1] > 0)
+        ids = frame[cells, -1].astype(np.int64) - 1
+        # Perspective projection maps clip w to depth = (c / w - k) / 2 for constants c > 0 and k
+        k = (camera.far + camera.near) / (camera.far - camera.near) - 1
+        channels = np.arange(frame.shape[1] - 1)
+        if self.cbuf is not None and self.shadows:
+            # The shadow pass removes a light's share of the RGB using the untextured model color
+            channels = channels[(channels < 4) | (channels >= 7)]
+
+        for i, (v, z, faces, _, _, mesh) in enumerate(batches):
+            if mesh.texture is None or mesh.uv is None:
+                continue
+            owned = (ids >= starts[i]) & (ids < starts[i + 1])
+            if not owned.any():
+                continue
+            c, f = cells[owned], ids[owned] - starts[i]
+            corners = faces[f]
+            y, x = np.divmod(c, w)
+            weights = _barycentric(v[corners], x, y) * (2 * z[corners] + k)
+            weights /= weights.sum(axis=1, keepdims=True)
+            uv = np.einsum("nk,nkj->nj", weights, mesh.uv[f])
+            frame[np.ix_(c, channels)] *= mesh.texture.sample(uv)[:, None]
+        self._record("shade", start)
+
+    def _draw(
+        self,
+        v: np.ndarray,
+        z: np.ndarray,
+        faces: np.ndarray,
+        norms: np.ndarray,
+        color: np.ndarray | None,
+        mesh: Model,
+        camera: Camera,
+    ):
+        """Cull, shade and rasterize projected geometry
+
+        Args:
+            v (np.ndarray): Rounded screen xy per vertex (V, 2)
+            z (np.ndarray): Depth per vertex (V,)
+            faces (np.ndarray): Face vertex indices (F, 3)
+            norms (np.ndarray): World-space face normals (F, 3)
+            color (np.ndarray | None): RGB color of the model, None for white
+            mesh (Model): Model (or level of detail) the faces belong to, which holds the edge list
+            camera (Camera): Camera used for back-face culling
+        """
+        start = time.perf_counter()
+        visible = self._cull(norms, camera)
+        start = self._record("cull", start)
+        if self.render_mode is not RenderMode.SOLID:
+            self._draw_lines(v, z, faces, norms, color, mesh, visible)
+            return
+        intensities = self._shade(norms[visible], color)
+        self._record("shade", start)
+        if self.profiler is not None:
+            self.profiler.last.triangles["submitted"] += len(faces)
+            self.profiler.last.triangles["culled"] += len(faces) - len(visible)
+        self._rasterize(v, z, faces[visible], intensities)
+
+    def _draw_lines(
+        self,
+        v: np.ndarray,
+        z: np.ndarray,
+        faces: np.ndarray,
+        norms: np.ndarray,
+        color: np.ndarray | None,
+        mesh: Model,
+        visible: np.ndarray,
+    ):
+        """Draw the edges or vertices of front-facing faces. Every edge is drawn once, with the shading of a front-facing
+        face next to it.
+
+        Args:
+            v (np.ndarray): Rounded screen xy per vertex (V, 2)
+            z (np.ndarray): Depth per vertex (V,)
+            faces (np.ndarray): Face vertex indices (F, 3)
+            norms (np.ndarray): World-space face normals (F, 3)
+            color (np.ndarray | None): RGB color of the model, None for white
+            mesh (Model): Model the faces belong to
+            visible (np.ndarray): Indices of faces facing the camera
+        """
+        start = time.perf_counter()
+        # Boundary edges index the extra False at the end: the missing face never faces the camera
+        front = np.zeros(len(faces) + 1, dtype=bool)
+        front[visible] = True
+        if self.render_mode is RenderMode.POINTS:
+            # Each vertex takes the shading of one of its front-facing faces
+            owner = np.full(len(v), -1)
+            owner[faces[visible].reshape(-1)] = np.repeat(visible, 3)
+            prims = np.flatnonzero(owner >= 0)
+            owner = owner[prims]
+        else:
+            edges, adjacent = mesh.get_edges()
+            f0, f1 = front[adjacent[:, 0]], front[adjacent[:, 1]]
+            keep = f0 != f1 if self.render_mode is RenderMode.SILHOUETTE else f0 | f1
+            prims = edges[keep]
+            owner = np.where(f0[keep], adjacent[keep, 0], adjacent[keep, 1])
+        intensities = self._shade(norms[owner], color)
+        start = self._record("shade", start)
+
+        if self.render_mode is RenderMode.POINTS:
+            written = draw_points(v, z, prims, intensities, self._frame, self.zbuf)
+        else:
+            written = draw_lines(v, z, prims, intensities, self._frame, self.zbuf)
+        self._record("raster", start)
+        if self.profiler is not None:
+            stats = self.profiler.last
+            stats.triangles["submitted"] += len(faces)
+            stats.triangles["culled"] += len(faces) - len(visible)
+            stats.pixels_written += written
+
+    def _ndc_to_screen(self, v: np.ndarray, inv_y: bool = False) -> np.ndarray:
+        """Converts points in NDC to screen coordinates
+
+        Args:
+            v (np.ndarray): Points in NDC (..., 4)
+            inv_y (bool, optional): Whether to flip the y axis. Defaults to False.
+
+        Returns:
+            (np.ndarray): Points in screen coordinates (..., 4)
+        """
+        height, width = self.buf.shape[:2]
+        screen_v = (v + 1) / 2
+        screen_v[..., 0] *= width
+        screen_v[..., 1] *= height
 
         if inv_y:
-            screen_v[:, 1] = self.display.height - screen_v[:, 1]
+            screen_v[..., 1] = height - screen_v[..., 1]
 
-        m.v = screen_v
+        return screen_v
 
     def _clear(self):
-        self.buf.fill(0)
+        self._frame.fill(0)
         self.zbuf.fill(-np.inf)
 
+    def _render_size(self, scale: float) -> tuple[int, int]:
+        return (
+            max(round(self.display.width * scale), 1),
+            max(round(self.display.height * scale), 1),
+        )
+
+    def _channels(self) -> int:
+        """Number of values rasterized per cell: intensity, then in color mode the RGB (and with shadows the model
+        color), then with shadows each directional light's share of the intensity, then with textures the ID of
+        the face owning the cell"""
+        channels = 1
+        if self.display.color_mode is not None:
+            channels += 6 if self.shadows else 3
+        if self.shadows:
+            channels += len(self.directional_lights)
+        if self._texturing():
+            channels += 1
+        return channels
 
-def _bresenhams_line(
-    v0: np.ndarray,
-    v1: np.ndarray,
-    z0: float,
-    z1: float,
-    w: int,
-    h: int,
-    edge_set: set,
-    edge_pts: np.ndarray,
-    edge_zs: np.ndarray,
-    i: int,
-):
-    x0, y0 = v0
-    x1, y1 = v1
-
-    dx = abs(x1 - x0)
-    dy = -abs(y1 - y0)
-    sx = 1 if x0 < x1 else -1
-    sy = 1 if y0 < y1 else -1
-
-    zs = np.linspace(z0, z1, max(dx, abs(dy)) + 1)
-    z_i = 0
-    edge_zs[i : i + len(zs)] = zs
-
-    e = dx + dy
-    while True:
-        if 0 <= x0 < w and 0 <= y0 < h and (x0, y0) not in edge_set:
-            edge_set.add((x0, y0))
-            edge_pts[i] = (x0, y0)
-            edge_zs[i] = zs[z_i]
-            i += 1
-
-        if x0 == x1 and y0 == y1:
-            break
-
-        e2 = 2 * e
-        if e2 >= dy:
-            e += dy
-            x0 += sx
-        if e2 <= dx:
-            e += dx
-            y0 += sy
-        z_i += 1
-    return i
-
-
-def _fill_span(
-    edge_pts: np.ndarray,
-    z_vals: np.ndarray,
-    buf: np.ndarray,
-    zbuf: np.ndarray,
-    intensity: float = 1.0,
-):
-    h, w = buf.shape
-
-    for y in np.unique(edge_pts[:, 1]):
-        y_ind = edge_pts[:, 1] == y
-        pts = edge_pts[y_ind]
-        sort_ind = pts[:, 0].argsort()
-        pts = pts[sort_ind]
-
-        zs = z_vals[y_ind][sort_ind]
-
-        if len(pts) == 1:
-            x, z = pts[0][0], zs[0]
-            if 0 <= x < w and 0 <= y < h and z > zbuf[y, x]:
-                buf[y, x] = intensity
-                zbuf[y, x] = z
+    def _frame_channels(self) -> int:
+        return self._frame.shape[2] if self._frame.ndim == 3 else 1
+
+    def _match_channels(self):
+        if self._frame_channels() != self._channels():
+            # Lights were added or removed while shadows are on
+            self._allocate_buffers(self.buf.dtype)
+
+    def _allocate_buffers(self, dtype: type):
+        width, height = self._render_size(self.render_scale)
+        channels = self._channels()
+        shape = (height, width) if channels == 1 else (height, width, channels)
+        if self.shared is None:
+            self._frame = np.zeros(shape, dtype=dtype)
+            self.zbuf = np.full((height, width), -np.inf, dtype=dtype)
         else:
-            x0, x1 = pts[0, 0], pts[-1, 0]
-            xs = np.arange(x0, x1 + 1)
-            z0, z1 = zs[0], zs[-1]
-            zspace = np.linspace(z0, z1, x1 - x0 + 1)
-
-            mask = (0 <= xs) & (xs < w) & (zspace > zbuf[y, xs])
-            buf[y, xs[mask]] = intensity
-            zbuf[y, xs[mask]] = zspace[mask]
+            self._frame = self.shared.zeros("frame", shape, dtype)
+            self.zbuf = self.shared.zeros("zbuf", (height, width), dtype)
+            self.zbuf.fill(-np.inf)
+        if channels == 1:
+            self.buf, self.cbuf = self._frame, None
+        else:
+            # All channels are rasterized together; buf and cbuf are views into the frame
+            self.buf = self._frame[..., 0]
+            self.cbuf = (
+                None if self.display.color_mode is None else self._frame[..., 1:4]
+            )
+
+    def _update_display(self):
+        """Upscale the frame to the display grid and convert it to characters (and colors)"""
+        start = time.perf_counter()
+        colors = None if self.cbuf is None else self._upscale(self.cbuf)
+        self.display.update_buffer(self._upscale(self.buf), debug=True, colors=colors)
+        self._record("encode", start)
+
+    def _upscale(self, buf: np.ndarray) -> np.ndarray:
+        """Nearest-neighbour upscale of a render to the display grid
+
+        Args:
+            buf (np.ndarray): Render output at the render resolution
+
+        Returns:
+            (np.ndarray): Render output at the display resolution
+        """
+        shape = (self.display.height, self.display.width)
+        if buf.shape == shape:
+            return buf
+        rows = np.arange(shape[0]) * buf.shape[0] // shape[0]
+        cols = np.arange(shape[1]) * buf.shape[1] // shape[1]
+        return buf[np.ix_(rows, cols)]
+
+
+def _barycentric(p: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Barycentric coordinates of cells in their triangles, clamped to the triangle
+
+    Args:
+        p (np.ndarray): Screen xy of the corners of each cell's triangle (N, 3, 2)
+        x (np.ndarray): Cell columns (N,)
+        y (np.ndarray): Cell rows (N,)
+
+    Returns:
+        (np.ndarray): Weight of each corner (N, 3); equal weights for triangles without area
+    """
+    p = p.astype(np.float64)
+    e1, e2 = p[:, 1] - p[:, 0], p[:, 2] - p[:, 0]
+    dx, dy = x - p[:, 0, 0], y - p[:, 0, 1]
+    area = e1[:, 0] * e2[:, 1] - e1[:, 1] * e2[:, 0]
+    flat = area == 0
+    area[flat] = 1
+    b1 = (dx * e2[:, 1] - dy * e2[:, 0]) / area
+    b2 = (e1[:, 0] * dy - e1[:, 1] * dx) / area
+    # Cells on a triangle's edges may lie slightly outside of it after rounding
+    b = np.clip(np.column_stack([1 - b1 - b2, b1, b2]), 0, None)
+    b[flat] = 1
+    return b / b.sum(axis=1, keepdims=True)
+
+
+def _union(a: tuple | None, b: tuple | None) -> tuple | None:
+    """Smallest rectangle containing both rectangles (x0, y0, x1, y1); None is empty"""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+
+def _intersects(a: tuple | None, b: tuple | None) -> bool:
+    """Whether two rectangles (x0, y0, x1, y1) overlap; None is empty"""
+    if a is None or b is None:
+        return False
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _packable(model: Model) -> bool:
+    """Whether a model can live in the packed geometry: full precision and a single level of detail"""
+    return not model.is_compact and not model.lods
+
+
+def _surface_key(model: Model) -> tuple:
+    """Everything besides geometry that changes how a model looks: color and texture"""
+    color = None if model.color is None else np.asarray(model.color, float).tobytes()
+    return color, id(model.texture), id(model.uv)
@@ -0,0 +1,209 @@
+"""
+Parametric meshes and randomized scenes for scaling studies.
+"""
+
+from typing import List
+import numpy as np
+from .model import Model
+from .util import (
+    Axis,
+    build_rotations,
+    build_scales,
+    build_translations,
+    compose_transformations,
+)
+
+SHAPES = ("sphere", "torus", "grid")
+
+
+def uv_sphere(segments: int, rings: int, radius: float = 1.0) -> Model:
+    """Generate a UV sphere centered at the origin. Has 2 * segments * (rings - 1) faces.
+
+    Args:
+        segments (int): Number of longitudinal segments (>= 3)
+        rings (int): Number of latitudinal rings (>= 2)
+        radius (float, optional): Sphere radius. Defaults to 1.0.
+
+    Raises:
+        ValueError: If segments or rings are too small
+
+    Returns:
+        (Model): Sphere model
+    """
+    if segments < 3 or rings < 2:
+        raise ValueError("Sphere needs at least 3 segments and 2 rings")
+
+    theta = np.pi * np.arange(1, rings) / rings
+    phi = 2 * np.pi * np.arange(segments) / segments
+    t, p = np.meshgrid(theta, phi, indexing="ij")
+    ring_v = np.stack([np.sin(t) * np.cos(p), np.cos(t), -np.sin(t) * np.sin(p)], -1)
+    v = np.vstack([[0, 1, 0], ring_v.reshape(-1, 3), [0, -1, 0]]) * radius
+
+    top, bottom = 0, len(v) - 1
+    j = np.arange(segments)
+    jn = (j + 1) % segments
+    # Ring i starts at vertex 1 + i * segments
+    faces = [np.stack([np.full(segments, top), 1 + j, 1 + jn], -1)]
+    for i in range(rings - 2):
+        a, b = 1 + i * segments + j, 1 + i * segments + jn
+        c, d = a + segments, b + segments
+        faces.append(np.stack([a, c, d], -1))
+        faces.append(np.stack([a, d, b], -1))
+    last = 1 + (rings - 2) * segments
+    faces.append(np.stack([last + j, np.full(segments, bottom), last + jn], -1))
+
+    return _model(v, np.vstack(faces))
+
+
+def torus(
+    major_segments: int, minor_segments: int, radius: float = 1.0, tube: float = 0.4
+) -> Model:
+    """Generate a torus around the y axis. Has 2 * major_segments * minor_segments faces.
+
+    Args:
+        major_segments (int): Segments around the ring (>= 3)
+        minor_segments (int): Segments around the tube (>= 3)
+        radius (float, optional): Distance from the center to the middle of the tube. Defaults to 1.0.
+        tube (float, optional): Tube radius. Defaults to 0.4.
+
+    Raises:
+        ValueError: If segment counts are too small
+
+    Returns:
+        (Model): Torus model
+    """
+    if major_segments < 3 or minor_segments < 3:
+        raise ValueError("Torus needs at least 3 segments in each direction")
+
+    u = 2 * np.pi * np.arange(major_segments) / major_segments
+    w = 2 * np.pi * np.arange(minor_segments) / minor_segments
+    uu, ww = np.meshgrid(u, w, indexing="ij")
+    r = radius + tube * np.cos(ww)
+    v = np.stack([r * np.cos(uu), tube * np.sin(ww), -r * np.sin(uu)], -1)
+
+    i, j = np.meshgrid(
+        np.arange(major_segments), np.arange(minor_segments), indexing="ij"
+    )
+    i_next = (i + 1) % major_segments
+    j_next = (j + 1) % minor_segments
+    a, b = i * minor_segments + j, i_next * minor_segments + j
+    c, d = i_next * minor_segments + j_next, i * minor_segments + j_next
+    faces = np.concatenate(
+        [np.stack([a, b, c], -1).reshape(-1, 3), np.stack([a, c, d], -1).reshape(-1, 3)]
+    )
+
+    return _model(v.reshape(-1, 3), faces)
+
+
+def grid(nx: int, ny: int, size: float = 1.0) -> Model:
+    """Generate a flat grid in the xy plane facing +z. Has 2 * nx * ny faces.
+
+    Args:
+        nx (int): Cells along x (>= 1)
+        ny (int): Cells along y (>= 1)
+        size (float, optional): Side length of the grid. Defaults to 1.0.
+
+    Raises:
+        ValueError: If cell counts are too small
+
+    Returns:
+        (Model): Grid model
+    """
+    if nx < 1 or ny < 1:
+        raise ValueError("Grid needs at least one cell in each direction")
+
+    xs = np.linspace(-size / 2, size / 2, nx + 1)
+    ys = np.linspace(-size / 2, size / 2, ny + 1)
+    gx, gy = np.meshgrid(xs, ys, indexing="ij")
+    v = np.stack([gx, gy, np.zeros_like(gx)], -1).reshape(-1, 3)
+
+    i, j = np.meshgrid(np.arange(nx), np.arange(ny), indexing="ij")
+    a = i * (ny + 1) + j
+    b, c, d = a + ny + 1, a + ny + 2, a + 1
+    faces = np.concatenate(
+        [np.stack([a, b, c], -1).reshape(-1, 3), np.stack([a, c, d], -1).reshape(-1, 3)]
+    )
+
+    return _model(v, faces)
+
+
+def generate_mesh(shape: str, faces: int) -> Model:
+    """Generate a parametric mesh with approximately the given number of faces
+
+    Args:
+        shape (str): One of "sphere", "torus" or "grid"
+        faces (int): Approximate face count
+
+    Raises:
+        ValueError: If the shape is unknown
+
+    Returns:
+        (Model): Generated model with unit size
+    """
+    if shape == "sphere":
+        rings = max(2, int(round((1 + np.sqrt(1 + faces)) / 2)))
+        return uv_sphere(2 * rings, rings)
+    if shape == "torus":
+        n = max(3, int(round(np.sqrt(faces / 4))))
+        return torus(2 * n, n)
+    if shape == "grid":
+        n = max(1, int(round(np.sqrt(faces / 2))))
+        return grid(n, n)
+    raise ValueError(f"Invalid shape: {shape}")
+
+
+def random_scene(
+    n_models: int,
+    faces: int,
+    extent: float = 10.0,
+    scale: tuple[float, float] = (1.0, 3.0),
+    shapes: tuple[str, ...] = SHAPES,
+    seed: int | None = None,
+) -> List[Model]:
+    """Generate randomly placed, rotated and scaled parametric models
+
+    Args:
+        n_models (int): Number of models
+        faces (int): Approximate face count per model
+        extent (float, optional): Models are placed in [-extent, extent] on x and y and [-extent, 0] on z. Defaults to 10.0.
+        scale (tuple[float, float], optional): Range of uniform scale factors. Defaults to (1.0, 3.0).
+        shapes (tuple[str, ...], optional): Shapes to choose from. Defaults to all shapes.
+        seed (int | None, optional): Random seed. Defaults to None.
+
+    Returns:
+        (List[Model]): Models in world space
+    """
+    rng = np.random.default_rng(seed)
+    meshes = {shape: generate_mesh(shape, faces) for shape in shapes}
+
+    bases, params = [], []
+    for _ in range(n_models):
+        bases.append(meshes[shapes[rng.integers(len(shapes))]])
+        s = rng.uniform(*scale)
+        x, y = rng.uniform(-extent, extent, 2)
+        z = rng.uniform(-extent, 0)
+        rx, ry, rz = rng.uniform(0, 2 * np.pi, 3)
+        params.append((s, x, y, z, rx, ry, rz))
+    if n_models == 0:
+        return []
+
+    s, x, y, z, rx, ry, rz = np.array(params).T
+    transforms = compose_transformations(
+        [
+            build_translations(x, y, z),
+            build_rotations(rz, Axis.Z),
+            build_rotations(ry, Axis.Y),
+            build_rotations(rx, Axis.X),
+            build_scales(s, s, s),
+        ]
+    )
+    models = []
+    for base, t in zip(bases, transforms):
+        model = Model(base.v.copy(), base.f.copy(), compute_norms=False)
+        model.apply_transform(t)
+        models.append(model)
+    return models
+
+
+def _model(v: np.ndarray, faces: np.ndarray) -> Model:
+    return Model(np.hstack([v, np.ones((len(v), 1))]), faces)
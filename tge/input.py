@@ -0,0 +1,236 @@
+"""
+Non-blocking keyboard and mouse input from the terminal.
+"""
+
+import os
+import sys
+import time
+from typing import List
+
+# Final bytes of CSI sequences for keys without parameters
+_CSI_KEYS = {
+    b"A": "up",
+    b"B": "down",
+    b"C": "right",
+    b"D": "left",
+    b"H": "home",
+    b"F": "end",
+}
+_CONTROL_KEYS = {
+    b"\r": "enter",
+    b"\n": "enter",
+    b"\t": "tab",
+    b"\x7f": "backspace",
+    b"\x03": "ctrl-c",
+}
+
+
+class InputEvent:
+    """A key press or mouse report"""
+
+    def __init__(
+        self,
+        kind: str,
+        key: str | None = None,
+        x: int = 0,
+        y: int = 0,
+        button: int = 0,
+        pressed: bool = True,
+        time: float = 0.0,
+    ):
+        """Initialize an input event
+
+        Args:
+            kind (str): "key" or "mouse"
+            key (str | None, optional): Character, or key name such as "up" or "escape", for key events; "alt-" is prepended while Alt is held. Defaults to None.
+            x (int, optional): Terminal column of a mouse event (1-based). Defaults to 0.
+            y (int, optional): Terminal row of a mouse event (1-based). Defaults to 0.
+            button (int, optional): Button code of a mouse event: 0-2 for buttons, +32 while dragging, 64/65 for the wheel. Defaults to 0.
+            pressed (bool, optional): False for mouse button releases. Defaults to True.
+            time (float, optional): time.perf_counter() when the event was read. Defaults to 0.0.
+        """
+        self.kind = kind
+        self.key = key
+        self.x = x
+        self.y = y
+        self.button = button
+        self.pressed = pressed
+        self.time = time
+
+    def __repr__(self) -> str:
+        if self.kind == "key":
+            return f"InputEvent(key={self.key!r})"
+        return f"InputEvent(mouse button={self.button} x={self.x} y={self.y} pressed={self.pressed})"
+
+
+class TerminalInput:
+    """Reads keys and mouse reports without blocking rendering.
+
+    Used as a context manager: on entry the terminal is switched to cbreak mode (no line buffering or echo, signals
+    and output processing unchanged) and, optionally, SGR mouse reporting; both are restored on exit. poll() waits on
+    the input with a selector, so a render loop can sleep until input arrives instead of ticking. Input that is not a
+    terminal, such as a pipe, is read as is.
+    """
+
+    def __init__(
+        self, fd: int | None = None, mouse: bool = True, escape_timeout: float = 0.04
+    ):
+        """Initialize terminal input
+
+        Args:
+            fd (int | None, optional): File descriptor to read from. Defaults to standard input.
+            mouse (bool, optional): Whether to enable mouse reporting. Defaults to True.
+            escape_timeout (float, optional): Seconds an escape byte waits for the rest of a key sequence before it
+                counts as the escape key. Defaults to 0.04.
+        """
+        self.fd = sys.stdin.fileno() if fd is None else fd
+        self.mouse = mouse
+        self.escape_timeout = escape_timeout
+        self._pending = b""
+        self._escape_time = 0.0
+        self._saved = None
+        self._selector = None
+
+    def __enter__(self) -> "TerminalInput":
+        import selectors
+
+        if os.isatty(self.fd):
+            import termios
+            import tty
+
+            self._saved = termios.tcgetattr(self.fd)
+            tty.setcbreak(self.fd)
+            if self.mouse:
+                # Button presses, drags and releases, SGR encoded
+                sys.stdout.write("\033[?1002h\033[?1006h")
+                sys.stdout.flush()
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self.fd, selectors.EVENT_READ)
+        return self
+
+    def __exit__(self, *exc):
+        self._selector.close()
+        self._selector = None
+        if self._saved is not None:
+            import termios
+
+            if self.mouse:
+                sys.stdout.write("\033[?1006l\033[?1002l")
+                sys.stdout.flush()
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self._saved)
+            self._saved = None
+
+    def poll(self, timeout: float | None = None) -> List[InputEvent]:
+        """Wait for input and return every event available without blocking further.
+
+        All input that has arrived is drained at once, so a burst of key repeats or mouse drags is handled in one
+        frame rather than queueing up behind rendering. An escape byte at the end of the input is held back until the
+        rest of its sequence arrives, and only becomes the escape key once escape_timeout passes without more input,
+        so a sequence split across reads is not mistaken for escape.
+
+        Args:
+            timeout (float | None, optional): Longest wait in seconds; 0 returns immediately, None waits for input. Defaults to None.
+
+        Raises:
+            EOFError: If the input was closed
+
+        Returns:
+            (List[InputEvent]): Events in the order they arrived; empty if the timeout passed
+        """
+        events: List[InputEvent] = []
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            now = time.perf_counter()
+            wait = None if deadline is None else max(deadline - now, 0)
+            if self._pending == b"\x1b":
+                left = max(self._escape_time + self.escape_timeout - now, 0)
+                wait = left if wait is None else min(wait, left)
+            if self._selector.select(wait):
+                data = os.read(self.fd, 4096)
+                if not data:
+                    raise EOFError("Input closed")
+                now = time.perf_counter()
+                parsed, self._pending = _parse(self._pending + data)
+                for event in parsed:
+                    event.time = now
+                events.extend(parsed)
+                if self._pending == b"\x1b":
+                    # A held back escape byte is always the last one read
+                    self._escape_time = now
+                if events:
+                    # Only drain what has already arrived
+                    deadline = now
+                continue
+            if (
+                self._pending == b"\x1b"
+                and time.perf_counter() - self._escape_time >= self.escape_timeout
+            ):
+                # Nothing followed the escape byte in time, so it was the escape key itself
+                events.append(InputEvent("key", "escape", time=self._escape_time))
+                self._pending = b""
+            if events or (deadline is not None and time.perf_counter() >= deadline):
+                return events
+
+
+def _parse(data: bytes) -> tuple[List[InputEvent], bytes]:
+    """Split input bytes into events
+
+    Args:
+        data (bytes): Input read so far
+
+    Returns:
+        (tuple[List[InputEvent], bytes]): Parsed events, and an incomplete escape sequence at the end of the input
+    """
+    events: List[InputEvent] = []
+    i = 0
+    while i < len(data):
+        if data[i] != 0x1B:
+            key, length = _key(data, i)
+            events.append(InputEvent("key", key))
+            i += length
+            continue
+
+        if i + 1 == len(data):
+            return events, data[i:]
+        if data[i + 1] == 0x1B:
+            # Escape pressed twice, or Alt+Escape
+            events.append(InputEvent("key", "escape"))
+            i += 1
+            continue
+        if data[i + 1] not in b"[O":
+            # Terminals send Alt+key as escape followed by the key
+            key, length = _key(data, i + 1)
+            events.append(InputEvent("key", "alt-" + key))
+            i += 1 + length
+            continue
+        # CSI/SS3: parameters, then a final byte in 0x40-0x7E
+        end = i + 2
+        while end < len(data) and not 0x40 <= data[end] <= 0x7E:
+            end += 1
+        if end == len(data):
+            return events, data[i:]
+        params, final = data[i + 2 : end], data[end : end + 1]
+        i = end + 1
+        if params.startswith(b"<") and final in b"Mm":
+            button, x, y = (int(p) for p in params[1:].split(b";"))
+            events.append(InputEvent("mouse", None, x, y, button, final == b"M"))
+        elif final in _CSI_KEYS:
+            events.append(InputEvent("key", _CSI_KEYS[final]))
+        elif final == b"~":
+            code = params.split(b";")[0]
+            names = {b"3": "delete", b"5": "pageup", b"6": "pagedown"}
+            if code in names:
+                events.append(InputEvent("key", names[code]))
+    return events, b""
+
+
+def _key(data: bytes, i: int) -> tuple[str, int]:
+    """Name of the key whose bytes start at data[i], and how many bytes it takes"""
+    char = data[i : i + 1]
+    if char in _CONTROL_KEYS:
+        return _CONTROL_KEYS[char], 1
+    # Multi-byte UTF-8 characters
+    length = 1
+    while length < 4 and i + length < len(data) and data[i + length] & 0xC0 == 0x80:
+        length += 1
+    return data[i : i + length].decode(errors="replace"), length
@@ -5,13 +5,17 @@ from .util import Vec3
 class DirectionalLight:
     """Class representing a directional light source."""
 
-    def __init__(self, direction: Vec3):
+    def __init__(
+        self, direction: Vec3, color: tuple[float, float, float] = (1.0, 1.0, 1.0)
+    ):
         """Create a directional light source
 
         Args:
             direction (Vec3): Direction of the light source (direction the light is going towards)
+            color (tuple[float, float, float], optional): RGB color [0, 1], used by color output. Defaults to white.
         """
         self.dir = direction.normalize()
+        self.color = np.asarray(color, dtype=float)
 
     def compute_intensity(self, surface_normal: Vec3 | np.ndarray) -> float:
         """Computes the intensity of the light source on a surface
@@ -32,6 +36,17 @@ class DirectionalLight:
                 raise ValueError("Surface normal must be 3x1")
             return max(0, -np.dot(surface_normal, self.dir.v))
 
+    def compute_intensities(self, surface_normals: np.ndarray) -> np.ndarray:
+        """Computes the intensity of the light source on many surfaces at once
+
+        Args:
+            surface_normals (np.ndarray): Surface normals of faces (n, 3)
+
+        Returns:
+            np.ndarray: Intensity of the light source on each surface [0, 1]
+        """
+        return np.maximum(0, -(surface_normals @ self.dir.v))
+
 
 class PointLight:
     def __init__(self, position: Vec3):
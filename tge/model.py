@@ -1,3 +1,4 @@
+from typing import List
 import numpy as np
 from .util import normalize
 
@@ -10,6 +11,19 @@ class Model:
     ):
         self.v = vertices
         self.f = faces
+        self.lods: List[Model] = []
+        # Incremented whenever the geometry changes, so renderers can tell unchanged models apart
+        self.version = 0
+        # RGB [0, 1] used by color output; None is white
+        self.color: np.ndarray | None = None
+        # Unique edges (E, 2) and their adjacent faces (E, 2), built on first use by get_edges
+        self.edges: np.ndarray | None = None
+        self.edge_faces: np.ndarray | None = None
+        # Texture coordinates of every face corner (F, 3, 2), and the texture they refer to
+        self.uv: np.ndarray | None = None
+        self._texture: "Texture | None" = None
+        # What load-time cleanup removed (see preprocess.clean_model), None if the model was not cleaned
+        self.clean_stats: dict | None = None
         if compute_norms:
             self.n = self.compute_normals()
         else:
@@ -28,9 +42,12 @@ class Model:
         if transformation.shape != (4, 4):
             raise ValueError("Transformation matrix must be 4x4")
 
-        self.v = self.v @ transformation.T
+        self.v = transform_points(self.v, transformation)
         if not preserve_norms:
             self.n = self.compute_normals()
+        self.version += 1
+        for lod in self.lods:
+            lod.apply_transform(transformation, preserve_norms)
 
     def apply_translate(self, translation: np.ndarray):
         """Apply a translation to the model
@@ -43,24 +60,124 @@ class Model:
         """
         if translation.shape != (4,):
             raise ValueError("Translation vector must be 4x1")
-        self.v = self.v + translation
+        if self.is_compact:
+            self.v = self.v + translation[:3].astype(self.v.dtype)
+        else:
+            self.v = self.v + translation
+        self.version += 1
+        for lod in self.lods:
+            lod.apply_translate(translation)
+
+    def mark_changed(self):
+        """Flag the model as changed after editing its vertices, faces or normals directly"""
+        self.version += 1
+        self.edges = self.edge_faces = None
+
+    def get_edges(self) -> tuple[np.ndarray, np.ndarray]:
+        """Get the unique edges of the mesh, computing them on first use
+
+        Returns:
+            (tuple[np.ndarray, np.ndarray]): Edges and their adjacent faces, see compute_edges
+        """
+        if self.edges is None:
+            self.edges, self.edge_faces = self.compute_edges()
+        return self.edges, self.edge_faces
+
+    def compute_edges(self) -> tuple[np.ndarray, np.ndarray]:
+        """Compute the unique edges of the mesh and the faces adjacent to each edge. An edge shared by two faces is
+        listed once.
+
+        Returns:
+            (tuple[np.ndarray, np.ndarray]): Vertex indices per edge, lowest first (E, 2), and the indices of the (up to)
+            two faces adjacent to each edge (E, 2). Boundary edges have -1 as their second face; edges shared by more
+            than two faces keep the first two.
+        """
+        pairs = np.sort(self.f[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1).astype(
+            np.int64
+        )
+        keys, first, inverse, counts = np.unique(
+            pairs[:, 0] * len(self.v) + pairs[:, 1],
+            return_index=True,
+            return_inverse=True,
+            return_counts=True,
+        )
+        edges = pairs[first]
+
+        # Faces grouped by edge: the first and second entry of each group are the adjacent faces
+        order = np.argsort(inverse.reshape(-1), kind="stable")
+        start = np.cumsum(counts) - counts
+        faces = order // 3
+        edge_faces = np.full((len(keys), 2), -1, dtype=np.int64)
+        edge_faces[:, 0] = faces[start]
+        shared = counts > 1
+        edge_faces[shared, 1] = faces[start[shared] + 1]
+        return edges, edge_faces
 
     def compute_normals(self) -> np.ndarray:
-        """Compute normals for each face
+        """Compute normals for each face. Degenerate (zero-area) faces get a zero normal, which culls them.
 
         Returns:
             (np.ndarray): Matrix of normals for each face. Shape (n, 3) where n is the number of faces
         """
-        v0 = self.v[self.f[:, 0]][:, :-1]
-        v1 = self.v[self.f[:, 1]][:, :-1]
-        v2 = self.v[self.f[:, 2]][:, :-1]
+        v0 = self.v[self.f[:, 0]][:, :3]
+        v1 = self.v[self.f[:, 1]][:, :3]
+        v2 = self.v[self.f[:, 2]][:, :3]
 
         e1, e2 = v1 - v0, v2 - v0
-        normals = np.cross(e1, e2).astype(np.float64)
-        normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+        normals = np.cross(e1, e2).astype(np.float32 if self.is_compact else np.float64)
+        norm = np.linalg.norm(normals, axis=1, keepdims=True)
+        np.divide(normals, norm, out=normals, where=norm > 0)
 
         return normals
 
+    @property
+    def texture(self) -> "Texture | None":
+        """Texture sampled with the texture coordinates (uv). Setting it also sets it on the levels of detail."""
+        return self._texture
+
+    @texture.setter
+    def texture(self, value: "Texture | None"):
+        self._texture = value
+        for lod in self.lods:
+            lod.texture = value
+
+    @property
+    def is_compact(self) -> bool:
+        """Whether the model uses the compact representation (float32 xyz vertices without a homogeneous column)"""
+        return self.v.shape[1] == 3
+
+    def to_compact(self) -> "Model":
+        """Convert to the compact representation: float32 xyz vertices and the smallest integer type that can index them.
+
+        Levels of detail are converted as well; color, texture and texture coordinates are kept.
+
+        Returns:
+            (Model): Compact copy of the model
+        """
+        index_type = np.int16 if len(self.v) <= np.iinfo(np.int16).max else np.int32
+        m = Model(
+            np.ascontiguousarray(self.v[:, :3], dtype=np.float32),
+            self.f.astype(index_type),
+        )
+        m.lods = [lod.to_compact() for lod in self.lods]
+        m.edges, m.edge_faces = self.edges, self.edge_faces
+        m.color = self.color
+        m.uv = None if self.uv is None else self.uv.astype(np.float32)
+        m.texture = self.texture
+        m.clean_stats = self.clean_stats
+        return m
+
+    def get_bounds(self) -> np.ndarray:
+        """Get the corners of the axis-aligned bounding box
+
+        Returns:
+            (np.ndarray): Homogeneous corners of the bounding box (8, 4)
+        """
+        lo, hi = self.v[:, :3].min(axis=0), self.v[:, :3].max(axis=0)
+        corners = np.array(np.meshgrid([0, 1], [0, 1], [0, 1], indexing="ij"))
+        corners = corners.reshape(3, -1).T
+        return np.hstack([lo + corners * (hi - lo), np.ones((8, 1))])
+
     def round_xy(self) -> np.ndarray:
         """Round the x and y coordinates of the vertices to the nearest integer
 
@@ -74,6 +191,87 @@ class Model:
         return self.v[:, 2]
 
 
+class InstancedMesh:
+    """A single model drawn several times, each instance with its own transformation. Geometry is shared, not copied."""
+
+    def __init__(self, model: Model, transforms: np.ndarray | None = None):
+        """Initialize an instanced mesh
+
+        Args:
+            model (Model): Shared model geometry
+            transforms (np.ndarray | None, optional): Per-instance transformations (n, 4, 4). Defaults to no instances.
+
+        Raises:
+            ValueError: If transformations are not of shape (n, 4, 4)
+        """
+        if transforms is None:
+            transforms = np.empty((0, 4, 4))
+        if transforms.ndim != 3 or transforms.shape[1:] != (4, 4):
+            raise ValueError("Transformation matrices must be of shape (n, 4, 4)")
+
+        self.model = model
+        self.transforms = np.asarray(transforms, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.transforms)
+
+    def add_instance(self, t: np.ndarray) -> int:
+        """Add an instance
+
+        Args:
+            t (np.ndarray): 4x4 transformation matrix of the instance
+
+        Raises:
+            ValueError: If transformation matrix is not 4x4
+
+        Returns:
+            (int): Instance index
+        """
+        if t.shape != (4, 4):
+            raise ValueError("Transformation matrix must be 4x4")
+        self.transforms = np.concatenate([self.transforms, t[None]])
+        return len(self.transforms) - 1
+
+    def remove_instance(self, i: int):
+        """Removes an instance
+
+        Args:
+            i (int): Instance index
+
+        Raises:
+            IndexError: If instance index is invalid
+        """
+        if i >= len(self.transforms):
+            raise IndexError("Instance index out of range")
+        self.transforms = np.delete(self.transforms, i, axis=0)
+
+    def transform_instance(self, i: int, t: np.ndarray):
+        """Apply a transformation to a single instance
+
+        Args:
+            i (int): Instance index
+            t (np.ndarray): 4x4 transformation matrix to apply
+
+        Raises:
+            ValueError: If transformation matrix is not 4x4
+            IndexError: If instance index is invalid
+        """
+        if t.shape != (4, 4):
+            raise ValueError("Transformation matrix must be 4x4")
+        if i >= len(self.transforms):
+            raise IndexError("Instance index out of range")
+        self.transforms[i] = t @ self.transforms[i]
+
+    def world_normals(self) -> np.ndarray:
+        """Compute face normals of every instance in one batch
+
+        Returns:
+            (np.ndarray): Unit normals of shape (n, f, 3) where n is the number of instances and f the number of faces
+        """
+        n = self.model.n if self.model.n is not None else self.model.compute_normals()
+        return transform_normals(n, self.transforms)
+
+
 def apply_transform(model: Model, t: np.ndarray, compute_norms: bool = True) -> Model:
     """Apply a transformation to a model
 
@@ -91,20 +289,69 @@ def apply_transform(model: Model, t: np.ndarray, compute_norms: bool = True) ->
     if t.shape != (4, 4):
         raise ValueError("Transformation matrix must be 4x4")
 
-    return Model(model.v @ t.T, model.f.copy(), compute_norms=compute_norms)
+    return Model(
+        transform_points(model.v, t), model.f.copy(), compute_norms=compute_norms
+    )
+
+
+def transform_points(v: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Apply a transformation to an array of points
+
+    Args:
+        v (np.ndarray): Homogeneous points (n, 4), or compact xyz points (n, 3) which are treated as having w = 1
+        t (np.ndarray): 4x4 transformation matrix
+
+    Returns:
+        (np.ndarray): Transformed points, in the same layout and type as v
+    """
+    if v.shape[1] == 3:
+        t = t.astype(v.dtype)
+        return v @ t[:3, :3].T + t[:3, 3]
+    return v @ t.T
+
+
+def transform_normals(n: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Transform face normals by the inverse transpose of a transformation's linear part
+
+    Args:
+        n (np.ndarray): Face normals (n, 3)
+        t (np.ndarray): 4x4 transformation matrix, or a stack of them (k, 4, 4)
+
+    Raises:
+        ValueError: If transformation matrix is not 4x4
+
+    Returns:
+        (np.ndarray): Transformed unit normals (n, 3), or (k, n, 3) for a stack of transformations
+    """
+    if t.shape[-2:] != (4, 4):
+        raise ValueError("Transformation matrix must be 4x4")
+
+    normals = (n @ np.linalg.inv(t[..., :3, :3])).astype(n.dtype)
+    norm = np.linalg.norm(normals, axis=-1, keepdims=True)
+    # Degenerate faces keep their zero normal
+    np.divide(normals, norm, out=normals, where=norm > 0)
+    return normals
 
 
-def load_model(path: str) -> Model:
-    """Load a model from a .obj file. At the moment, this only supports vertices and faces.
+def load_model(
+    path: str, lod_levels: int = 0, clean: bool = False, compact: bool = False
+) -> Model:
+    """Load a model from a .obj file. Supports vertices, faces and texture coordinates; the texture itself is set on
+    the returned model (Model.texture). Texture coordinates are only kept if every face has them.
 
     Args:
         path (str): Path to .obj file
+        lod_levels (int, optional): Number of simplified levels of detail to build and cache on the model. Defaults to 0.
+        clean (bool, optional): Whether to weld vertices, drop degenerate faces and reorder the mesh. What was removed is reported in Model.clean_stats. Defaults to False.
+        compact (bool, optional): Whether to return the compact float32 representation. Defaults to False.
 
     Returns:
         (Model): object from .obj file
     """
     vertices = []
     faces = []
+    texcoords = []
+    face_texcoords = []
 
     with open(path, "r") as f:
         for line in f:
@@ -112,15 +359,33 @@ def load_model(path: str) -> Model:
                 v = [float(num) for num in line[2:].strip().split(" ") if num] + [1.0]
                 vertices.append(v)
 
+            elif line.startswith("vt "):
+                texcoords.append([float(num) for num in line[3:].split()[:2]])
+
             elif line.startswith("f "):
-                faces.append(
-                    [
-                        (int(face.split("/")[0]) - 1)
-                        for face in line[2:].strip().split(" ")
-                        if face
-                    ]
-                )
+                corners = [
+                    face.split("/") for face in line[2:].strip().split(" ") if face
+                ]
+                faces.append([(int(c[0]) - 1) for c in corners])
+                if all(len(c) > 1 and c[1] for c in corners):
+                    face_texcoords.append([(int(c[1]) - 1) for c in corners])
             else:
                 continue
 
-    return Model(np.array(vertices), np.array(faces))
+    model = Model(np.array(vertices), np.array(faces))
+    if texcoords and len(face_texcoords) == len(faces):
+        model.uv = np.array(texcoords)[np.array(face_texcoords)]
+    if clean:
+        from .preprocess import clean_model
+
+        model, stats = clean_model(model)
+        model.clean_stats = stats
+    # Edges are needed by the line render modes; computing them here keeps the first frame fast
+    model.get_edges()
+    if lod_levels > 0:
+        from .simplify import build_lods
+
+        build_lods(model, levels=lod_levels)
+    if compact:
+        model = model.to_compact()
+    return model
@@ -0,0 +1,336 @@
+"""
+Scene-wide packed geometry, transformed in a single pass per frame.
+"""
+
+import numpy as np
+from .model import Model, transform_normals
+
+
+class PackedGeometry:
+    """Vertices, faces and normals of many models packed into contiguous buffers.
+
+    Every model occupies a range of vertices and a range of faces. Faces are stored relative to the start of the
+    model's vertex range, and every vertex and face carries the index of its model's matrix, so the whole scene is
+    transformed with one gather and one batched matmul. Ranges are compacted when a model is removed.
+
+    The buffers can live in shared memory (see share), where other processes read them as "packed.<buffer>"; the
+    vertex count, face count and version are in "packed.counts".
+    """
+
+    def __init__(
+        self,
+        vertices: int = 1024,
+        faces: int = 1024,
+        models: int = 16,
+        shared: "SharedArrays | None" = None,
+    ):
+        """Initialize empty buffers
+
+        Args:
+            vertices (int, optional): Initial vertex capacity. Grows as needed. Defaults to 1024.
+            faces (int, optional): Initial face capacity. Grows as needed. Defaults to 1024.
+            models (int, optional): Initial model capacity. Grows as needed. Defaults to 16.
+            shared (SharedArrays | None, optional): Shared memory to allocate the buffers in. Defaults to None.
+        """
+        self.shared = shared
+        self.v = self._alloc("v", (vertices, 4), np.float64)
+        self.vertex_matrix = self._alloc("vertex_matrix", (vertices,), int)
+        self.f = self._alloc("f", (faces, 3), int)
+        self.n = self._alloc("n", (faces, 3), np.float64)
+        self.face_matrix = self._alloc("face_matrix", (faces,), int)
+        self.matrices = self._alloc("matrices", (models, 4, 4), np.float64)
+        self.matrices[:] = np.eye(4)
+        # Vertex count, face count and version, kept in an array so they can be shared
+        self._counts = self._alloc("counts", (3,), np.int64)
+        # handle -> [matrix slot, model, model stamp, vertex offset, vertex count, face offset, face count]
+        self._entries: dict[int, list] = {}
+        self._free_slots: list[int] = list(range(models - 1, -1, -1))
+        self._next_handle = 0
+
+    @property
+    def n_vertices(self) -> int:
+        """Number of vertices in use"""
+        return int(self._counts[0])
+
+    @n_vertices.setter
+    def n_vertices(self, value: int):
+        self._counts[0] = value
+
+    @property
+    def n_faces(self) -> int:
+        """Number of faces in use"""
+        return int(self._counts[1])
+
+    @n_faces.setter
+    def n_faces(self, value: int):
+        self._counts[1] = value
+
+    @property
+    def version(self) -> int:
+        """Incremented on every change so per-frame results can be cached"""
+        return int(self._counts[2])
+
+    @version.setter
+    def version(self, value: int):
+        self._counts[2] = value
+
+    def share(self, shared: "SharedArrays | None"):
+        """Move the buffers into shared memory, or back into private memory
+
+        Args:
+            shared (SharedArrays | None): Shared memory to move the buffers to, or None for private memory
+        """
+        old = self.shared
+        self.shared = shared
+        for name in _BUFFERS:
+            setattr(self, name, self._place(name, getattr(self, name)))
+        self._counts = self._place("counts", self._counts)
+        if old is not None and old is not shared:
+            for name in _BUFFERS + ("counts",):
+                old.release("packed." + name)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, handle: int) -> bool:
+        return handle in self._entries
+
+    def add(self, model: Model, matrix: np.ndarray | None = None) -> int:
+        """Append a model to the buffers
+
+        Args:
+            model (Model): Model with homogeneous vertices
+            matrix (np.ndarray | None, optional): Model matrix (4x4). Defaults to identity.
+
+        Raises:
+            ValueError: If the model is compact
+
+        Returns:
+            (int): Handle of the model in the buffers
+        """
+        if model.is_compact:
+            raise ValueError("Compact models cannot be packed")
+        if not self._free_slots:
+            self._grow_matrices()
+        slot = self._free_slots.pop()
+        self.matrices[slot] = np.eye(4) if matrix is None else matrix
+
+        handle = self._next_handle
+        self._next_handle += 1
+        self._entries[handle] = [slot, model, None, self.n_vertices, 0, self.n_faces, 0]
+        self._write(handle)
+        return handle
+
+    def remove(self, handle: int):
+        """Remove a model and close the gap it leaves in the buffers
+
+        Args:
+            handle (int): Handle returned by add
+
+        Raises:
+            KeyError: If the handle is unknown
+        """
+        slot, _, _, v_off, v_count, f_off, f_count = self._entries.pop(handle)
+        self._free_slots.append(slot)
+        self._cut(v_off, v_count, f_off, f_count)
+        self.version += 1
+
+    def set_matrix(self, handle: int, matrix: np.ndarray):
+        """Replace the model matrix of a packed model
+
+        Args:
+            handle (int): Handle returned by add
+            matrix (np.ndarray): Model matrix (4x4)
+
+        Raises:
+            KeyError: If the handle is unknown
+        """
+        slot = self._entries[handle][0]
+        if not np.array_equal(self.matrices[slot], matrix):
+            self.matrices[slot] = matrix
+            self.version += 1
+
+    def refresh(self, handle: int) -> bool:
+        """Copy a model's geometry into the buffers again if it changed since it was packed: its version was bumped or
+        its vertex, face or normal array was replaced. Edits in place that skip Model.mark_changed are not noticed;
+        use rewrite for those.
+
+        Args:
+            handle (int): Handle returned by add
+
+        Raises:
+            KeyError: If the handle is unknown
+
+        Returns:
+            (bool): Whether the buffers were updated
+        """
+        entry = self._entries[handle]
+        if entry[2] == _stamp(entry[1]):
+            return False
+        self._write(handle)
+        return True
+
+    def rewrite(self, handle: int):
+        """Copy a model's geometry into the buffers unconditionally
+
+        Args:
+            handle (int): Handle returned by add
+
+        Raises:
+            KeyError: If the handle is unknown
+        """
+        self._write(handle)
+
+    def get_range(self, handle: int) -> tuple[int, int, int, int]:
+        """Get where a model is stored
+
+        Args:
+            handle (int): Handle returned by add
+
+        Raises:
+            KeyError: If the handle is unknown
+
+        Returns:
+            (tuple[int, int, int, int]): Vertex offset, vertex count, face offset and face count
+        """
+        return tuple(self._entries[handle][3:])
+
+    def get_model(self, handle: int) -> Model:
+        """Get a packed model
+
+        Args:
+            handle (int): Handle returned by add
+
+        Raises:
+            KeyError: If the handle is unknown
+
+        Returns:
+            (Model): Model stored under the handle
+        """
+        return self._entries[handle][1]
+
+    def transform(self, t: np.ndarray) -> np.ndarray:
+        """Transform all packed vertices by their model matrix followed by t
+
+        Args:
+            t (np.ndarray): Transformation applied after the model matrices (4x4)
+
+        Returns:
+            (np.ndarray): Transformed homogeneous vertices (V, 4)
+        """
+        v = self.v[: self.n_vertices]
+        shared = self._shared_matrix()
+        if shared is not None:
+            return v @ (t @ shared).T
+        ts = t @ self.matrices
+        return np.einsum("vij,vj->vi", ts[self.vertex_matrix[: self.n_vertices]], v)
+
+    def world_normals(self) -> np.ndarray:
+        """Face normals transformed by the inverse transpose of their model matrix
+
+        Returns:
+            (np.ndarray): Unit normals (F, 3)
+        """
+        n = self.n[: self.n_faces]
+        shared = self._shared_matrix()
+        if shared is not None:
+            return (
+                n if np.array_equal(shared, np.eye(4)) else transform_normals(n, shared)
+            )
+        inv = np.linalg.inv(self.matrices[:, :3, :3])
+        normals = np.einsum("fj,fjk->fk", n, inv[self.face_matrix[: self.n_faces]])
+        norm = np.linalg.norm(normals, axis=1, keepdims=True)
+        np.divide(normals, norm, out=normals, where=norm > 0)
+        return normals
+
+    def _shared_matrix(self) -> np.ndarray | None:
+        """The model matrix if all packed models use the same one (no gather needed), otherwise None"""
+        slots = [entry[0] for entry in self._entries.values()]
+        if not slots:
+            return np.eye(4)
+        used = self.matrices[slots]
+        if (used == used[0]).all():
+            return used[0]
+        return None
+
+    def _write(self, handle: int):
+        entry = self._entries[handle]
+        slot, model, _, v_off, v_count, f_off, f_count = entry
+        if model.n is None:
+            model.n = model.compute_normals()
+        if len(model.v) != v_count or len(model.f) != f_count:
+            # Sizes changed: move the model to the end of the buffers
+            self._cut(v_off, v_count, f_off, f_count)
+            v_off, v_count = self.n_vertices, len(model.v)
+            f_off, f_count = self.n_faces, len(model.f)
+            self._reserve(v_off + v_count, f_off + f_count)
+            self.n_vertices += v_count
+            self.n_faces += f_count
+            entry[3:] = [v_off, v_count, f_off, f_count]
+
+        self.v[v_off : v_off + v_count] = model.v
+        self.vertex_matrix[v_off : v_off + v_count] = slot
+        self.f[f_off : f_off + f_count] = model.f
+        self.n[f_off : f_off + f_count] = model.n
+        self.face_matrix[f_off : f_off + f_count] = slot
+        entry[2] = _stamp(model)
+        self.version += 1
+
+    def _cut(self, v_off: int, v_count: int, f_off: int, f_count: int):
+        """Close a gap in the buffers and shift the ranges behind it"""
+        nv, nf = self.n_vertices, self.n_faces
+        self.v[v_off : nv - v_count] = self.v[v_off + v_count : nv]
+        self.vertex_matrix[v_off : nv - v_count] = self.vertex_matrix[
+            v_off + v_count : nv
+        ]
+        self.f[f_off : nf - f_count] = self.f[f_off + f_count : nf]
+        self.n[f_off : nf - f_count] = self.n[f_off + f_count : nf]
+        self.face_matrix[f_off : nf - f_count] = self.face_matrix[f_off + f_count : nf]
+        self.n_vertices -= v_count
+        self.n_faces -= f_count
+        for entry in self._entries.values():
+            if entry[3] > v_off:
+                entry[3] -= v_count
+            if entry[5] > f_off:
+                entry[5] -= f_count
+
+    def _reserve(self, vertices: int, faces: int):
+        if vertices > len(self.v):
+            cap = max(vertices, 2 * len(self.v))
+            self.v = self._resize("v", self.v, cap)
+            self.vertex_matrix = self._resize("vertex_matrix", self.vertex_matrix, cap)
+        if faces > len(self.f):
+            cap = max(faces, 2 * len(self.f))
+            self.f = self._resize("f", self.f, cap)
+            self.n = self._resize("n", self.n, cap)
+            self.face_matrix = self._resize("face_matrix", self.face_matrix, cap)
+
+    def _grow_matrices(self):
+        cap = len(self.matrices)
+        self.matrices = self._resize("matrices", self.matrices, 2 * cap)
+        self.matrices[cap:] = np.eye(4)
+        self._free_slots.extend(range(2 * cap - 1, cap - 1, -1))
+
+    def _alloc(self, name: str, shape: tuple, dtype: type) -> np.ndarray:
+        if self.shared is None:
+            return np.zeros(shape, dtype=dtype)
+        return self.shared.zeros("packed." + name, shape, dtype)
+
+    def _place(self, name: str, a: np.ndarray) -> np.ndarray:
+        """A copy of a buffer in the current memory (shared or private)"""
+        out = self._alloc(name, a.shape, a.dtype)
+        out[...] = a
+        return out
+
+    def _resize(self, name: str, a: np.ndarray, n: int) -> np.ndarray:
+        out = self._alloc(name, (n,) + a.shape[1:], a.dtype)
+        out[: len(a)] = a
+        return out
+
+
+_BUFFERS = ("v", "vertex_matrix", "f", "n", "face_matrix", "matrices")
+
+
+def _stamp(model: Model) -> tuple[int, int, int, int]:
+    """Version and array identities of a model, which change whenever its geometry is replaced"""
+    return (model.version, id(model.v), id(model.f), id(model.n))
@@ -0,0 +1,98 @@
+"""
+Load-time mesh cleanup: vertex welding, degenerate face removal and locality-friendly reordering.
+"""
+
+import numpy as np
+from .model import Model
+
+
+def clean_model(
+    model: Model, tol: float = 1e-6, reorder: bool = True
+) -> tuple[Model, dict]:
+    """Weld duplicate vertices, drop degenerate faces and unreferenced vertices, and reorder for memory locality.
+
+    Vertices are sorted along a Morton (Z-order) curve and faces by their smallest vertex index, so that gathers such
+    as `v[f[:, 0]]` walk the vertex array mostly forward.
+
+    Args:
+        model (Model): Model to clean. Faces must be triangles.
+        tol (float, optional): Vertices closer than this (per axis) are welded together. Defaults to 1e-6.
+        reorder (bool, optional): Whether to reorder vertices and faces. Defaults to True.
+
+    Raises:
+        ValueError: If the model faces are not triangles
+
+    Returns:
+        (tuple[Model, dict]): Cleaned model and statistics about what was removed
+    """
+    if model.f.ndim != 2 or model.f.shape[1] != 3:
+        raise ValueError("Cleanup requires triangle faces")
+
+    v = model.v[:, :3]
+    f = model.f
+    # Texture coordinates belong to face corners, so they follow the faces
+    uv = model.uv
+    stats = {"vertices_in": len(v), "faces_in": len(f)}
+
+    # Weld vertices that fall into the same tolerance cell
+    keys = np.rint(v / tol).astype(np.int64)
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    # Keep welded vertices in order of first occurrence
+    perm = np.argsort(first)
+    rank = np.empty_like(perm)
+    rank[perm] = np.arange(len(perm))
+    v = v[first[perm]]
+    f = rank[inverse.reshape(-1)][f]
+    stats["welded"] = stats["vertices_in"] - len(v)
+
+    # Drop faces with repeated indices or zero area
+    repeated = (f[:, 0] == f[:, 1]) | (f[:, 1] == f[:, 2]) | (f[:, 2] == f[:, 0])
+    p0, p1, p2 = v[f[:, 0]], v[f[:, 1]], v[f[:, 2]]
+    area = np.linalg.norm(np.cross(p1 - p0, p2 - p0), axis=1)
+    degenerate = repeated | (area <= tol * tol)
+    f = f[~degenerate]
+    if uv is not None:
+        uv = uv[~degenerate]
+    stats["degenerate"] = int(degenerate.sum())
+
+    # Drop vertices no longer referenced by any face
+    used = np.zeros(len(v), dtype=bool)
+    used[f.ravel()] = True
+    stats["unreferenced"] = int((~used).sum())
+
+    order = np.flatnonzero(used)
+    if reorder:
+        order = order[np.argsort(_morton_codes(v[order]), kind="stable")]
+    remap = np.empty(len(v), dtype=f.dtype)
+    remap[order] = np.arange(len(order))
+    v = v[order]
+    f = remap[f]
+
+    if reorder:
+        face_order = np.argsort(f.min(axis=1), kind="stable")
+        f = f[face_order]
+        if uv is not None:
+            uv = uv[face_order]
+
+    stats["vertices_out"] = len(v)
+    stats["faces_out"] = len(f)
+    if model.is_compact:
+        cleaned = Model(v, f.astype(model.f.dtype))
+    else:
+        cleaned = Model(np.hstack([v, np.ones((len(v), 1))]), f)
+    cleaned.uv, cleaned.texture = uv, model.texture
+    return cleaned, stats
+
+
+def _morton_codes(v: np.ndarray, bits: int = 10) -> np.ndarray:
+    """Interleave quantized x, y and z coordinates into Z-order curve codes"""
+    lo, hi = v.min(axis=0), v.max(axis=0)
+    scale = np.where(hi > lo, hi - lo, 1)
+    q = ((v - lo) / scale * ((1 << bits) - 1)).astype(np.uint64)
+
+    codes = np.zeros(len(v), dtype=np.uint64)
+    for b in range(bits):
+        for axis in range(3):
+            bit = (q[:, axis] >> np.uint64(b)) & np.uint64(1)
+            codes |= bit << np.uint64(3 * b + axis)
+    return codes
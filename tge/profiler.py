@@ -0,0 +1,189 @@
+"""
+Opt-in per-frame instrumentation of the rendering pipeline.
+"""
+
+import sys
+import time
+from collections import deque
+
+STAGES = ("transform", "cull", "shade", "setup", "raster", "encode", "write")
+
+
+class FrameStats:
+    """Statistics collected while rendering and presenting a single frame"""
+
+    def __init__(self, frame: int):
+        """Initialize empty statistics for a frame
+
+        Args:
+            frame (int): Frame number
+        """
+        self.frame = frame
+        self.start = time.perf_counter()
+        self.end = self.start
+        self.times = dict.fromkeys(STAGES, 0.0)
+        self.triangles = {
+            "submitted": 0,
+            "culled": 0,
+            "occluded": 0,
+            "rasterized": 0,
+        }
+        self.pixels_written = 0
+        self.pixels_covered = 0
+        # Change in sys.getallocatedblocks() over the frame, not a count of allocations: blocks allocated and freed
+        # within the frame cancel out, and it is negative when the frame freed more blocks than it kept
+        self.net_blocks = 0
+        self.alloc_peak_bytes = 0
+        self.events: list[tuple[str, float, float]] = []
+        self._blocks = sys.getallocatedblocks()
+
+    @property
+    def frame_time(self) -> float:
+        """Wall time from the start of rendering to the end of the last recorded stage (seconds)"""
+        return self.end - self.start
+
+    @property
+    def overdraw(self) -> float:
+        """Average number of times each covered cell was written"""
+        if self.pixels_covered == 0:
+            return 0.0
+        return self.pixels_written / self.pixels_covered
+
+    def to_dict(self) -> dict:
+        """Convert to a plain dictionary
+
+        Returns:
+            (dict): Frame statistics
+        """
+        return {
+            "frame": self.frame,
+            "frame_time": self.frame_time,
+            "times": dict(self.times),
+            "triangles": dict(self.triangles),
+            "pixels_written": self.pixels_written,
+            "pixels_covered": self.pixels_covered,
+            "overdraw": self.overdraw,
+            "net_blocks": self.net_blocks,
+            "alloc_peak_bytes": self.alloc_peak_bytes,
+        }
+
+
+class Profiler:
+    """Collects FrameStats for the most recent frames"""
+
+    def __init__(self, max_frames: int = 600, trace: bool = False):
+        """Initialize a profiler
+
+        Args:
+            max_frames (int, optional): Number of frames kept in history. Defaults to 600.
+            trace (bool, optional): Whether to keep individual stage events for trace export. Defaults to False.
+        """
+        self.frames: deque[FrameStats] = deque(maxlen=max_frames)
+        self.trace = trace
+        self._count = 0
+
+    @property
+    def last(self) -> FrameStats | None:
+        """Statistics of the most recent frame"""
+        return self.frames[-1] if self.frames else None
+
+    def begin_frame(self) -> FrameStats:
+        """Start collecting statistics for a new frame
+
+        Returns:
+            (FrameStats): Statistics of the new frame
+        """
+        if _tracing():
+            sys.modules["tracemalloc"].reset_peak()
+        stats = FrameStats(self._count)
+        self._count += 1
+        self.frames.append(stats)
+        return stats
+
+    def end_frame(self):
+        """Finish rendering the current frame and record the net change in allocated blocks and the allocation peak"""
+        stats = self.last
+        if stats is None:
+            return
+        stats.net_blocks = sys.getallocatedblocks() - stats._blocks
+        if _tracing():
+            stats.alloc_peak_bytes = sys.modules["tracemalloc"].get_traced_memory()[1]
+
+    def record(self, stage: str, start: float, end: float):
+        """Add the time spent in a stage to the current frame
+
+        Args:
+            stage (str): Stage name
+            start (float): Start time (time.perf_counter)
+            end (float): End time (time.perf_counter)
+        """
+        self.add(stage, end - start)
+        self.event(stage, start, end)
+
+    def add(self, stage: str, seconds: float):
+        """Add time to a stage of the current frame without recording a trace event
+
+        Args:
+            stage (str): Stage name
+            seconds (float): Time spent
+        """
+        stats = self.last
+        if stats is not None:
+            stats.times[stage] += seconds
+
+    def event(self, name: str, start: float, end: float):
+        """Record a trace event in the current frame
+
+        Args:
+            name (str): Event name
+            start (float): Start time (time.perf_counter)
+            end (float): End time (time.perf_counter)
+        """
+        stats = self.last
+        if stats is None:
+            return
+        stats.end = max(stats.end, end)
+        if self.trace:
+            stats.events.append((name, start, end - start))
+
+    def export_chrome_trace(self, path: str):
+        """Write recorded stage events in the Chrome trace event format (chrome://tracing, Perfetto)
+
+        Args:
+            path (str): Output .json path
+        """
+        import json
+
+        events = []
+        for stats in self.frames:
+            events.append(
+                {
+                    "name": f"frame {stats.frame}",
+                    "ph": "X",
+                    "ts": stats.start * 1e6,
+                    "dur": stats.frame_time * 1e6,
+                    "pid": 0,
+                    "tid": 0,
+                    "args": stats.to_dict(),
+                }
+            )
+            for name, start, duration in stats.events:
+                events.append(
+                    {
+                        "name": name,
+                        "ph": "X",
+                        "ts": start * 1e6,
+                        "dur": duration * 1e6,
+                        "pid": 0,
+                        "tid": 1,
+                    }
+                )
+
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def _tracing() -> bool:
+    # tracemalloc can only be tracing if something already imported it
+    tracemalloc = sys.modules.get("tracemalloc")
+    return tracemalloc is not None and tracemalloc.is_tracing()
@@ -0,0 +1,672 @@
+"""
+Rasterizer backends. Each backend draws flat-shaded screen-space triangles into a frame buffer and a depth buffer.
+"""
+
+import time
+import numpy as np
+
+
+class Rasterizer:
+    """Base class for rasterizer backends"""
+
+    name = "base"
+
+    def rasterize(
+        self,
+        v: np.ndarray,
+        z: np.ndarray,
+        faces: np.ndarray,
+        intensities: np.ndarray,
+        buf: np.ndarray,
+        zbuf: np.ndarray,
+        profiler: "Profiler | None" = None,
+        conservative: bool = False,
+    ) -> tuple[int, int]:
+        """Rasterize triangles into the buffers (in-place). Triangles are drawn in order; the nearest depth wins and
+        earlier triangles win ties.
+
+        Faces are skipped as occluded when all three vertices are behind the depth buffer, which is fast but can skip
+        a face whose interior is in front. With `conservative`, a face is only skipped when its nearest depth is
+        behind the farthest depth anywhere in its screen bounds, so skipping never changes the buffers.
+
+        Args:
+            v (np.ndarray): Rounded screen xy per vertex (V, 2)
+            z (np.ndarray): Depth per vertex (V,)
+            faces (np.ndarray): Face vertex indices (F, 3)
+            intensities (np.ndarray): Shading intensity per face (F,), or several channels per face (F, c)
+            buf (np.ndarray): Frame buffer (h, w), or (h, w, c) for multi-channel intensities
+            zbuf (np.ndarray): Depth buffer (h, w)
+            profiler (Profiler | None, optional): Profiler to record stage times into. Defaults to None.
+            conservative (bool, optional): Whether to only skip faces hidden in their whole screen bounds. Defaults to False.
+
+        Returns:
+            (tuple[int, int]): Number of faces skipped as occluded and number of cells written
+        """
+        raise NotImplementedError
+
+
+class ScanlineRasterizer(Rasterizer):
+    """Reference backend: Bresenham edge walking and per-row span filling, one face at a time"""
+
+    name = "reference"
+
+    def rasterize(
+        self,
+        v: np.ndarray,
+        z: np.ndarray,
+        faces: np.ndarray,
+        intensities: np.ndarray,
+        buf: np.ndarray,
+        zbuf: np.ndarray,
+        profiler: "Profiler | None" = None,
+        conservative: bool = False,
+    ) -> tuple[int, int]:
+        h, w = buf.shape[:2]
+        mlen = int((w**2 + h**2) ** 0.5 + w + h)
+        loop_start = time.perf_counter()
+        setup_time = raster_time = 0.0
+        occluded = written = 0
+        for i, face in enumerate(faces):
+            v0, v1, v2 = v[face]
+            z0, z1, z2 = z[face]
+
+            if conservative:
+                if _behind_bounds(v[face], z[face], zbuf):
+                    occluded += 1
+                    continue
+            # Skip this face if all vertices are obscured
+            elif (
+                _occluded(v0, z0, zbuf)
+                and _occluded(v1, z1, zbuf)
+                and _occluded(v2, z2, zbuf)
+            ):
+                occluded += 1
+                continue
+
+            if profiler is not None:
+                t0 = time.perf_counter()
+
+            # Edge walking & scan conversion
+            edge_set = set()
+            edge_pts = np.zeros((mlen, 2), dtype=int)
+            edge_zs = np.zeros(mlen, dtype=zbuf.dtype)
+
+            j = _bresenhams_line(v0, v1, z0, z1, w, h, edge_set, edge_pts, edge_zs, 0)
+            j = _bresenhams_line(v1, v2, z1, z2, w, h, edge_set, edge_pts, edge_zs, j)
+            j = _bresenhams_line(v2, v0, z2, z0, w, h, edge_set, edge_pts, edge_zs, j)
+
+            edge_pts = edge_pts[0:j]
+            edge_zs = edge_zs[0:j]
+
+            if profiler is None:
+                written += _fill_span(edge_pts, edge_zs, buf, zbuf, intensities[i])
+            else:
+                t1 = time.perf_counter()
+                written += _fill_span(edge_pts, edge_zs, buf, zbuf, intensities[i])
+                setup_time += t1 - t0
+                raster_time += time.perf_counter() - t1
+
+        if profiler is not None:
+            profiler.add("setup", setup_time)
+            profiler.add("raster", raster_time)
+            profiler.event("rasterize", loop_start, time.perf_counter())
+        return occluded, written
+
+
+class NumpyRasterizer(Rasterizer):
+    """Vectorized backend: generates fragments for all faces at once and resolves depth with a single sort.
+
+    Unlike the reference backend, faces are never skipped because of triangles drawn earlier in the same call, and
+    spans of partially off-screen triangles are clipped rather than truncated at the screen border.
+    """
+
+    name = "numpy"
+
+    def rasterize(
+        self,
+        v: np.ndarray,
+        z: np.ndarray,
+        faces: np.ndarray,
+        intensities: np.ndarray,
+        buf: np.ndarray,
+        zbuf: np.ndarray,
+        profiler: "Profiler | None" = None,
+        conservative: bool = False,
+    ) -> tuple[int, int]:
+        start = time.perf_counter()
+        h, w = buf.shape[:2]
+        if len(faces) == 0:
+            return 0, 0
+
+        p, pz = v[faces], z[faces]
+        if conservative:
+            keep = np.flatnonzero(~_hidden(p, pz, zbuf))
+        else:
+            # Skip faces whose vertices are all behind the current depth buffer
+            px, py = p[..., 0], p[..., 1]
+            inside = (px >= 0) & (px < w) & (py >= 0) & (py < h)
+            behind = pz < zbuf[np.clip(py, 0, h - 1), np.clip(px, 0, w - 1)]
+            keep = np.flatnonzero(~(inside & behind).all(axis=1))
+        occluded = len(faces) - len(keep)
+        pix, fz, ff = _fragments(p[keep], pz[keep], h, w)
+        written = _resolve(pix, fz, ff, intensities[keep], buf, zbuf)
+
+        if profiler is not None:
+            profiler.record("raster", start, time.perf_counter())
+        return occluded, written
+
+
+class NumbaRasterizer(Rasterizer):
+    """JIT-compiled scanline backend. Requires the optional numba package, which is imported on construction."""
+
+    name = "numba"
+
+    def __init__(self):
+        import numba
+
+        self._kernel = numba.njit(cache=True)(_scanline_kernel)
+
+    def rasterize(
+        self,
+        v: np.ndarray,
+        z: np.ndarray,
+        faces: np.ndarray,
+        intensities: np.ndarray,
+        buf: np.ndarray,
+        zbuf: np.ndarray,
+        profiler: "Profiler | None" = None,
+        conservative: bool = False,
+    ) -> tuple[int, int]:
+        start = time.perf_counter()
+        hidden = 0
+        if conservative and len(faces) > 0:
+            keep = ~_hidden(v[faces], z[faces], zbuf)
+            hidden = len(faces) - int(keep.sum())
+            faces, intensities = faces[keep], intensities[keep]
+        occluded, written = self._kernel(
+            np.ascontiguousarray(v, dtype=np.int64),
+            np.ascontiguousarray(z, dtype=np.float64),
+            np.ascontiguousarray(faces, dtype=np.int64),
+            # The kernel always works on channels
+            np.ascontiguousarray(intensities, dtype=np.float64).reshape(len(faces), -1),
+            buf.reshape(buf.shape[0], buf.shape[1], -1),
+            zbuf,
+            not conservative,
+        )
+        occluded += hidden
+        if profiler is not None:
+            profiler.record("raster", start, time.perf_counter())
+        return occluded, written
+
+
+RASTERIZERS = {
+    ScanlineRasterizer.name: ScanlineRasterizer,
+    NumpyRasterizer.name: NumpyRasterizer,
+    NumbaRasterizer.name: NumbaRasterizer,
+}
+
+
+def get_rasterizer(name: str) -> Rasterizer:
+    """Create a rasterizer backend by name
+
+    Args:
+        name (str): One of "reference", "numpy" or "numba"
+
+    Raises:
+        ValueError: If the backend name is unknown
+        ImportError: If the backend depends on a package that is not installed
+
+    Returns:
+        (Rasterizer): Rasterizer backend
+    """
+    if name not in RASTERIZERS:
+        raise ValueError(f"Invalid rasterizer: {name}")
+    return RASTERIZERS[name]()
+
+
+def paint(
+    v: np.ndarray,
+    z: np.ndarray,
+    faces: np.ndarray,
+    intensities: np.ndarray,
+    buf: np.ndarray,
+    profiler: "Profiler | None" = None,
+) -> int:
+    """Painter's algorithm: sort faces by mean depth in one argsort and fill them back to front, without a depth
+    buffer. Every cell takes the nearest face covering it as long as faces do not interpenetrate or cyclically
+    overlap.
+
+    Cells where neighbouring faces meet at exactly the same depth, such as shared vertices and edges, take the face
+    painted last rather than the earlier face as with the depth buffer, so their shading can differ from the
+    rasterizers.
+
+    Args:
+        v (np.ndarray): Rounded screen xy per vertex (V, 2)
+        z (np.ndarray): Depth per vertex (V,)
+        faces (np.ndarray): Face vertex indices (F, 3)
+        intensities (np.ndarray): Shading intensity per face (F,), or several channels per face (F, c)
+        buf (np.ndarray): Frame buffer (h, w), or (h, w, c) for multi-channel intensities
+        profiler (Profiler | None, optional): Profiler to record stage times into. Defaults to None.
+
+    Returns:
+        (int): Number of cells written
+    """
+    start = time.perf_counter()
+    h, w = buf.shape[:2]
+    if len(faces) == 0:
+        return 0
+    # Larger depths are nearer, so ascending order is back to front
+    order = np.argsort(z[faces].mean(axis=1), kind="stable")
+    faces = faces[order]
+    if profiler is not None:
+        now = time.perf_counter()
+        profiler.record("setup", start, now)
+        start = now
+
+    # Depth is not needed past the sort, so it is not interpolated
+    p = v[faces]
+    pix, _, ff = _fragments(p, np.zeros(p.shape[:2]), h, w)
+    # Fragments come in painting order, so the last (nearest) face in every cell has the largest index
+    owner = np.full(h * w, -1)
+    np.maximum.at(owner, pix, ff)
+    cells = np.flatnonzero(owner >= 0)
+    flat = buf.reshape(h * w, -1)
+    flat[cells] = intensities[order[owner[cells]]].reshape(len(cells), flat.shape[1])
+
+    if profiler is not None:
+        profiler.record("raster", start, time.perf_counter())
+    return len(cells)
+
+
+def draw_lines(
+    v: np.ndarray,
+    z: np.ndarray,
+    edges: np.ndarray,
+    intensities: np.ndarray,
+    buf: np.ndarray,
+    zbuf: np.ndarray,
+) -> int:
+    """Draw line segments into the buffers (in-place), all segments in one vectorized pass. The nearest depth wins
+    and earlier segments win ties. Segments are clipped to the buffer.
+
+    Args:
+        v (np.ndarray): Rounded screen xy per vertex (V, 2)
+        z (np.ndarray): Depth per vertex (V,)
+        edges (np.ndarray): Segment vertex indices (E, 2)
+        intensities (np.ndarray): Shading intensity per segment (E,), or several channels per segment (E, c)
+        buf (np.ndarray): Frame buffer (h, w), or (h, w, c) for multi-channel intensities
+        zbuf (np.ndarray): Depth buffer (h, w)
+
+    Returns:
+        (int): Number of cells written
+    """
+    h, w = buf.shape[:2]
+    if len(edges) == 0:
+        return 0
+    ex, ey, ez, edge = _line_points(
+        v[edges[:, 0]], v[edges[:, 1]], z[edges[:, 0]], z[edges[:, 1]]
+    )
+    inside = (ex >= 0) & (ex < w) & (ey >= 0) & (ey < h)
+    pix = ey[inside] * w + ex[inside]
+    return _resolve(pix, ez[inside], edge[inside], intensities, buf, zbuf)
+
+
+def draw_points(
+    v: np.ndarray,
+    z: np.ndarray,
+    points: np.ndarray,
+    intensities: np.ndarray,
+    buf: np.ndarray,
+    zbuf: np.ndarray,
+) -> int:
+    """Draw vertices as single cells into the buffers (in-place). The nearest depth wins.
+
+    Args:
+        v (np.ndarray): Rounded screen xy per vertex (V, 2)
+        z (np.ndarray): Depth per vertex (V,)
+        points (np.ndarray): Indices of the vertices to draw (P,)
+        intensities (np.ndarray): Shading intensity per point (P,), or several channels per point (P, c)
+        buf (np.ndarray): Frame buffer (h, w), or (h, w, c) for multi-channel intensities
+        zbuf (np.ndarray): Depth buffer (h, w)
+
+    Returns:
+        (int): Number of cells written
+    """
+    h, w = buf.shape[:2]
+    px, py = v[points, 0], v[points, 1]
+    inside = np.flatnonzero((px >= 0) & (px < w) & (py >= 0) & (py < h))
+    pix = py[inside] * w + px[inside]
+    return _resolve(pix, z[points][inside], inside, intensities, buf, zbuf)
+
+
+def _fragments(
+    p: np.ndarray, pz: np.ndarray, h: int, w: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Cells covered by triangles, clipped to the buffer
+
+    Args:
+        p (np.ndarray): Rounded screen xy of the corners of each triangle (F, 3, 2)
+        pz (np.ndarray): Depth of the corners of each triangle (F, 3)
+        h (int): Buffer height
+        w (int): Buffer width
+
+    Returns:
+        (tuple[np.ndarray, np.ndarray, np.ndarray]): Flat cell index, interpolated depth and triangle index per
+        fragment, ordered by triangle
+    """
+    # Edge points of every face: (F * 3) edges sampled once per step along their major axis
+    ex, ey, ez, edge = _line_points(
+        p.reshape(-1, 2),
+        p[:, [1, 2, 0]].reshape(-1, 2),
+        pz.reshape(-1),
+        pz[:, [1, 2, 0]].reshape(-1),
+    )
+    face = edge // 3
+
+    rows = (ey >= 0) & (ey < h)
+    ex, ey, ez, face = ex[rows], ey[rows], ez[rows], face[rows]
+    if len(ex) == 0:
+        return np.empty(0, dtype=int), np.empty(0), np.empty(0, dtype=int)
+
+    # One span per (face, row) between its leftmost and rightmost edge points
+    key = face * h + ey
+    order = np.lexsort((ex, key))
+    key_s = key[order]
+    first = np.flatnonzero(np.r_[True, key_s[1:] != key_s[:-1]])
+    last = np.r_[first[1:] - 1, len(key_s) - 1]
+    lo, hi = order[first], order[last]
+    x0, x1, z0, z1 = ex[lo], ex[hi], ez[lo], ez[hi]
+
+    cx0, cx1 = np.maximum(x0, 0), np.minimum(x1, w - 1)
+    span, k = _expand(np.maximum(cx1 - cx0 + 1, 0))
+    fx = cx0[span] + k
+    width = (x1 - x0)[span]
+    fz = z0[span] + (fx - x0[span]) / np.maximum(width, 1) * (z1 - z0)[span]
+    return ey[lo][span] * w + fx, fz, face[lo][span]
+
+
+def _line_points(
+    a: np.ndarray, b: np.ndarray, za: np.ndarray, zb: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Points of many lines, sampled once per step along each line's major axis
+
+    Args:
+        a (np.ndarray): Start points (L, 2)
+        b (np.ndarray): End points (L, 2)
+        za (np.ndarray): Start depths (L,)
+        zb (np.ndarray): End depths (L,)
+
+    Returns:
+        (tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]): x, y, interpolated depth and line index per point
+    """
+    d = b - a
+    dz = zb - za
+    ad = np.abs(d)
+    steps = ad.max(axis=1)
+    line, k = _expand(steps + 1)
+    # Closed form of Bresenham's line: the minor axis advances by floor((2k * minor + major) / (2 * major))
+    major, minor = steps[line], ad.min(axis=1)[line]
+    offset = (2 * k * minor + major) // np.maximum(2 * major, 1)
+    x_major = ad[line, 0] >= ad[line, 1]
+    x = a[line, 0] + np.sign(d[line, 0]) * np.where(x_major, k, offset)
+    y = a[line, 1] + np.sign(d[line, 1]) * np.where(x_major, offset, k)
+    depth = za[line] + k / np.maximum(major, 1) * dz[line]
+    return x, y, depth, line
+
+
+def _resolve(
+    pix: np.ndarray,
+    fz: np.ndarray,
+    src: np.ndarray,
+    intensities: np.ndarray,
+    buf: np.ndarray,
+    zbuf: np.ndarray,
+) -> int:
+    """Depth test fragments against each other and the depth buffer, then write the winners
+
+    Args:
+        pix (np.ndarray): Flat cell index per fragment
+        fz (np.ndarray): Depth per fragment
+        src (np.ndarray): Index of the primitive each fragment belongs to; lower indices win ties
+        intensities (np.ndarray): Intensity per primitive (n,) or (n, c)
+        buf (np.ndarray): Frame buffer (h, w) or (h, w, c)
+        zbuf (np.ndarray): Depth buffer (h, w)
+
+    Returns:
+        (int): Number of cells written
+    """
+    if len(pix) == 0:
+        return 0
+    h, w = buf.shape[:2]
+    # Nearest fragment per cell, earliest primitive on ties
+    order = np.lexsort((src, -fz, pix))
+    pix_s = pix[order]
+    win = order[np.r_[True, pix_s[1:] != pix_s[:-1]]]
+    pix, fz, src = pix[win], fz[win], src[win]
+    passed = fz > zbuf.reshape(-1)[pix]
+    pix, fz, src = pix[passed], fz[passed], src[passed]
+    np.put(zbuf, pix, fz)
+    # Reshaping keeps a view of the (contiguous) buffer, with or without channels
+    cells = buf.reshape(h * w, -1)
+    cells[pix] = intensities[src].reshape(len(pix), cells.shape[1])
+    return len(pix)
+
+
+def _expand(counts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """For each i, repeat i counts[i] times and pair it with 0..counts[i]-1"""
+    idx = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.cumsum(counts) - counts
+    return idx, np.arange(len(idx)) - offsets[idx]
+
+
+def _scanline_kernel(v, z, faces, intensities, buf, zbuf, vertex_test):
+    """Scanline loop written for numba: Bresenham edges tracked as per-row extents, then span filling.
+    buf is (h, w, c) and intensities (F, c). Faces with all vertices hidden are skipped if vertex_test is set.
+    """
+    h, w = buf.shape[0], buf.shape[1]
+    row_lo = np.full(h, w, dtype=np.int64)
+    row_hi = np.full(h, -1, dtype=np.int64)
+    row_zlo = np.zeros(h)
+    row_zhi = np.zeros(h)
+    occluded = 0
+    written = 0
+
+    for i in range(faces.shape[0]):
+        hidden = vertex_test
+        for k in range(3 if vertex_test else 0):
+            x, y = v[faces[i, k], 0], v[faces[i, k], 1]
+            if not (0 <= x < w and 0 <= y < h and z[faces[i, k]] < zbuf[y, x]):
+                hidden = False
+                break
+        if hidden:
+            occluded += 1
+            continue
+
+        y_min, y_max = h, -1
+        for k in range(3):
+            p, q = faces[i, k], faces[i, (k + 1) % 3]
+            x0, y0, x1, y1 = v[p, 0], v[p, 1], v[q, 0], v[q, 1]
+            z0, z1 = z[p], z[q]
+            dx = abs(x1 - x0)
+            dy = -abs(y1 - y0)
+            sx = 1 if x0 < x1 else -1
+            sy = 1 if y0 < y1 else -1
+            n = max(dx, -dy)
+            step = 0
+            e = dx + dy
+            while True:
+                if 0 <= x0 < w and 0 <= y0 < h:
+                    zz = z0 + (z1 - z0) * step / n if n > 0 else z0
+                    if x0 < row_lo[y0]:
+                        row_lo[y0] = x0
+                        row_zlo[y0] = zz
+                    if x0 > row_hi[y0]:
+                        row_hi[y0] = x0
+                        row_zhi[y0] = zz
+                    y_min = min(y_min, y0)
+                    y_max = max(y_max, y0)
+                if x0 == x1 and y0 == y1:
+                    break
+                e2 = 2 * e
+                if e2 >= dy:
+                    e += dy
+                    x0 += sx
+                if e2 <= dx:
+                    e += dx
+                    y0 += sy
+                step += 1
+
+        for y in range(y_min, y_max + 1):
+            lo, hi = row_lo[y], row_hi[y]
+            if hi < 0:
+                continue
+            zlo, zhi = row_zlo[y], row_zhi[y]
+            for x in range(lo, hi + 1):
+                zz = zlo + (zhi - zlo) * (x - lo) / (hi - lo) if hi > lo else zlo
+                if zz > zbuf[y, x]:
+                    for c in range(buf.shape[2]):
+                        buf[y, x, c] = intensities[i, c]
+                    zbuf[y, x] = zz
+                    written += 1
+            row_lo[y] = w
+            row_hi[y] = -1
+
+    return occluded, written
+
+
+def _hidden(p: np.ndarray, pz: np.ndarray, zbuf: np.ndarray) -> np.ndarray:
+    """Faces whose nearest vertex is behind the farthest depth in their screen bounds, found with a min-depth pyramid:
+    each face reads the 2x2 tiles of the level at which its bounds span at most two tiles per axis.
+
+    Args:
+        p (np.ndarray): Rounded screen xy of the face corners (F, 3, 2)
+        pz (np.ndarray): Depth of the face corners (F, 3)
+        zbuf (np.ndarray): Depth buffer (h, w)
+
+    Returns:
+        (np.ndarray): Whether each face is hidden (F,)
+    """
+    h, w = zbuf.shape
+    lo, hi = p.min(axis=1), p.max(axis=1)
+    # Faces entirely off screen are left to the rasterizer
+    onscreen = (hi >= 0).all(axis=1) & (lo[:, 0] < w) & (lo[:, 1] < h)
+    lo = np.clip(lo, 0, [w - 1, h - 1]).astype(np.int64)
+    hi = np.clip(hi, 0, [w - 1, h - 1]).astype(np.int64)
+    extent = np.maximum((hi - lo).max(axis=1), 1)
+    level = np.ceil(np.log2(extent)).astype(np.int64)
+
+    farthest = np.full(len(p), -np.inf)
+    pyramid = zbuf
+    for k in range(int(level.max(initial=0)) + 1):
+        if k > 0:
+            # Pad odd sizes with +inf, which never lowers a minimum
+            ph, pw = pyramid.shape
+            padded = np.full((ph + ph % 2, pw + pw % 2), np.inf)
+            padded[:ph, :pw] = pyramid
+            pyramid = padded.reshape(len(padded) // 2, 2, -1, 2).min(axis=(1, 3))
+        sel = np.flatnonzero(level == k)
+        x0, y0 = (lo[sel] >> k).T
+        x1, y1 = (hi[sel] >> k).T
+        farthest[sel] = np.minimum(
+            np.minimum(pyramid[y0, x0], pyramid[y0, x1]),
+            np.minimum(pyramid[y1, x0], pyramid[y1, x1]),
+        )
+    return onscreen & (pz.max(axis=1) < farthest)
+
+
+def _behind_bounds(p: np.ndarray, pz: np.ndarray, zbuf: np.ndarray) -> bool:
+    """Whether a face's nearest vertex is behind every depth in its screen bounds"""
+    h, w = zbuf.shape
+    x0, y0 = np.maximum(p.min(axis=0), 0)
+    x1, y1 = np.minimum(p.max(axis=0), [w - 1, h - 1])
+    if x0 > x1 or y0 > y1:
+        return False
+    return pz.max() < zbuf[y0 : y1 + 1, x0 : x1 + 1].min()
+
+
+def _occluded(p: np.ndarray, z: float, zbuf: np.ndarray) -> bool:
+    h, w = zbuf.shape
+    return 0 <= p[0] < w and 0 <= p[1] < h and z < zbuf[p[1], p[0]]
+
+
+def _bresenhams_line(
+    v0: np.ndarray,
+    v1: np.ndarray,
+    z0: float,
+    z1: float,
+    w: int,
+    h: int,
+    edge_set: set,
+    edge_pts: np.ndarray,
+    edge_zs: np.ndarray,
+    i: int,
+):
+    x0, y0 = v0
+    x1, y1 = v1
+
+    dx = abs(x1 - x0)
+    dy = -abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+
+    zs = np.linspace(z0, z1, max(dx, abs(dy)) + 1)
+    z_i = 0
+    edge_zs[i : i + len(zs)] = zs
+
+    e = dx + dy
+    while True:
+        if 0 <= x0 < w and 0 <= y0 < h and (x0, y0) not in edge_set:
+            edge_set.add((x0, y0))
+            edge_pts[i] = (x0, y0)
+            edge_zs[i] = zs[z_i]
+            i += 1
+
+        if x0 == x1 and y0 == y1:
+            break
+
+        e2 = 2 * e
+        if e2 >= dy:
+            e += dy
+            x0 += sx
+        if e2 <= dx:
+            e += dx
+            y0 += sy
+        z_i += 1
+    return i
+
+
+def _fill_span(
+    edge_pts: np.ndarray,
+    z_vals: np.ndarray,
+    buf: np.ndarray,
+    zbuf: np.ndarray,
+    intensity: float = 1.0,
+) -> int:
+    h, w = buf.shape[:2]
+    written = 0
+
+    for y in np.unique(edge_pts[:, 1]):
+        y_ind = edge_pts[:, 1] == y
+        pts = edge_pts[y_ind]
+        sort_ind = pts[:, 0].argsort()
+        pts = pts[sort_ind]
+
+        zs = z_vals[y_ind][sort_ind]
+
+        if len(pts) == 1:
+            x, z = pts[0][0], zs[0]
+            if 0 <= x < w and 0 <= y < h and z > zbuf[y, x]:
+                buf[y, x] = intensity
+                zbuf[y, x] = z
+                written += 1
+        else:
+            x0, x1 = pts[0, 0], pts[-1, 0]
+            xs = np.arange(x0, x1 + 1)
+            z0, z1 = zs[0], zs[-1]
+            zspace = np.linspace(z0, z1, x1 - x0 + 1)
+
+            mask = (0 <= xs) & (xs < w) & (zspace > zbuf[y, xs])
+            buf[y, xs[mask]] = intensity
+            zbuf[y, xs[mask]] = zspace[mask]
+            written += int(mask.sum())
+    return written
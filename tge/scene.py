@@ -0,0 +1,208 @@
+from typing import List
+import numpy as np
+from .model import Model
+
+
+class SceneGraph:
+    """Hierarchy of nodes with local transforms. World transforms are cached and only recomputed for dirty subtrees.
+
+    Node transforms are stored in contiguous (n, 4, 4) stacks so that all dirty nodes on the same depth level are
+    updated with a single batched matmul.
+    """
+
+    def __init__(self, capacity: int = 16):
+        """Initialize an empty scene graph
+
+        Args:
+            capacity (int, optional): Initial number of node slots. Grows as needed. Defaults to 16.
+        """
+        self.local = np.tile(np.eye(4), (capacity, 1, 1))
+        self.world = np.tile(np.eye(4), (capacity, 1, 1))
+        self.parent = np.full(capacity, -1, dtype=int)
+        self.depth = np.zeros(capacity, dtype=int)
+        self.dirty = np.zeros(capacity, dtype=bool)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.models: List[Model | None] = []
+        self._n = 0
+        self._levels: List[np.ndarray] | None = None
+
+    def __len__(self) -> int:
+        return int(self.alive[: self._n].sum())
+
+    @property
+    def n_nodes(self) -> int:
+        """Number of node IDs handed out, including removed nodes. Node arrays are only valid up to this count."""
+        return self._n
+
+    def add_node(
+        self,
+        local: np.ndarray | None = None,
+        parent: int | None = None,
+        model: Model | None = None,
+    ) -> int:
+        """Add a node to the graph
+
+        Args:
+            local (np.ndarray | None, optional): Local transform relative to the parent (4x4). Defaults to identity.
+            parent (int | None, optional): Parent node ID. Defaults to None (root node).
+            model (Model | None, optional): Model drawn with this node's world transform. Defaults to None.
+
+        Raises:
+            ValueError: If local transform is not 4x4
+            IndexError: If parent ID is invalid
+
+        Returns:
+            (int): Node ID
+        """
+        if local is not None and local.shape != (4, 4):
+            raise ValueError("Transformation matrix must be 4x4")
+        if parent is not None:
+            self._check_id(parent)
+
+        if self._n == len(self.parent):
+            self._grow()
+
+        idx = self._n
+        self._n += 1
+        self.local[idx] = np.eye(4) if local is None else local
+        self.parent[idx] = -1 if parent is None else parent
+        self.depth[idx] = 0 if parent is None else self.depth[parent] + 1
+        self.dirty[idx] = True
+        self.alive[idx] = True
+        self.models.append(model)
+        self._levels = None
+        return idx
+
+    def remove_node(self, id: int):
+        """Removes a node and its whole subtree. IDs of other nodes are unaffected.
+
+        Args:
+            id (int): Node ID
+
+        Raises:
+            IndexError: If node ID is invalid
+        """
+        self._check_id(id)
+        removed = np.zeros(self._n, dtype=bool)
+        removed[id] = True
+        # Parents always have lower IDs than their children, so one forward sweep finds the subtree
+        for i in range(id + 1, self._n):
+            p = self.parent[i]
+            if p >= 0 and removed[p]:
+                removed[i] = True
+        self.alive[: self._n][removed] = False
+        for i in np.flatnonzero(removed):
+            self.models[i] = None
+        self._levels = None
+
+    def set_local(self, id: int, t: np.ndarray):
+        """Replace the local transform of a node
+
+        Args:
+            id (int): Node ID
+            t (np.ndarray): Local transform (4x4)
+
+        Raises:
+            ValueError: If transformation matrix is not 4x4
+            IndexError: If node ID is invalid
+        """
+        if t.shape != (4, 4):
+            raise ValueError("Transformation matrix must be 4x4")
+        self._check_id(id)
+        self.local[id] = t
+        self.dirty[id] = True
+
+    def transform_node(self, id: int, t: np.ndarray):
+        """Apply a transformation to a node in its parent's space
+
+        Args:
+            id (int): Node ID
+            t (np.ndarray): Transformation matrix to apply (4x4)
+
+        Raises:
+            ValueError: If transformation matrix is not 4x4
+            IndexError: If node ID is invalid
+        """
+        if t.shape != (4, 4):
+            raise ValueError("Transformation matrix must be 4x4")
+        self._check_id(id)
+        self.local[id] = t @ self.local[id]
+        self.dirty[id] = True
+
+    def get_world(self, id: int) -> np.ndarray:
+        """Get the world transform of a node, updating the graph first if needed
+
+        Args:
+            id (int): Node ID
+
+        Raises:
+            IndexError: If node ID is invalid
+
+        Returns:
+            (np.ndarray): World transform (4x4)
+        """
+        self._check_id(id)
+        self.update()
+        return self.world[id]
+
+    def update(self) -> int:
+        """Recompute world transforms of all dirty nodes and their descendants.
+
+        Levels are processed top-down; a node is recomputed if it or its parent was marked dirty, so clean
+        subtrees are never touched.
+
+        Returns:
+            (int): Number of nodes whose world transform was recomputed
+        """
+        n = self._n
+        if not self.dirty[:n].any():
+            return 0
+
+        dirty = self.dirty[:n] & self.alive[:n]
+        count = 0
+        for d, level in enumerate(self._get_levels()):
+            if d > 0:
+                dirty[level] |= dirty[self.parent[level]]
+            sel = level[dirty[level]]
+            if len(sel) == 0:
+                continue
+            if d == 0:
+                self.world[sel] = self.local[sel]
+            else:
+                self.world[sel] = self.world[self.parent[sel]] @ self.local[sel]
+            count += len(sel)
+
+        self.dirty[:n] = False
+        return count
+
+    def drawables(self) -> List[tuple[int, Model]]:
+        """Get all live nodes that have a model attached
+
+        Returns:
+            (List[tuple[int, Model]]): (node ID, model) pairs
+        """
+        return [
+            (i, m) for i, m in enumerate(self.models) if m is not None and self.alive[i]
+        ]
+
+    def _get_levels(self) -> List[np.ndarray]:
+        if self._levels is None:
+            ids = np.flatnonzero(self.alive[: self._n])
+            depth = self.depth[ids]
+            self._levels = (
+                [ids[depth == d] for d in range(depth.max() + 1)] if len(ids) else []
+            )
+        return self._levels
+
+    def _check_id(self, id: int):
+        if id < 0 or id >= self._n or not self.alive[id]:
+            raise IndexError("Node ID out of range")
+
+    def _grow(self):
+        cap = max(1, len(self.parent))
+        self.local = np.concatenate([self.local, np.tile(np.eye(4), (cap, 1, 1))])
+        self.world = np.concatenate([self.world, np.tile(np.eye(4), (cap, 1, 1))])
+        self.parent = np.concatenate([self.parent, np.full(cap, -1, dtype=int)])
+        self.depth = np.concatenate([self.depth, np.zeros(cap, dtype=int)])
+        self.dirty = np.concatenate([self.dirty, np.zeros(cap, dtype=bool)])
+        self.alive = np.concatenate([self.alive, np.zeros(cap, dtype=bool)])
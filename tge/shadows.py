@@ -0,0 +1,94 @@
+"""
+Shadow maps for directional lights.
+"""
+
+import numpy as np
+from .lights import DirectionalLight
+from .util import normalize
+
+
+class ShadowMap:
+    """Depth of the scene seen from a directional light, through an orthographic projection fitted to the scene.
+
+    The map is rendered by the engine and kept until the light, the resolution or the shadow casters change.
+    Depths follow the engine's convention: larger values are nearer to the light.
+    """
+
+    def __init__(self, resolution: int = 256, bias: float = 0.005):
+        """Initialize an empty shadow map
+
+        Args:
+            resolution (int, optional): Width and height of the map in texels. Defaults to 256.
+            bias (float, optional): Depth tolerance before a point counts as shadowed, as a fraction of the depth range. Defaults to 0.005.
+
+        Raises:
+            ValueError: If the resolution is not positive
+        """
+        if resolution <= 0:
+            raise ValueError("Shadow map resolution must be positive")
+        self.resolution = resolution
+        self.bias = bias
+        self.depth = np.full((resolution, resolution), -np.inf)
+        # World space to (texel x, texel y, depth)
+        self.matrix = np.eye(4)
+        self.key = None
+
+    def fit(self, light: DirectionalLight, center: np.ndarray, radius: float):
+        """Point the map along a light and cover a bounding sphere of the scene
+
+        Args:
+            light (DirectionalLight): Light casting the shadows
+            center (np.ndarray): Center of the bounding sphere (3,)
+            radius (float): Radius of the bounding sphere
+        """
+        d = light.dir.v
+        # Any axis that is not parallel to the light works as up
+        up = np.array([0.0, 1.0, 0.0]) if abs(d[1]) < 0.9 else np.array([1.0, 0.0, 0.0])
+        right = normalize(np.cross(d, up))
+        up = np.cross(right, d)
+        radius = max(radius, 1e-6)
+
+        # Orthographic view from outside the sphere: xy and depth scaled to [-1, 1]
+        view = np.eye(4)
+        view[0, :3], view[1, :3], view[2, :3] = right, up, -d
+        view[:3, 3] = -view[:3, :3] @ center
+        ortho = np.diag([1 / radius, 1 / radius, 1 / radius, 1.0])
+        self.matrix = viewport(self.resolution, self.resolution) @ ortho @ view
+        self.depth.fill(-np.inf)
+
+    def lit(self, points: np.ndarray) -> np.ndarray:
+        """Test whether points are lit, i.e. nothing in the map is nearer to the light
+
+        Args:
+            points (np.ndarray): World-space points (n, 3)
+
+        Returns:
+            (np.ndarray): Boolean mask (n,); points outside the map are lit
+        """
+        q = points @ self.matrix[:3, :3].T + self.matrix[:3, 3]
+        x, y = np.rint(q[:, 0]).astype(int), np.rint(q[:, 1]).astype(int)
+        inside = (x >= 0) & (x < self.resolution) & (y >= 0) & (y < self.resolution)
+        lit = np.ones(len(points), dtype=bool)
+        lit[inside] = q[inside, 2] >= self.depth[y[inside], x[inside]] - self.bias
+        return lit
+
+
+def viewport(width: int, height: int) -> np.ndarray:
+    """Transformation from NDC to screen space used by the engine: x to [0, width], y flipped to [0, height] and depth
+    to [0, 1]
+
+    Args:
+        width (int): Screen width
+        height (int): Screen height
+
+    Returns:
+        (np.ndarray): Viewport transformation (4x4)
+    """
+    return np.array(
+        [
+            [width / 2, 0, 0, width / 2],
+            [0, -height / 2, 0, height / 2],
+            [0, 0, 0.5, 0.5],
+            [0, 0, 0, 1],
+        ]
+    )
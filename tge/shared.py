@@ -0,0 +1,154 @@
+"""
+Numpy arrays in shared memory blocks, so other processes can use them without copying.
+"""
+
+import os
+import weakref
+import numpy as np
+
+
+class SharedArrays:
+    """Named numpy arrays backed by multiprocessing.shared_memory blocks.
+
+    The owning process creates the arrays; handle() describes all of them in a few bytes, and attach(handle) maps the
+    same memory in another process. Released arrays stay usable: their memory is unmapped once they are collected.
+    """
+
+    def __init__(self):
+        """Initialize an empty set of shared arrays owned by this process"""
+        self.arrays: dict[str, np.ndarray] = {}
+        self._blocks: dict = {}
+        self._owner = True
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.arrays
+
+    def zeros(self, name: str, shape: tuple, dtype: type = np.float64) -> np.ndarray:
+        """Create a zero-filled shared array. An existing array with the same name is released.
+
+        Args:
+            name (str): Array name
+            shape (tuple): Array shape
+            dtype (type, optional): Array type. Defaults to np.float64.
+
+        Raises:
+            ValueError: If the arrays are attached rather than owned
+
+        Returns:
+            (np.ndarray): Array backed by a new shared memory block
+        """
+        from multiprocessing.shared_memory import SharedMemory
+
+        if not self._owner:
+            raise ValueError("Attached shared arrays cannot allocate")
+        self.release(name)
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        # Zero-sized blocks are not allowed; new blocks are zero-filled
+        block = SharedMemory(create=True, size=max(nbytes, 1))
+        self._blocks[name] = block
+        self.arrays[name] = _view(block, shape, dtype)
+        return self.arrays[name]
+
+    def copy(self, name: str, a: np.ndarray) -> np.ndarray:
+        """Create a shared copy of an array
+
+        Args:
+            name (str): Array name
+            a (np.ndarray): Array to copy
+
+        Returns:
+            (np.ndarray): Shared copy of a
+        """
+        out = self.zeros(name, a.shape, a.dtype)
+        out[...] = a
+        return out
+
+    def release(self, name: str):
+        """Drop an array. The owner also removes its block, so no other process can attach to it anymore. Unknown
+        names are ignored.
+
+        Args:
+            name (str): Array name
+        """
+        self.arrays.pop(name, None)
+        block = self._blocks.pop(name, None)
+        if block is not None and self._owner:
+            block.unlink()
+
+    def handle(self) -> dict[str, tuple[str, tuple, str]]:
+        """Describe the arrays for attach. The handle is small and cheap to send to another process.
+
+        Returns:
+            (dict[str, tuple[str, tuple, str]]): Block name, shape and type per array name
+        """
+        return {
+            name: (self._blocks[name].name, a.shape, a.dtype.str)
+            for name, a in self.arrays.items()
+        }
+
+    @classmethod
+    def attach(cls, handle: dict[str, tuple[str, tuple, str]]) -> "SharedArrays":
+        """Map the arrays described by a handle into this process
+
+        Args:
+            handle (dict[str, tuple[str, tuple, str]]): Handle from SharedArrays.handle
+
+        Raises:
+            FileNotFoundError: If a block no longer exists
+
+        Returns:
+            (SharedArrays): Arrays sharing memory with the owner. Closing them leaves the blocks alive.
+        """
+        from multiprocessing.shared_memory import SharedMemory
+
+        shared = cls()
+        shared._owner = False
+        for name, (block_name, shape, dtype) in handle.items():
+            try:
+                block = SharedMemory(name=block_name, track=False)
+            except TypeError:
+                block = _attach_untracked(block_name)
+            shared._blocks[name] = block
+            shared.arrays[name] = _view(block, shape, dtype)
+        return shared
+
+    def close(self):
+        """Release all arrays; their memory is unmapped once they are collected. The owner also frees the blocks."""
+        for name in list(self.arrays):
+            self.release(name)
+
+
+def _view(block, shape: tuple, dtype: type) -> np.ndarray:
+    """Array over a shared memory block. Views of the array keep it alive, and the block is only closed, unmapping
+    its memory, once the array and every view of it have been collected.
+    """
+    a = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    weakref.finalize(a, block.close)
+    return a
+
+
+def _attach_untracked(name: str):
+    """Attach to a block without leaving it registered with this process's resource tracker. Before Python 3.13 every
+    attach registers the block, so a process with its own tracker would free the owner's memory when it exits.
+    """
+    from multiprocessing import resource_tracker
+    from multiprocessing.shared_memory import SharedMemory
+
+    block = SharedMemory(name=name)
+    if os.name == "posix" and not _shares_tracker():
+        # The tracker knows POSIX blocks by their name with a leading slash
+        resource_tracker.unregister("/" + block.name, "shared_memory")
+    return block
+
+
+def _shares_tracker() -> bool:
+    """Whether this process was started by multiprocessing and so reports to its parent's resource tracker, where
+    registering a block again changes nothing and unregistering it would drop the owner's registration.
+    """
+    import multiprocessing
+
+    return multiprocessing.parent_process() is not None
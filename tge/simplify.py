@@ -0,0 +1,182 @@
+"""
+Mesh simplification by quadric error edge collapse (Garland & Heckbert) and level-of-detail chains.
+"""
+
+import heapq
+from typing import List
+import numpy as np
+from .model import Model
+
+
+def simplify(model: Model, target_faces: int) -> Model:
+    """Simplify a triangle mesh by repeatedly collapsing the edge with the lowest quadric error
+
+    Args:
+        model (Model): Model to simplify. Faces must be triangles.
+        target_faces (int): Number of faces to reduce the model to
+
+    Raises:
+        ValueError: If the model faces are not triangles
+
+    Returns:
+        (Model): Simplified model with the color and texture of the input. Surviving faces keep the texture
+        coordinates of their corners. The input model is left untouched.
+    """
+    if model.f.ndim != 2 or model.f.shape[1] != 3:
+        raise ValueError("Simplification requires triangle faces")
+
+    v = model.v[:, :3].astype(np.float64)
+    f = model.f.astype(np.int64)
+    if len(f) <= target_faces:
+        return _with_surface(Model(model.v.copy(), model.f.copy()), model, slice(None))
+
+    q = _vertex_quadrics(v, f)
+
+    vert_faces: List[set] = [set() for _ in range(len(v))]
+    for i, face in enumerate(f):
+        for j in face:
+            vert_faces[j].add(i)
+    face_alive = np.ones(len(f), dtype=bool)
+    version = np.zeros(len(v), dtype=int)
+
+    # Initial costs for every unique edge, computed in one batch
+    edges = np.sort(np.concatenate([f[:, [0, 1]], f[:, [1, 2]], f[:, [2, 0]]]), axis=1)
+    edges = np.unique(edges, axis=0)
+    costs, positions = _collapse_costs(q[edges[:, 0]] + q[edges[:, 1]], v, edges)
+    heap = [
+        (costs[i], a, b, 0, 0, positions[i]) for i, (a, b) in enumerate(edges.tolist())
+    ]
+    heapq.heapify(heap)
+
+    n_faces = len(f)
+    while n_faces > target_faces and heap:
+        _, a, b, ver_a, ver_b, pos = heapq.heappop(heap)
+        if version[a] != ver_a or version[b] != ver_b:
+            continue
+        if _flips(v, f, vert_faces[a], a, b, pos) or _flips(
+            v, f, vert_faces[b], b, a, pos
+        ):
+            continue
+
+        # Collapse b into a
+        v[a] = pos
+        q[a] += q[b]
+        for fi in vert_faces[b]:
+            face = f[fi]
+            if a in face:
+                face_alive[fi] = False
+                n_faces -= 1
+                for j in face:
+                    if j != b:
+                        vert_faces[j].discard(fi)
+            else:
+                face[face == b] = a
+                vert_faces[a].add(fi)
+        vert_faces[b] = set()
+        version[a] += 1
+        version[b] += 1
+
+        neighbors = {j for fi in vert_faces[a] for j in f[fi]} - {a}
+        if not neighbors:
+            continue
+        nb = np.fromiter(neighbors, dtype=np.int64)
+        pairs = np.stack([np.full(len(nb), a), nb], axis=1)
+        costs, positions = _collapse_costs(q[a] + q[nb], v, pairs)
+        for i, j in enumerate(nb.tolist()):
+            heapq.heappush(heap, (costs[i], a, j, version[a], version[j], positions[i]))
+
+    kept = np.flatnonzero(face_alive)
+    # Drop faces collapsed to zero area
+    p0, p1, p2 = v[f[kept, 0]], v[f[kept, 1]], v[f[kept, 2]]
+    kept = kept[np.linalg.norm(np.cross(p1 - p0, p2 - p0), axis=1) > 0]
+
+    used, faces = np.unique(f[kept], return_inverse=True)
+    vertices = np.hstack([v[used], np.ones((len(used), 1))])
+    simplified = _with_surface(Model(vertices, faces.reshape(-1, 3)), model, kept)
+    return simplified.to_compact() if model.is_compact else simplified
+
+
+def build_lods(
+    model: Model, levels: int = 3, ratio: float = 0.5, min_faces: int = 64
+) -> List[Model]:
+    """Build a level-of-detail chain for a model and cache it on the model (`model.lods`)
+
+    Each level is simplified from the previous one, so the chain costs roughly as much as the first level.
+
+    Args:
+        model (Model): Model to build the chain for
+        levels (int, optional): Maximum number of coarser levels. Defaults to 3.
+        ratio (float, optional): Face count ratio between consecutive levels. Defaults to 0.5.
+        min_faces (int, optional): Levels are not reduced below this face count. Defaults to 64.
+
+    Returns:
+        (List[Model]): Coarser levels, ordered from finest to coarsest
+    """
+    lods = []
+    prev = model
+    for _ in range(levels):
+        target = int(len(prev.f) * ratio)
+        if target < min_faces:
+            break
+        prev = simplify(prev, target)
+        lods.append(prev)
+
+    model.lods = lods
+    return lods
+
+
+def _with_surface(simplified: Model, model: Model, kept: np.ndarray | slice) -> Model:
+    """Give a simplified model the color and texture of its source, and the texture coordinates of its kept faces"""
+    simplified.color = model.color
+    simplified.texture = model.texture
+    if model.uv is not None:
+        # Texture coordinates belong to face corners, so a collapse moves a corner without changing its coordinates
+        simplified.uv = model.uv[kept].copy()
+    return simplified
+
+
+def _vertex_quadrics(v: np.ndarray, f: np.ndarray) -> np.ndarray:
+    p0, p1, p2 = v[f[:, 0]], v[f[:, 1]], v[f[:, 2]]
+    n = np.cross(p1 - p0, p2 - p0)
+    norm = np.linalg.norm(n, axis=1, keepdims=True)
+    n = np.divide(n, norm, out=np.zeros_like(n), where=norm > 0)
+    planes = np.hstack([n, -np.sum(n * p0, axis=1, keepdims=True)])
+
+    k = planes[:, :, None] * planes[:, None, :]
+    q = np.zeros((len(v), 4, 4))
+    for j in range(3):
+        np.add.at(q, f[:, j], k)
+    return q
+
+
+def _collapse_costs(
+    q: np.ndarray, v: np.ndarray, pairs: np.ndarray
+) -> tuple[list, list]:
+    """Optimal collapse positions and their quadric errors for a batch of vertex pairs"""
+    a = q[:, :3, :3]
+    b = -q[:, :3, 3]
+    pos = (v[pairs[:, 0]] + v[pairs[:, 1]]) / 2
+    solvable = np.abs(np.linalg.det(a)) > 1e-10
+    if solvable.any():
+        pos[solvable] = np.linalg.solve(a[solvable], b[solvable][..., None])[..., 0]
+
+    h = np.hstack([pos, np.ones((len(pos), 1))])
+    costs = np.einsum("ni,nij,nj->n", h, q, h)
+    return costs.tolist(), list(pos)
+
+
+def _flips(
+    v: np.ndarray, f: np.ndarray, faces: set, moved: int, other: int, pos: np.ndarray
+) -> bool:
+    """Whether moving a vertex to pos would flip any of its faces not shared with other"""
+    for fi in faces:
+        face = f[fi]
+        if other in face:
+            continue
+        p = v[face]
+        before = np.cross(p[1] - p[0], p[2] - p[0])
+        p[face == moved] = pos
+        after = np.cross(p[1] - p[0], p[2] - p[0])
+        if np.dot(before, after) <= 0:
+            return True
+    return False
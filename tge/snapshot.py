@@ -0,0 +1,320 @@
+"""
+Engine snapshots: the whole scene in a single binary file that is restored by memory-mapping it.
+
+Layout: an 8-byte magic, the length of a JSON header as a little-endian uint64, the header, then a data section with
+every array as raw bytes at a 64-byte aligned offset. The data section starts at the first aligned offset after the
+header. The header describes the engine settings, cameras, lights, models, scene graph, instances and animations, and
+refers to arrays by (offset in the data section, shape, type).
+"""
+
+import json
+import mmap
+import struct
+from typing import List
+import numpy as np
+from .animation import Animation
+from .camera import Camera
+from .engine import GraphicsEngine, RenderMode
+from .lights import DirectionalLight, PointLight, SpotLight
+from .model import InstancedMesh, Model
+from .texture import Texture
+from .util import Vec3
+
+MAGIC = b"TGESNAP1"
+ALIGN = 64
+
+
+def save_snapshot(
+    path: str,
+    engine: GraphicsEngine,
+    animations: List[Animation] | None = None,
+    frame: int = 0,
+):
+    """Write the state of an engine to a snapshot file
+
+    Models are stored once even if they are shared by several nodes, instanced meshes or the model list. The last
+    rendered frame is stored as well, so a restored engine can present it before rendering again.
+
+    Args:
+        path (str): Snapshot file
+        engine (GraphicsEngine): Engine to save
+        animations (List[Animation] | None, optional): Animations to save. Defaults to None.
+        frame (int, optional): Current animation frame. Defaults to 0.
+    """
+    writer = _Writer()
+    models: dict[int, int] = {}
+
+    def model_ref(model: Model | None) -> int | None:
+        if model is None:
+            return None
+        if id(model) not in models:
+            entry = {
+                "v": writer.add(model.v),
+                "f": writer.add(model.f),
+                "n": None if model.n is None else writer.add(model.n),
+                "edges": None if model.edges is None else writer.add(model.edges),
+                "edge_faces": (
+                    None if model.edge_faces is None else writer.add(model.edge_faces)
+                ),
+                "color": (
+                    None if model.color is None else np.asarray(model.color).tolist()
+                ),
+                "uv": None if model.uv is None else writer.add(model.uv),
+                "texture": (
+                    None
+                    if model.texture is None
+                    else {
+                        "values": writer.add(model.texture.values),
+                        "filter": model.texture.filter,
+                    }
+                ),
+                "lods": [],
+            }
+            models[id(model)] = len(writer.models)
+            writer.models.append(entry)
+            entry["lods"] = [model_ref(lod) for lod in model.lods]
+        return models[id(model)]
+
+    scene = engine.scene
+    n = scene.n_nodes
+    frame_buf, zbuf = engine.get_frame()
+    header = {
+        "engine": {
+            "resolution": [engine.display.width, engine.display.height],
+            "ups": engine.ups,
+            "dtype": engine.buf.dtype.str,
+            "rasterizer": engine.rasterizer.name,
+            "lod_density": engine.lod_density,
+            "incremental": engine.incremental,
+            "render_mode": engine.render_mode.name,
+            "painter": engine.painter,
+            "conservative_occlusion": engine.conservative_occlusion,
+            "repack": engine.repack,
+            "shadows": engine.shadows,
+            "shadow_resolution": engine.shadow_resolution,
+            "shadow_bias": engine.shadow_bias,
+            "color_mode": engine.display.color_mode,
+            "render_scale": engine.render_scale,
+            "fit_terminal": engine.fit_terminal,
+        },
+        "cameras": [
+            {
+                "pos": c.pos.v.tolist(),
+                "dir": c.dir.v.tolist(),
+                "up": c.up.v.tolist(),
+                "fov": c.fov,
+                "near": c.near,
+                "far": c.far,
+            }
+            for c in engine.camera
+        ],
+        "lights": {
+            "directional": [
+                {"dir": l.dir.v.tolist(), "color": l.color.tolist()}
+                for l in engine.directional_lights
+            ],
+            "point": [{"pos": l.pos.v.tolist()} for l in engine.point_lights],
+            "spot": [
+                {"pos": l.pos.v.tolist(), "dir": l.dir.v.tolist(), "angle": l.angle}
+                for l in engine.spot_lights
+            ],
+        },
+        "models": [model_ref(m) for m in engine.models],
+        "scene": {
+            "local": writer.add(scene.local[:n]),
+            "parent": writer.add(scene.parent[:n]),
+            "alive": writer.add(scene.alive[:n]),
+            "models": [model_ref(m) for m in scene.models],
+        },
+        "instances": [
+            {"model": model_ref(i.model), "transforms": writer.add(i.transforms)}
+            for i in engine.instances
+        ],
+        "animations": [_animation_entry(a, writer) for a in animations or []],
+        "frame": frame,
+        "buffers": {
+            "frame": writer.add(frame_buf),
+            "zbuf": writer.add(zbuf),
+        },
+    }
+    header["model_table"] = writer.models
+    writer.write(path, header)
+
+
+def load_snapshot(
+    path: str, handle_resize: bool = True
+) -> tuple[GraphicsEngine, List[Animation], int]:
+    """Restore an engine from a snapshot file.
+
+    Arrays are memory-mapped copy-on-write rather than read and parsed: model geometry refers to the mapped file
+    directly, and edits never reach the file.
+
+    Args:
+        path (str): Snapshot file
+        handle_resize (bool, optional): Whether the display installs a SIGWINCH handler. Defaults to True.
+
+    Raises:
+        ValueError: If the file is not a snapshot
+
+    Returns:
+        (tuple[GraphicsEngine, List[Animation], int]): Restored engine, animations and animation frame
+    """
+    with open(path, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    if buf[: len(MAGIC)] != MAGIC:
+        raise ValueError("Not a snapshot file")
+    (size,) = struct.unpack_from("<Q", buf, len(MAGIC))
+    start = len(MAGIC) + 8
+    header = json.loads(bytes(buf[start : start + size]))
+    data = _align(start + size)
+
+    def array(entry: list | None) -> np.ndarray | None:
+        if entry is None:
+            return None
+        offset, shape, dtype = entry
+        count = int(np.prod(shape))
+        return np.frombuffer(buf, np.dtype(dtype), count, data + offset).reshape(shape)
+
+    models: List[Model] = []
+    for entry in header["model_table"]:
+        model = Model(array(entry["v"]), array(entry["f"]), compute_norms=False)
+        model.n = array(entry["n"])
+        model.edges = array(entry["edges"])
+        model.edge_faces = array(entry["edge_faces"])
+        model.color = None if entry["color"] is None else np.array(entry["color"])
+        model.uv = array(entry["uv"])
+        texture = entry["texture"]
+        if texture is not None:
+            model.texture = Texture(array(texture["values"]), texture["filter"])
+        models.append(model)
+    # Levels of detail refer to entries that may come later in the table
+    for model, entry in zip(models, header["model_table"]):
+        model.lods = [models[i] for i in entry["lods"]]
+
+    settings = header["engine"]
+    engine = GraphicsEngine(
+        tuple(settings["resolution"]),
+        settings["ups"],
+        np.dtype(settings["dtype"]).type,
+        settings["rasterizer"],
+        handle_resize,
+    )
+    engine.lod_density = settings["lod_density"]
+    engine.incremental = settings["incremental"]
+    engine.render_mode = RenderMode[settings["render_mode"]]
+    engine.painter = settings["painter"]
+    # Not stored by older snapshots
+    engine.conservative_occlusion = settings.get("conservative_occlusion", False)
+    engine.repack = settings.get("repack", False)
+    engine.fit_terminal = settings["fit_terminal"]
+    engine.set_color_mode(settings["color_mode"])
+    engine.shadow_resolution = settings["shadow_resolution"]
+    engine.shadow_bias = settings["shadow_bias"]
+    if settings["shadows"]:
+        engine.enable_shadows(settings["shadow_resolution"], settings["shadow_bias"])
+
+    for c in header["cameras"]:
+        pos = Vec3(*c["pos"])
+        camera = Camera(
+            pos, pos + np.array(c["dir"]), Vec3(*c["up"]), c["fov"], c["near"], c["far"]
+        )
+        engine.add_camera(camera)
+    lights = header["lights"]
+    for l in lights["directional"]:
+        engine.add_light(DirectionalLight(Vec3(*l["dir"]), tuple(l["color"])))
+    for l in lights["point"]:
+        engine.add_light(PointLight(Vec3(*l["pos"])))
+    for l in lights["spot"]:
+        engine.add_light(SpotLight(Vec3(*l["pos"]), Vec3(*l["dir"]), l["angle"]))
+
+    for i in header["models"]:
+        engine.add_model(models[i])
+
+    scene = header["scene"]
+    local, parent, alive = (
+        array(scene["local"]),
+        array(scene["parent"]),
+        array(scene["alive"]),
+    )
+    # Parents always have lower IDs, so nodes can be added in order; removed nodes are added and removed again
+    for i, ref in enumerate(scene["models"]):
+        p = int(parent[i])
+        engine.scene.add_node(
+            local[i].copy(),
+            p if p >= 0 and alive[p] else None,
+            None if ref is None else models[ref],
+        )
+    for i in np.flatnonzero(~alive):
+        if engine.scene.alive[i]:
+            engine.scene.remove_node(int(i))
+
+    for entry in header["instances"]:
+        engine.instances.append(
+            InstancedMesh(models[entry["model"]], array(entry["transforms"]).copy())
+        )
+
+    animations = [_animation(entry, array) for entry in header["animations"]]
+
+    engine.set_render_scale(settings["render_scale"])
+    # Present the last saved frame until the next render
+    engine.restore_frame(
+        array(header["buffers"]["frame"]), array(header["buffers"]["zbuf"])
+    )
+    return engine, animations, header["frame"]
+
+
+class _Writer:
+    """Collects arrays and assigns them offsets in the data section"""
+
+    def __init__(self):
+        self.arrays: List[tuple[int, np.ndarray]] = []
+        self.models: List[dict] = []
+        self.size = 0
+
+    def add(self, a: np.ndarray) -> list:
+        a = np.ascontiguousarray(a)
+        offset = _align(self.size)
+        self.arrays.append((offset, a))
+        self.size = offset + a.nbytes
+        return [offset, list(a.shape), a.dtype.str]
+
+    def write(self, path: str, header: dict):
+        data = json.dumps(header).encode()
+        start = _align(len(MAGIC) + 8 + len(data))
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<Q", len(data)))
+            f.write(data)
+            for offset, a in self.arrays:
+                f.write(bytes(start + offset - f.tell()))
+                f.write(a.data)
+
+
+def _align(n: int) -> int:
+    return -(-n // ALIGN) * ALIGN
+
+
+def _animation_entry(animation: Animation, writer: _Writer) -> dict:
+    r = animation.r
+    return {
+        "m": animation.m,
+        "start": animation.start,
+        "stop": animation.stop,
+        # Per-axis rotations are stacked
+        "r": writer.add(np.stack(r) if isinstance(r, list) else r),
+        "r_list": isinstance(r, list),
+        "t": writer.add(animation.t),
+        "s": writer.add(animation.s),
+    }
+
+
+def _animation(entry: dict, array) -> Animation:
+    r = array(entry["r"]).copy()
+    return Animation(
+        entry["m"],
+        entry["start"],
+        entry["stop"],
+        list(r) if entry["r_list"] else r,
+        array(entry["t"]).copy(),
+        array(entry["s"]).copy(),
+    )
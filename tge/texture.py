@@ -0,0 +1,147 @@
+"""
+Grayscale textures and character-pattern atlases, sampled per rendered cell.
+"""
+
+from typing import List
+import numpy as np
+
+FILTERS = ("nearest", "bilinear")
+
+
+class Texture:
+    """Grayscale image with values in [0, 1]. Coordinates wrap around, and v = 0 is the bottom row as in .obj files."""
+
+    def __init__(self, values: np.ndarray, filter: str = "nearest"):
+        """Initialize a texture
+
+        Args:
+            values (np.ndarray): Brightness per texel [0, 1] (H, W)
+            filter (str, optional): "nearest" or "bilinear". Defaults to "nearest".
+
+        Raises:
+            ValueError: If values is not 2D or the filter is unknown
+        """
+        if values.ndim != 2 or values.size == 0:
+            raise ValueError("Texture values must be a non-empty 2D array")
+        if filter not in FILTERS:
+            raise ValueError(f"Unknown filter {filter!r}, expected one of {FILTERS}")
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+        self.filter = filter
+
+    def sample(self, uv: np.ndarray) -> np.ndarray:
+        """Look up the texture at many coordinates at once
+
+        Args:
+            uv (np.ndarray): Texture coordinates (N, 2)
+
+        Returns:
+            (np.ndarray): Brightness per coordinate (N,)
+        """
+        h, w = self.values.shape
+        # Texel centers sit at half-integer positions
+        x = uv[:, 0] * w - 0.5
+        y = (1 - uv[:, 1]) * h - 0.5
+        if self.filter == "nearest":
+            col = np.rint(x).astype(np.int64) % w
+            row = np.rint(y).astype(np.int64) % h
+            return self.values[row, col]
+
+        x0, y0 = np.floor(x), np.floor(y)
+        fx, fy = x - x0, y - y0
+        c0, r0 = x0.astype(np.int64) % w, y0.astype(np.int64) % h
+        c1, r1 = (c0 + 1) % w, (r0 + 1) % h
+        top = self.values[r0, c0] * (1 - fx) + self.values[r0, c1] * fx
+        bottom = self.values[r1, c0] * (1 - fx) + self.values[r1, c1] * fx
+        return top * (1 - fy) + bottom * fy
+
+
+def text_texture(lines: List[str], filter: str = "nearest") -> Texture:
+    """Build a texture from a character pattern. Each character becomes the brightness the display draws it with, so
+    a pattern drawn in the display's character set shows up as drawn on fully lit faces. Other characters are as
+    bright as the most similar character by position in the set, spaces are dark. Short lines are padded with spaces.
+
+    Args:
+        lines (List[str]): Rows of the pattern, top row first
+        filter (str, optional): "nearest" or "bilinear". Defaults to "nearest".
+
+    Raises:
+        ValueError: If the pattern is empty
+
+    Returns:
+        (Texture): Pattern texture
+    """
+    from .display import CHAR_SET
+
+    lines = [line.rstrip("\n") for line in lines]
+    width = max((len(line) for line in lines), default=0)
+    if width == 0:
+        raise ValueError("Character pattern is empty")
+    levels = {c: i / (len(CHAR_SET) - 1) for i, c in enumerate(CHAR_SET)}
+    values = np.zeros((len(lines), width))
+    for row, line in enumerate(lines):
+        for col, c in enumerate(line):
+            # Unknown printable characters count as fully bright
+            values[row, col] = levels.get(c, 0.0 if c.isspace() else 1.0)
+    return Texture(values, filter)
+
+
+def load_texture(path: str, filter: str = "nearest") -> Texture:
+    """Load a texture: binary or plain PGM images (.pgm), character patterns (.txt) and, if Pillow is installed, any
+    other image format, converted to grayscale.
+
+    Args:
+        path (str): Path to the image or pattern
+        filter (str, optional): "nearest" or "bilinear". Defaults to "nearest".
+
+    Raises:
+        ValueError: If a PGM file is malformed
+
+    Returns:
+        (Texture): Loaded texture
+    """
+    if path.endswith(".txt"):
+        with open(path, "r") as f:
+            return text_texture(f.read().splitlines(), filter)
+    if path.endswith(".pgm"):
+        with open(path, "rb") as f:
+            return Texture(_read_pgm(f.read()), filter)
+
+    from PIL import Image
+
+    with Image.open(path) as image:
+        values = np.asarray(image.convert("L"), dtype=np.float64) / 255
+    return Texture(values, filter)
+
+
+def _read_pgm(data: bytes) -> np.ndarray:
+    """Decode a P2 (plain) or P5 (binary) PGM image to brightness [0, 1]"""
+    fields: List[bytes] = []
+    pos = 0
+    # Magic, width, height and maximum value, separated by whitespace and comments
+    while len(fields) < 4:
+        while pos < len(data) and data[pos : pos + 1].isspace():
+            pos += 1
+        if data[pos : pos + 1] == b"#":
+            pos = data.find(b"\n", pos)
+            if pos < 0:
+                raise ValueError("Truncated PGM header")
+            continue
+        end = pos
+        while end < len(data) and not data[end : end + 1].isspace():
+            end += 1
+        if end == pos:
+            raise ValueError("Truncated PGM header")
+        fields.append(data[pos:end])
+        pos = end
+    magic, width, height, maxval = fields[0], *(int(f) for f in fields[1:])
+    if magic == b"P2":
+        values = np.array(data[pos:].split(), dtype=np.float64)
+    elif magic == b"P5":
+        dtype = np.dtype(np.uint8) if maxval < 256 else np.dtype(">u2")
+        # A single whitespace byte separates the header from the pixels
+        values = np.frombuffer(data, dtype, width * height, pos + 1).astype(np.float64)
+    else:
+        raise ValueError("Not a PGM image")
+    if values.size != width * height:
+        raise ValueError("PGM pixel data does not match its size")
+    return values.reshape(height, width) / maxval
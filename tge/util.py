@@ -206,19 +206,120 @@ def build_scale(s_x: float, s_y: float, s_z: float) -> np.ndarray:
     )
 
 
+def build_rotations(rad: np.ndarray, axis: Axis) -> np.ndarray:
+    """Builds a stack of rotation matrices along the given axis, one per angle
+
+    Args:
+        rad (np.ndarray): Rotations in radians (n,)
+        axis (Axis): Axis of rotation
+
+    Returns:
+        (np.ndarray): Rotation matrices (n, 4, 4)
+    """
+    rad = np.asarray(rad, dtype=float)
+    c, s = np.cos(rad), np.sin(rad)
+    # (i, j) span the plane of rotation, ordered so that m[i, j] = -sin
+    i, j = {Axis.X: (1, 2), Axis.Y: (2, 0), Axis.Z: (0, 1)}[axis]
+    m = np.zeros(rad.shape + (4, 4))
+    m[..., axis.value, axis.value] = 1
+    m[..., 3, 3] = 1
+    m[..., i, i] = c
+    m[..., j, j] = c
+    m[..., i, j] = -s
+    m[..., j, i] = s
+    return m
+
+
+def build_rotations_deg(deg: np.ndarray, axis: Axis) -> np.ndarray:
+    """Builds a stack of rotation matrices along the given axis, one per angle in degrees. Wrapper for build_rotations().
+
+    Args:
+        deg (np.ndarray): Rotations in degrees (n,)
+        axis (Axis): Axis of rotation
+
+    Returns:
+        (np.ndarray): Rotation matrices (n, 4, 4)
+    """
+    return build_rotations(np.deg2rad(deg), axis)
+
+
+def build_translations(
+    t_x: np.ndarray | float, t_y: np.ndarray | float, t_z: np.ndarray | float
+) -> np.ndarray:
+    """Builds a stack of translation matrices. Arguments are broadcast against each other.
+
+    Args:
+        t_x (np.ndarray | float): Translations in x (n,)
+        t_y (np.ndarray | float): Translations in y (n,)
+        t_z (np.ndarray | float): Translations in z (n,)
+
+    Returns:
+        (np.ndarray): Translation matrices (n, 4, 4)
+    """
+    t = np.stack(np.broadcast_arrays(t_x, t_y, t_z), axis=-1).astype(float)
+    m = np.zeros(t.shape[:-1] + (4, 4))
+    m[..., [0, 1, 2, 3], [0, 1, 2, 3]] = 1
+    m[..., :3, 3] = t
+    return m
+
+
+def build_scales(
+    s_x: np.ndarray | float, s_y: np.ndarray | float, s_z: np.ndarray | float
+) -> np.ndarray:
+    """Builds a stack of scale matrices. Arguments are broadcast against each other.
+
+    Args:
+        s_x (np.ndarray | float): Scales in x (n,)
+        s_y (np.ndarray | float): Scales in y (n,)
+        s_z (np.ndarray | float): Scales in z (n,)
+
+    Returns:
+        (np.ndarray): Scale matrices (n, 4, 4)
+    """
+    s = np.stack(np.broadcast_arrays(s_x, s_y, s_z), axis=-1).astype(float)
+    m = np.zeros(s.shape[:-1] + (4, 4))
+    m[..., [0, 1, 2], [0, 1, 2]] = s
+    m[..., 3, 3] = 1
+    return m
+
+
+def compose_transformations(
+    transforms: list[np.ndarray] | np.ndarray,
+) -> np.ndarray:
+    """Multiplies transformations from left to right, pairing neighbours so only log2(k) batched matmuls are needed.
+
+    Each entry may be a single matrix (4x4) or a stack (n, 4, 4); stacks are composed element-wise and single
+    matrices are broadcast against them.
+
+    Args:
+        transforms (list[np.ndarray] | np.ndarray): k transformations in order (from left to right), or an array (k, ..., 4, 4)
+
+    Raises:
+        ValueError: If no transformations are given
+
+    Returns:
+        (np.ndarray): Composed transformation (4x4), or stack of them (n, 4, 4)
+    """
+    if len(transforms) == 0:
+        raise ValueError("At least one transformation is required")
+    stack = np.stack(np.broadcast_arrays(*transforms))
+    while len(stack) > 1:
+        paired = stack[0 : len(stack) - 1 : 2] @ stack[1::2]
+        if len(stack) % 2:
+            paired = np.concatenate([paired, stack[-1:]])
+        stack = paired
+    return stack[0]
+
+
 def condense_transformations(transforms: list[np.ndarray]) -> np.ndarray:
     """Condenses a list of transformations into a single transformation matrix.
 
-    Note, this method is not particularly efficient for large lists of transformations.
-
     Args:
         transforms (list[np.ndarray]): Transformations in order (from left to right)
 
     Returns:
         (np.ndarray): Condensed transformation matrix (4x4)
     """
-    result = np.eye(4)
-    for T in transforms:
-        result = result @ T
-
-    return result
+    if len(transforms) == 0:
+        return np.eye(4)
+    return compose_transformations(transforms).astype(np.float64)